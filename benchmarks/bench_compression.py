@@ -0,0 +1,90 @@
+# benchmarks/bench_compression.py
+"""
+JSON crudo comprimido frente a plano: tamaño en disco, escritura y
+lectura+parseo (load_json) de un dataset sintético con cada formato.
+
+El throughput se mide sobre los bytes del JSON sin comprimir, así los
+formatos son comparables: un volumen compartido lento favorece a los
+comprimidos (menos bytes leídos), un disco local rápido al plano.
+
+Uso: ``python -m benchmarks.bench_compression --posts 20000``
+"""
+
+import argparse
+import io
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import List, Optional
+
+from src.utils import COMPRESSION_SUFFIXES, load_json, save_json
+
+from .common import best_time, synthetic_posts
+
+
+def _dataset(n_posts: int) -> dict:
+    return {
+        "basic_info": {"bio": "Perfil sintético para el benchmark"},
+        "posts": [
+            {"text": text, "reactions": i % 97, "comments": i % 13}
+            for i, text in enumerate(synthetic_posts(n_posts))
+        ],
+    }
+
+
+def run(n_posts: int, repeat: int) -> List[dict]:
+    data = _dataset(n_posts)
+    rows = []
+    with tempfile.TemporaryDirectory() as folder:
+        plain_size = None
+        for compression in [None, *COMPRESSION_SUFFIXES]:
+            filename = f"dataset_{compression or 'plano'}.json"
+            # save_json informa cada archivo guardado: se omite en la medición
+            with redirect_stdout(io.StringIO()):
+                write = best_time(
+                    lambda: save_json(data, filename, folder, compression), repeat
+                )
+            path = next(Path(folder).glob(f"{filename}*"))
+            size = path.stat().st_size
+            plain_size = plain_size or size
+            read = best_time(lambda: load_json(path.name, folder), repeat)
+            rows.append(
+                {
+                    "name": compression or "sin comprimir",
+                    "bytes": size,
+                    "ratio": plain_size / size,
+                    "write": write,
+                    "read": read,
+                    "read_mb_s": plain_size / read / 1e6,
+                }
+            )
+    return rows
+
+
+def report(title: str, rows: List[dict]):
+    print(f"\n{title}")
+    print(
+        f"{'formato':<16}{'MB':>10}{'razón':>8}{'escritura s':>14}"
+        f"{'lectura s':>12}{'lectura MB/s':>15}"
+    )
+    for row in rows:
+        print(
+            f"{row['name']:<16}{row['bytes'] / 1e6:>10.2f}{row['ratio']:>8.1f}"
+            f"{row['write']:>14.4f}{row['read']:>12.4f}{row['read_mb_s']:>15.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark de JSON comprimido")
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    report(
+        f"Lectura y parseo de JSON ({args.posts} posts; MB/s del JSON sin comprimir)",
+        run(args.posts, args.repeat),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# benchmarks/bench_equivalence.py
+"""
+Aceleración del motor actual frente al motor de referencia congelado, con
+la prueba de equivalencia del mismo corpus, para cada motor candidato y
+varios tamaños de post.
+
+Uso: ``python -m benchmarks.bench_equivalence --datasets 200``
+"""
+
+import argparse
+from typing import List, Optional
+
+from src.equivalence import ENGINES, compare_engines, format_report, generate_corpus
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark de equivalencia frente a la referencia"
+    )
+    parser.add_argument("--datasets", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for max_posts, max_words in ((12, 25), (200, 60)):
+        datasets = generate_corpus(
+            args.datasets, 0, args.seed, max_posts=max_posts, max_words=max_words
+        )
+        for engine in ENGINES:
+            report = compare_engines(datasets, engine)
+            print(f"\nHasta {max_posts} posts de {max_words} palabras")
+            print(format_report(report))
+            failed |= bool(
+                report["mismatch_count"] or report["sentiment_mismatch_count"]
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+# benchmarks/bench_features.py
+"""
+Costo de la representación vectorial frente al análisis completo:
+tokenización, matriz documento-término, n-gramas con hashing (disperso y
+denso) y calculate_big_five_scores sobre el mismo corpus.
+
+Uso: ``python -m benchmarks.bench_features --posts 20000``
+"""
+
+import argparse
+from typing import List, Optional
+
+from src.features import (
+    HashedNgramVectorizer,
+    build_document_term_matrix,
+    tokenize_corpus,
+)
+from src.personality import BigFiveAnalyzer
+
+from .common import best_time, report, synthetic_posts
+
+
+def run(n_posts: int, n_features: int, repeat: int) -> List[dict]:
+    texts = synthetic_posts(n_posts)
+    vectorizer = HashedNgramVectorizer(n_features)
+    token_ids, lengths, vocabulary = tokenize_corpus(texts)
+    analyzer = BigFiveAnalyzer(parallel_threshold=n_posts + 1)
+    dataset = {"posts": [{"text": text} for text in texts]}
+
+    cases = [
+        ("tokenize_corpus", lambda: tokenize_corpus(texts)),
+        ("document_term_matrix", lambda: build_document_term_matrix(texts)),
+        (
+            "ngrams (tokens ya calculados)",
+            lambda: vectorizer.transform_tokens(token_ids, lengths, vocabulary),
+        ),
+        ("ngrams disperso", lambda: vectorizer.transform(texts)),
+        ("ngrams denso", lambda: vectorizer.transform(texts).to_dense()),
+        (
+            "calculate_big_five_scores",
+            lambda: analyzer.calculate_big_five_scores(dataset),
+        ),
+    ]
+    return [
+        {"name": name, "posts": n_posts, "seconds": best_time(func, repeat)}
+        for name, func in cases
+    ]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark de features de texto")
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--features", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    report(
+        f"Features de texto ({args.posts} posts, {args.features} columnas de n-gramas)",
+        run(args.posts, args.features, args.repeat),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/bench_post_store.py
+"""
+Snapshots repetidos de un dataset: un JSON completo por snapshot
+(save_json) frente al almacén deduplicado (PostStore). Entre snapshots
+cambian las reacciones de todos los posts y se agrega una fracción de
+posts nuevos.
+
+Uso: ``python -m benchmarks.bench_post_store --posts 5000 --snapshots 10``
+"""
+
+import argparse
+import io
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import List, Optional
+
+from src.post_store import PostStore
+from src.utils import load_json, save_json
+
+from .common import synthetic_posts
+
+
+def _snapshots(n_posts: int, n_snapshots: int, new_fraction: float) -> List[dict]:
+    new_per_snapshot = int(n_posts * new_fraction)
+    texts = synthetic_posts(n_posts + new_per_snapshot * n_snapshots)
+    snapshots = []
+    for s in range(n_snapshots):
+        visible = n_posts + new_per_snapshot * s
+        snapshots.append(
+            {
+                "basic_info": {"bio": "Perfil sintético para el benchmark"},
+                "scraped_at": f"snapshot {s}",
+                "posts": [
+                    {
+                        "text": texts[i],
+                        "url": f"https://facebook.com/p/{i}",
+                        "reactions": (i * 7 + s) % 500,
+                        "comments": (i + s) % 30,
+                        "timestamp": 1_700_000_000 + i * 60,
+                    }
+                    for i in range(visible)
+                ],
+            }
+        )
+    return snapshots
+
+
+def _folder_size(folder: Path) -> int:
+    return sum(path.stat().st_size for path in folder.rglob("*") if path.is_file())
+
+
+def run(n_posts: int, n_snapshots: int, new_fraction: float) -> List[dict]:
+    snapshots = _snapshots(n_posts, n_snapshots, new_fraction)
+    rows = []
+    with tempfile.TemporaryDirectory() as folder:
+        plain = Path(folder) / "plain"
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            for s, data in enumerate(snapshots):
+                save_json(data, f"snapshot_{s}.json", str(plain), compression="")
+        write = time.perf_counter() - start
+        start = time.perf_counter()
+        load_json(f"snapshot_{n_snapshots - 1}.json", str(plain))
+        rows.append(
+            {
+                "name": "JSON por snapshot",
+                "bytes": _folder_size(plain),
+                "write": write,
+                "load": time.perf_counter() - start,
+            }
+        )
+
+        store = PostStore(Path(folder) / "store")
+        start = time.perf_counter()
+        for s, data in enumerate(snapshots):
+            store.save(f"snapshot_{s}", data)
+        write = time.perf_counter() - start
+        start = time.perf_counter()
+        store.load(f"snapshot_{n_snapshots - 1}").to_dict()
+        rows.append(
+            {
+                "name": "PostStore",
+                "bytes": _folder_size(store.root),
+                "write": write,
+                "load": time.perf_counter() - start,
+            }
+        )
+        store.close()
+    return rows
+
+
+def report(title: str, rows: List[dict]):
+    print(f"\n{title}")
+    print(f"{'formato':<22}{'MB':>10}{'escritura s':>14}{'carga s':>10}")
+    for row in rows:
+        print(
+            f"{row['name']:<22}{row['bytes'] / 1e6:>10.2f}"
+            f"{row['write']:>14.4f}{row['load']:>10.4f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark del almacén de posts")
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--snapshots", type=int, default=10)
+    parser.add_argument("--new-fraction", type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    report(
+        f"{args.snapshots} snapshots de {args.posts} posts "
+        f"({args.new_fraction:.0%} nuevos por snapshot)",
+        run(args.posts, args.snapshots, args.new_fraction),
+    )
+
+
+if __name__ == "__main__":
+    main()
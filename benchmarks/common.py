@@ -0,0 +1,50 @@
+# benchmarks/common.py
+"""
+Utilidades compartidas por los benchmarks: corpus sintético reproducible y
+medición de tiempos (mejor de varias repeticiones).
+"""
+
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+# Palabras frecuentes en posts en español (incluye términos de los léxicos)
+WORDS = (
+    "hoy fui a una fiesta con mis amigos y estoy muy feliz pero también "
+    "cansado me preocupa el examen de mañana quiero aprender algo nuevo "
+    "gracias a todos por su ayuda siempre organizo mi trabajo con tiempo "
+    "estoy nervioso y triste por la noticia qué viaje tan increíble la "
+    "música el arte y la familia son lo mejor de la semana"
+).split()
+
+
+def synthetic_posts(n_posts: int, words_per_post: int = 30, seed: int = 0) -> List[str]:
+    """Textos aleatorios pero reproducibles con la distribución de WORDS"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(words_per_post // 2, words_per_post * 3 // 2, n_posts)
+    vocabulary = np.array(WORDS)
+    return [" ".join(vocabulary[rng.integers(0, len(WORDS), n)]) for n in lengths]
+
+
+def best_time(func: Callable, repeat: int = 3) -> float:
+    """Mejor tiempo (segundos) de repeat ejecuciones de func()"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(title: str, rows: List[Dict]):
+    """Imprime una tabla: caso, segundos y posts por segundo"""
+    print(f"\n{title}")
+    print(f"{'caso':<32}{'segundos':>12}{'posts/s':>14}")
+    for row in rows:
+        rate = row["posts"] / row["seconds"] if row["seconds"] > 0 else float("inf")
+        print(f"{row['name']:<32}{row['seconds']:>12.4f}{rate:>14,.0f}")
@@ -44,6 +44,86 @@ REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30000"))  # 30 segundos
 MIN_TEXT_LENGTH = int(os.getenv("MIN_TEXT_LENGTH", "10"))
 SENTIMENT_THRESHOLD = float(os.getenv("SENTIMENT_THRESHOLD", "0.1"))
 
+# Procesamiento en paralelo de un corpus grande (por bloques de posts)
+PARALLEL_MIN_POSTS = int(os.getenv("PARALLEL_MIN_POSTS", "5000"))
+PARALLEL_CHUNK_SIZE = int(os.getenv("PARALLEL_CHUNK_SIZE", "2000"))
+PARALLEL_WORKERS = int(os.getenv("PARALLEL_WORKERS", "0"))  # 0 = todos los núcleos
+# Compartir los textos del corpus (bytes UTF-8 y offsets) con los workers en
+# memoria compartida en lugar de serializarlos por el pipe del pool
+PARALLEL_SHARED_MEMORY = os.getenv("PARALLEL_SHARED_MEMORY", "True").lower() == "true"
+# Presupuesto de memoria del análisis en MB (0 = sin límite): si el corpus no
+# cabe, se procesa en bloques secuenciales
+MEMORY_BUDGET_MB = float(os.getenv("MEMORY_BUDGET_MB", "0"))
+MEMORY_PROFILE = os.getenv("MEMORY_PROFILE", "False").lower() == "true"  # tracemalloc
+# Archivo JSON de léxicos (vacío = incorporados) y su intervalo de recarga en
+# segundos (0 = sin vigilancia, solo recarga explícita)
+LEXICON_PATH = os.getenv("LEXICON_PATH", "")
+LEXICON_RELOAD_INTERVAL = float(os.getenv("LEXICON_RELOAD_INTERVAL", "0"))
+# Métricas del análisis (contadores e histogramas) y archivo de exportación
+# en formato Prometheus (vacío = no se escribe)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", "")
+# Trazas en formato Chrome Trace Event (definir TRACE_FILE también las activa)
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "False").lower() == "true"
+TRACE_FILE = os.getenv("TRACE_FILE", "")
+# Conteo de palabras únicas: exact, hll (HyperLogLog) o auto (HyperLogLog
+# desde HLL_MIN_POSTS posts); la precisión fija el error (1.04 / sqrt(2**p))
+UNIQUE_WORDS_MODE = os.getenv("UNIQUE_WORDS_MODE", "exact")
+HLL_PRECISION = int(os.getenv("HLL_PRECISION", "14"))
+HLL_MIN_POSTS = int(os.getenv("HLL_MIN_POSTS", "100000"))
+# Ventana (en tokens) de la diversidad léxica MATTR
+MATTR_WINDOW = int(os.getenv("MATTR_WINDOW", "50"))
+# Palabras más frecuentes en metadata: cuántas se reportan y contadores del
+# sketch Space-Saving (más contadores, menor error)
+TOP_WORDS_K = int(os.getenv("TOP_WORDS_K", "10"))
+TOP_WORDS_CAPACITY = int(os.getenv("TOP_WORDS_CAPACITY", "1000"))
+# Tokens por sub-lote con los que se actualiza el sketch durante la pasada
+# de tokenización (acota la memoria de los conteos dentro de un bloque)
+TOP_WORDS_BATCH = int(os.getenv("TOP_WORDS_BATCH", "10000"))
+# Columnas de los n-gramas (bigramas y trigramas) con hashing por post
+NGRAM_HASH_FEATURES = int(os.getenv("NGRAM_HASH_FEATURES", "1024"))
+# Señales sociales (emoji, hashtags, menciones y URLs) en la misma pasada de
+# tokenización: las URLs y menciones no cuentan como palabras, los emoji
+# suman al sentimiento y las señales a la extraversión
+SOCIAL_SIGNALS = os.getenv("SOCIAL_SIGNALS", "False").lower() == "true"
+# Matriz .npy de features por post (se agregan los posts de cada análisis;
+# vacío = no se exporta)
+FEATURES_FILE = os.getenv("FEATURES_FILE", "")
+# Límite de caracteres por post (0 = sin límite; Facebook admite 63.206) y qué
+# hacer con el exceso: truncate (se descarta) o chunk (fragmentos analizados
+# como posts separados)
+MAX_POST_CHARS = int(os.getenv("MAX_POST_CHARS", "65536"))
+POST_OVERFLOW = os.getenv("POST_OVERFLOW", "truncate")
+# Presupuesto de tiempo por dataset en segundos (0 = sin límite)
+DATASET_TIME_BUDGET = float(os.getenv("DATASET_TIME_BUDGET", "0"))
+
+# Configuración de procesamiento por lotes
+QUANTILE_SKETCH_K = int(os.getenv("QUANTILE_SKETCH_K", "200"))
+PIPELINE_PREFETCH = int(
+    os.getenv("PIPELINE_PREFETCH", "4")
+)  # Archivos leídos por adelantado
+PIPELINE_IO_WORKERS = int(os.getenv("PIPELINE_IO_WORKERS", "4"))
+ASYNC_MAX_IN_FLIGHT = int(os.getenv("ASYNC_MAX_IN_FLIGHT", "8"))  # Datasets en vuelo
+# Compresión de los JSON crudos y de resultados: gzip, lzma, bz2 o vacío (sin
+# comprimir); un nombre terminado en .gz, .xz o .bz2 la fija para ese archivo
+JSON_COMPRESSION = os.getenv("JSON_COMPRESSION", "")
+# Almacén de posts crudos deduplicado entre snapshots (vacío = desactivado) y
+# cuerpos de posts en su caché de lectura
+POST_STORE_PATH = os.getenv("POST_STORE_PATH", "")
+POST_STORE_CACHE_SIZE = int(os.getenv("POST_STORE_CACHE_SIZE", "4096"))
+# Base SQLite de resultados (vacío = solo archivos JSON y TXT) y resultados
+# por transacción
+RESULTS_DB = os.getenv("RESULTS_DB", "")
+RESULTS_DB_BATCH_SIZE = int(os.getenv("RESULTS_DB_BATCH_SIZE", "100"))
+
+# Servicio HTTP local de análisis (micro-lotes de solicitudes concurrentes)
+SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8765"))
+SERVICE_MAX_BATCH_SIZE = int(os.getenv("SERVICE_MAX_BATCH_SIZE", "32"))
+SERVICE_MAX_WAIT_MS = float(
+    os.getenv("SERVICE_MAX_WAIT_MS", "5")
+)  # Espera para agrupar
+
 # Selectores de Facebook (actualizados 2024)
 SELECTORS = {
     # Login
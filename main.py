@@ -2,9 +2,22 @@
 import sys
 import time
 
-from config import HEADLESS_BROWSER, MAX_POSTS, TARGET_PROFILE_URL
+from config import (
+    FEATURES_FILE,
+    HEADLESS_BROWSER,
+    MAX_POSTS,
+    METRICS_TEXTFILE,
+    POST_STORE_PATH,
+    RESULTS_DB,
+    TARGET_PROFILE_URL,
+    TRACE_FILE,
+)
+from src.metrics import REGISTRY
 from src.personality import BigFiveAnalyzer
+from src.post_store import PostStore
+from src.results_store import ResultsStore
 from src.scraper import FacebookScraper
+from src.tracing import TRACER, span
 from src.utils import format_duration, save_json
 
 
@@ -22,7 +35,9 @@ def main():
         print("\n🔍 Fase 1: Scraping de datos...")
         scrape_start = time.time()
 
-        with FacebookScraper(headless=HEADLESS_BROWSER) as scraper:
+        with span("scraping", cat="main"), FacebookScraper(
+            headless=HEADLESS_BROWSER
+        ) as scraper:
             # Login
             if not scraper.ensure_login():
                 print("❌ Falló la autenticación")
@@ -51,14 +66,26 @@ def main():
             f"✅ Scraping completado en {format_duration(time.time() - scrape_start)}"
         )
         print(f"   📄 Posts en español obtenidos: {len(posts)}")
+        if POST_STORE_PATH:
+            # Snapshot deduplicado: solo se escriben los posts nuevos
+            with span("post_store", cat="main"), PostStore(
+                POST_STORE_PATH
+            ) as post_store:
+                saved = post_store.save(time.strftime("%Y%m%d_%H%M%S"), sample_data)
+            print(
+                f"   🗃️  Snapshot {saved['snapshot']}: {saved['new_bodies']} posts "
+                f"nuevos de {saved['posts']} en {POST_STORE_PATH}"
+            )
 
         # FASE 2: Análisis Big Five en español
         print("\n🧠 Fase 2: Análisis Big Five (ESPAÑOL)...")
         analysis_start = time.time()
 
-        analyzer = BigFiveAnalyzer()
-        scores = analyzer.calculate_big_five_scores(sample_data)
-        report = analyzer.generate_personality_report(scores)
+        with span("analysis", cat="main", posts=len(posts)):
+            analyzer = BigFiveAnalyzer()
+            scores = analyzer.calculate_big_five_scores(sample_data)
+        with span("report", cat="main"):
+            report = analyzer.generate_personality_report(scores)
 
         print(
             f"✅ Análisis en español completado en {format_duration(time.time() - analysis_start)}"
@@ -88,7 +115,25 @@ def main():
         print(f"   • Polaridad promedio: {sentiment['avg_polarity']:.3f}")
 
         # Guardar resultados
-        analyzer.save_results("big5_analisis_español")
+        with span("save", cat="main"):
+            analyzer.save_results("big5_analisis_español")
+            if RESULTS_DB:
+                with ResultsStore(RESULTS_DB) as store:
+                    store.add(
+                        "big5_analisis_español",
+                        analyzer.results,
+                        source=TARGET_PROFILE_URL,
+                    )
+                print(f"🗄️  Resultados registrados en: {RESULTS_DB}")
+        if FEATURES_FILE:
+            store = analyzer.export_post_features(
+                sample_data, FEATURES_FILE, scraped_at=sample_data["scraped_at"]
+            )
+            print(f"🧮 Features por post ({len(store)} filas) en: {store.path}")
+        if METRICS_TEXTFILE:
+            print(f"📈 Métricas en: {REGISTRY.write_textfile(METRICS_TEXTFILE)}")
+        if TRACE_FILE:
+            print(f"🧭 Traza en: {TRACER.write(TRACE_FILE)}")
 
         # Estadísticas finales
         total_time = time.time() - start_time
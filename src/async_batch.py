@@ -0,0 +1,328 @@
+# src/async_batch.py
+"""
+Orquestador asyncio para lotes grandes: descubre los archivos de entrada,
+los lee en hilos, envía el análisis (CPU) a un pool de procesos con
+``run_in_executor`` y escribe los resultados en hilos, con un límite de
+datasets en vuelo. Ctrl-C cancela las tareas pendientes, detiene el pool
+y conserva los resultados ya completados. Un dataset que falla (archivo
+ilegible, presupuesto de tiempo agotado) se registra con su error sin
+detener el resto del lote.
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from config import (
+    ASYNC_MAX_IN_FLIGHT,
+    LEXICON_PATH,
+    LEXICON_RELOAD_INTERVAL,
+    METRICS_TEXTFILE,
+    PARALLEL_WORKERS,
+    RAW_DATA_PATH,
+    RESULTS_DB,
+    RESULTS_PATH,
+    TRACE_FILE,
+)
+
+from .metrics import REGISTRY
+from .personality import BigFiveAnalyzer
+from .results_store import ResultsStore
+from .tracing import TRACER, run_traced, span
+from .utils import format_duration, json_stem, load_json
+
+# Analizador reutilizado por cada proceso del pool (se crea una vez por worker)
+_worker_analyzer: Optional[BigFiveAnalyzer] = None
+
+
+def _create_worker_analyzer(
+    lexicon_path: str, reload_interval: float
+) -> BigFiveAnalyzer:
+    # Con fork el worker hereda los conteos del padre: empezar de cero para
+    # que sus deltas no se cuenten dos veces
+    REGISTRY.reset()
+    # Sin paralelismo anidado: cada worker ya es un proceso independiente
+    return BigFiveAnalyzer(
+        parallel_threshold=sys.maxsize,
+        lexicon_path=lexicon_path,
+        lexicon_reload_interval=reload_interval,
+    )
+
+
+def _init_worker(
+    lexicon_path: str = LEXICON_PATH, reload_interval: float = LEXICON_RELOAD_INTERVAL
+):
+    """Los workers ignoran SIGINT (la cancelación la coordina el proceso principal).
+
+    Cada worker vigila el archivo de léxicos por su cuenta, así un cambio
+    se aplica sin reiniciar el pool.
+    """
+    global _worker_analyzer
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_analyzer = _create_worker_analyzer(lexicon_path, reload_interval)
+
+
+def score_dataset(data: Dict) -> Tuple[Dict, Dict]:
+    """Analiza un dataset en un worker; devuelve sus resultados y el delta de métricas"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = _create_worker_analyzer(
+            LEXICON_PATH, LEXICON_RELOAD_INTERVAL
+        )
+    _worker_analyzer.calculate_big_five_scores(data)
+    return _worker_analyzer.results, REGISTRY.drain()
+
+
+def discover_inputs(folder: Union[str, Path], pattern: str = "*.json*") -> List[Path]:
+    """Lista ordenada de archivos de entrada en una carpeta (JSON, comprimidos o no)"""
+    return sorted(path for path in Path(folder).glob(pattern) if path.is_file())
+
+
+def _load_path(path: Path) -> Dict:
+    return load_json(path.name, folder=str(path.resolve().parent))
+
+
+def _print_progress(progress: Dict):
+    print(
+        f"📊 {progress['completed']}/{progress['total']} datasets | "
+        f"{progress['failed']} con error | "
+        f"{progress['datasets_per_second']:.1f} datasets/s | "
+        f"{progress['posts_per_second']:.1f} posts/s | "
+        f"{format_duration(progress['elapsed'])}",
+        flush=True,
+    )
+
+
+class AsyncBatchOrchestrator:
+    """Procesa archivos con E/S asíncrona y análisis en un pool de procesos"""
+
+    def __init__(
+        self,
+        max_in_flight: int = ASYNC_MAX_IN_FLIGHT,
+        max_workers: int = PARALLEL_WORKERS,
+        results_folder: Optional[Union[str, Path]] = None,
+        progress_interval: float = 1.0,
+        on_progress: Optional[Callable[[Dict], None]] = _print_progress,
+        lexicon_path: str = LEXICON_PATH,
+        lexicon_reload_interval: float = LEXICON_RELOAD_INTERVAL,
+        results_db: Optional[Union[str, Path]] = None,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight debe ser al menos 1")
+
+        self.max_in_flight = max_in_flight
+        self.max_workers = max_workers or None
+        self.results_folder = Path(results_folder) if results_folder else None
+        self.progress_interval = progress_interval
+        self.on_progress = on_progress
+        self.lexicon_path = lexicon_path
+        self.lexicon_reload_interval = lexicon_reload_interval
+        self.load_file: Callable[[Path], Dict] = _load_path
+        self._writer = BigFiveAnalyzer()
+        # Único escritor de la base de resultados (los workers no la abren)
+        self.store = ResultsStore(results_db) if results_db else None
+
+        self.rows: List[Optional[Dict]] = []
+        self.total = 0
+        self.completed = 0
+        self.failed = 0
+        self.posts = 0
+        self._started = 0.0
+
+    def progress(self) -> Dict:
+        """Estado actual y throughput del lote"""
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "total": self.total,
+            "posts": self.posts,
+            "elapsed": elapsed,
+            "datasets_per_second": self.completed / elapsed if elapsed > 0 else 0.0,
+            "posts_per_second": self.posts / elapsed if elapsed > 0 else 0.0,
+        }
+
+    async def _report_progress(self):
+        """Reporta el throughput periódicamente mientras el lote avanza"""
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            if self.on_progress:
+                self.on_progress(self.progress())
+
+    def _load(self, path: Path) -> Dict:
+        with span("load", cat="io", dataset=json_stem(path)):
+            return self.load_file(path)
+
+    async def _handle(self, executor, index: int, path: Path):
+        """Lee, analiza y guarda un dataset (un error solo afecta a su fila)"""
+        try:
+            results = await self._score(executor, path)
+        except Exception as e:
+            self.rows[index] = {
+                "dataset": json_stem(path),
+                "error": f"{type(e).__name__}: {e}",
+            }
+            self.failed += 1
+            self.completed += 1
+            REGISTRY.inc("bigfive_batch_failures_total")
+            return
+
+        if self.store is not None:
+            await asyncio.to_thread(self.store.add, json_stem(path), results)
+        if self.results_folder is not None:
+            await asyncio.to_thread(
+                self._writer.save_results,
+                f"{json_stem(path)}_results.json",
+                results,
+                str(self.results_folder),
+            )
+
+        self.rows[index] = {
+            "dataset": json_stem(path),
+            "scores": results["big_five_scores"],
+            "metadata": results["metadata"],
+        }
+        self.completed += 1
+        self.posts += results["metadata"].get("posts_analyzed", 0)
+
+    async def _score(self, executor, path: Path) -> Dict:
+        """Lee y analiza un dataset en el pool; combina el delta de métricas"""
+        loop = asyncio.get_running_loop()
+        data = await asyncio.to_thread(self._load, path)
+        if TRACER.enabled:
+            # El worker devuelve también sus spans para la línea de tiempo común
+            (results, metrics), events = await loop.run_in_executor(
+                executor, run_traced, score_dataset, data
+            )
+            TRACER.merge(events)
+        else:
+            results, metrics = await loop.run_in_executor(executor, score_dataset, data)
+        REGISTRY.merge(metrics)
+        return results
+
+    async def run(self, paths: List[Union[str, Path]]) -> List[Dict]:
+        """Procesa todos los archivos con como máximo max_in_flight en vuelo"""
+        paths = [Path(path) for path in paths]
+        self.rows = [None] * len(paths)
+        self.total = len(paths)
+        self.completed = 0
+        self.failed = 0
+        self.posts = 0
+        self._started = time.perf_counter()
+
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.lexicon_path, self.lexicon_reload_interval),
+        )
+        pending = iter(enumerate(paths))
+
+        async def worker():
+            # Iterador compartido: no hay await entre next() de distintas corrutinas
+            for index, path in pending:
+                await self._handle(executor, index, path)
+
+        reporter = asyncio.create_task(self._report_progress())
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.max_in_flight, len(paths)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        finally:
+            reporter.cancel()
+            await asyncio.gather(reporter, return_exceptions=True)
+            executor.shutdown(wait=True, cancel_futures=True)
+            if self.store is not None:
+                # Lo completado queda guardado aunque el lote se cancele
+                await asyncio.to_thread(self.store.flush)
+            if self.on_progress:
+                self.on_progress(self.progress())
+
+        return self.rows
+
+    async def run_folder(self, folder: Union[str, Path], pattern: str = "*.json*"):
+        """Descubre los archivos de una carpeta y los procesa"""
+        paths = await asyncio.to_thread(discover_inputs, folder, pattern)
+        return await self.run(paths)
+
+    def run_sync(self, paths: List[Union[str, Path]]) -> List[Dict]:
+        """Ejecuta el lote; ante Ctrl-C cancela limpiamente y devuelve lo completado"""
+        try:
+            return asyncio.run(self.run(paths))
+        except KeyboardInterrupt:
+            print(
+                f"\n🛑 Lote cancelado por el usuario "
+                f"({self.completed}/{self.total} datasets completados)"
+            )
+            return [row for row in self.rows if row is not None]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Análisis Big Five por lotes (asyncio)"
+    )
+    parser.add_argument("folder", nargs="?", default=str(RAW_DATA_PATH))
+    parser.add_argument("--pattern", default="*.json*")
+    parser.add_argument("--output", default=str(RESULTS_PATH))
+    parser.add_argument("--max-in-flight", type=int, default=ASYNC_MAX_IN_FLIGHT)
+    parser.add_argument("--workers", type=int, default=PARALLEL_WORKERS)
+    parser.add_argument(
+        "--lexicon", default=LEXICON_PATH, help="Archivo JSON de léxicos"
+    )
+    parser.add_argument(
+        "--lexicon-reload",
+        type=float,
+        default=LEXICON_RELOAD_INTERVAL or 5.0,
+        help="Segundos entre revisiones del archivo de léxicos",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        default=METRICS_TEXTFILE,
+        help="Archivo donde exportar las métricas en formato Prometheus",
+    )
+    parser.add_argument(
+        "--trace-file",
+        default=TRACE_FILE,
+        help="Archivo donde escribir la traza (formato Chrome Trace Event)",
+    )
+    parser.add_argument(
+        "--results-db",
+        default=RESULTS_DB,
+        help="Base SQLite donde registrar los resultados",
+    )
+    args = parser.parse_args(argv)
+
+    if args.trace_file:
+        TRACER.enabled = True
+    orchestrator = AsyncBatchOrchestrator(
+        max_in_flight=args.max_in_flight,
+        max_workers=args.workers,
+        results_folder=args.output,
+        lexicon_path=args.lexicon,
+        lexicon_reload_interval=args.lexicon_reload,
+        results_db=args.results_db,
+    )
+    rows = orchestrator.run_sync(discover_inputs(args.folder, args.pattern))
+    failed = [row for row in rows if row is not None and "error" in row]
+    print(f"✅ {len(rows) - len(failed)} datasets analizados")
+    for row in failed:
+        print(f"⚠️  {row['dataset']}: {row['error']}")
+    if args.metrics_file:
+        print(f"📈 Métricas en: {REGISTRY.write_textfile(args.metrics_file)}")
+    if args.trace_file:
+        print(f"🧭 Traza en: {TRACER.write(args.trace_file)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# src/batch.py
+"""
+Ejecución del análisis Big Five sobre lotes de datasets (por ejemplo, todo
+el archivo de ``data/raw_json``) manteniendo distribuciones resumidas de
+los puntajes y de las características intermedias mediante sketches KLL.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from config import PIPELINE_IO_WORKERS, PIPELINE_PREFETCH, QUANTILE_SKETCH_K
+
+from .metrics import REGISTRY
+from .personality import BigFiveAnalyzer
+from .pipeline import PrefetchPipeline
+from .results_store import ResultsStore
+from .sketches import KLLSketch
+from .utils import json_stem, load_json
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+class BatchRunner:
+    """Analiza múltiples datasets y mantiene sketches de cuantiles por característica"""
+
+    def __init__(
+        self,
+        analyzer: Optional[BigFiveAnalyzer] = None,
+        sketch_k: int = QUANTILE_SKETCH_K,
+    ):
+        self.analyzer = analyzer or BigFiveAnalyzer()
+        self.sketch_k = sketch_k
+        self.sketches: Dict[str, KLLSketch] = {}
+        self.datasets_processed = 0
+        self.failed = 0
+        self.pipeline_report: Dict = {}
+
+    def _observe(self, name: str, value):
+        """Registra un valor numérico en el sketch correspondiente"""
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return
+        if name not in self.sketches:
+            self.sketches[name] = KLLSketch(k=self.sketch_k)
+        self.sketches[name].update(value)
+
+    def process(self, data: Dict, name: str = "") -> Dict:
+        """Analiza un dataset y actualiza los sketches con sus resultados"""
+        scores = self.analyzer.calculate_big_five_scores(data)
+        results = self.analyzer.results
+
+        for trait, score in scores.items():
+            self._observe(f"score.{trait}", score)
+
+        components = results.get("calculated_components", {})
+        for trait, values in components.items():
+            for component, value in values.items():
+                self._observe(f"component.{trait}.{component}", value)
+
+        metadata = results.get("metadata", {})
+        for key in ("words_analyzed", "unique_words", "lexical_diversity"):
+            self._observe(f"metadata.{key}", metadata.get(key))
+
+        # Características por post (reacciones y comentarios individuales)
+        posts = data.get("posts", []) if isinstance(data, dict) else []
+        if isinstance(posts, list):
+            for post in posts:
+                if isinstance(post, dict):
+                    self._observe("post.reactions", post.get("reactions"))
+                    self._observe("post.comments", post.get("comments"))
+
+        self.datasets_processed += 1
+        return {"dataset": name, "scores": scores, "metadata": metadata}
+
+    def run(
+        self,
+        paths: Iterable[Union[str, Path]],
+        results_folder: Optional[Union[str, Path]] = None,
+        prefetch: int = PIPELINE_PREFETCH,
+        io_workers: int = PIPELINE_IO_WORKERS,
+        store: Optional[ResultsStore] = None,
+    ) -> List[Dict]:
+        """Analiza una lista de archivos JSON crudos.
+
+        La lectura/parseo de los siguientes archivos y la escritura de los
+        resultados (si se indica ``results_folder``) se solapan con el
+        análisis del archivo actual. Con ``store`` los resultados también se
+        registran en la base SQLite desde el hilo de guardado. La utilización
+        de cada etapa queda en ``self.pipeline_report``.
+
+        Un archivo ilegible o un análisis fallido solo afecta a su fila, que
+        se devuelve con el error en lugar de los puntajes.
+        """
+
+        def load(path: Path):
+            try:
+                return load_json(path.name, folder=str(path.parent))
+            except Exception as e:
+                # El error se registra en la etapa de procesamiento, en orden
+                return e
+
+        def process(path: Path, data):
+            try:
+                if isinstance(data, Exception):
+                    raise data
+                row = self.process(data, name=json_stem(path))
+            except Exception as e:
+                self.failed += 1
+                REGISTRY.inc("bigfive_batch_failures_total")
+                error = {
+                    "dataset": json_stem(path),
+                    "error": f"{type(e).__name__}: {e}",
+                }
+                return error, None
+            # Instantánea: el analizador reemplaza self.results en cada dataset
+            return row, self.analyzer.results
+
+        def save(path: Path, output):
+            _, results = output
+            if results is None:
+                return
+            if store is not None:
+                store.add(json_stem(path), results)
+            if results_folder is not None:
+                self.analyzer.save_results(
+                    f"{json_stem(path)}_results.json",
+                    results=results,
+                    folder=str(results_folder),
+                )
+
+        saving = results_folder is not None or store is not None
+        pipeline = PrefetchPipeline(
+            load,
+            process,
+            save=save if saving else None,
+            prefetch=prefetch,
+            io_workers=io_workers,
+        )
+        try:
+            outputs = pipeline.run(Path(path).resolve() for path in paths)
+        finally:
+            if store is not None:
+                store.flush()
+        self.pipeline_report = pipeline.report()
+        return [row for row, _ in outputs]
+
+    # ========== CONSULTAS ==========
+
+    def quantile(self, feature: str, q: float) -> float:
+        """Devuelve el cuantil q de una característica registrada"""
+        if feature not in self.sketches:
+            raise KeyError(f"Característica sin datos: {feature}")
+        return self.sketches[feature].quantile(q)
+
+    def summary(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict:
+        """Resume todas las características con sus cuantiles"""
+        summary = {}
+        for feature, sketch in sorted(self.sketches.items()):
+            summary[feature] = {
+                "count": sketch.count,
+                "min": sketch.min_value,
+                "max": sketch.max_value,
+                "quantiles": {
+                    f"p{q * 100:g}": value
+                    for q, value in zip(quantiles, sketch.quantiles(quantiles))
+                },
+                "rank_error": sketch.normalized_rank_error,
+            }
+        return summary
+
+    # ========== COMBINACIÓN Y PERSISTENCIA ==========
+
+    def merge(self, other: "BatchRunner") -> "BatchRunner":
+        """Combina los sketches de otro runner (otro worker u otra ejecución)"""
+        for feature, sketch in other.sketches.items():
+            # Validar todo antes de modificar para no dejar una combinación parcial
+            expected = (
+                self.sketches[feature].k if feature in self.sketches else self.sketch_k
+            )
+            if sketch.k != expected:
+                raise ValueError(
+                    f"Solo se pueden combinar sketches con el mismo k "
+                    f"({feature}: {sketch.k} != {expected})"
+                )
+        for feature, sketch in other.sketches.items():
+            if feature in self.sketches:
+                self.sketches[feature].merge(sketch)
+            else:
+                self.sketches[feature] = KLLSketch.from_dict(sketch.to_dict())
+        self.datasets_processed += other.datasets_processed
+        self.failed += other.failed
+        return self
+
+    def sketches_to_dict(self) -> Dict:
+        """Serializa el estado de los sketches"""
+        return {
+            "datasets_processed": self.datasets_processed,
+            "sketches": {name: s.to_dict() for name, s in self.sketches.items()},
+        }
+
+    def load_sketches(self, state: Dict) -> "BatchRunner":
+        """Combina un estado serializado con sketches_to_dict"""
+        other = BatchRunner(analyzer=self.analyzer, sketch_k=self.sketch_k)
+        other.datasets_processed = state.get("datasets_processed", 0)
+        other.sketches = {
+            name: KLLSketch.from_dict(data)
+            for name, data in state.get("sketches", {}).items()
+        }
+        return self.merge(other)
+
+    def save_sketches(self, path: Union[str, Path]) -> Path:
+        """Guarda los sketches en un archivo JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.sketches_to_dict(), f, ensure_ascii=False)
+        return path
@@ -0,0 +1,143 @@
+# src/diversity.py
+"""
+Diversidad léxica robusta a la longitud del corpus: MATTR (moving-average
+type-token ratio), el promedio de la proporción tipos/tokens en todas las
+ventanas de ``window`` tokens consecutivos.
+
+La suma de tipos distintos de todas las ventanas se acumula en O(n) sin
+recorrer cada ventana: el token en la posición ``j`` es un tipo nuevo en
+``min(j - anterior, window)`` ventanas, donde ``anterior`` es la posición
+de su aparición previa (las ventanas que empiezan después de ella y antes
+de ``j``). Una tabla con la última posición de cada token, podada a las
+últimas ``window`` posiciones, da esa distancia con memoria acotada.
+
+Los acumuladores de bloques consecutivos se combinan con ``merge`` (en
+orden): solo los primeros ``window - 1`` tokens de cada bloque dependen
+del bloque anterior, así que el resultado es idéntico al de una pasada.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+def _window_contributions(context: Sequence[str], tokens: Sequence[str], window: int):
+    """Suma de min(distancia a la aparición previa, window) de tokens tras context"""
+    last: Dict[str, int] = {}
+    for position, token in enumerate(context):
+        last[token] = position
+    total = 0
+    position = len(context)
+    for token in tokens:
+        total += min(position - last.get(token, -1), window)
+        last[token] = position
+        position += 1
+    return total
+
+
+def _suffix_types(tokens: Sequence[str]) -> int:
+    """Suma de tipos distintos de todos los sufijos no vacíos de tokens"""
+    seen = set()
+    total = 0
+    for token in reversed(tokens):
+        seen.add(token)
+        total += len(seen)
+    return total
+
+
+class MATTRAccumulator:
+    """Acumulador de MATTR en una pasada, combinable entre bloques consecutivos"""
+
+    __slots__ = ("window", "tokens", "head", "tail", "body_total", "_last")
+
+    def __init__(self, window: int = 50):
+        if window < 1:
+            raise ValueError("window debe ser al menos 1")
+        self.window = window
+        self.tokens = 0
+        # Primeros window-1 tokens: su aporte depende del bloque anterior
+        self.head: List[str] = []
+        # Últimos window-1 tokens: contexto para el bloque siguiente
+        self.tail: deque = deque(maxlen=window - 1)
+        # Aporte de los tokens desde la posición window-1 del bloque
+        self.body_total = 0
+        self._last: Dict[str, int] = {}
+
+    def update(self, tokens: Iterable[str]):
+        """Añade los tokens siguientes de la secuencia"""
+        if not isinstance(tokens, list):
+            tokens = list(tokens)
+        window = self.window
+        position = self.tokens
+        last = self._last
+
+        head = tokens[: max(window - 1 - position, 0)]
+        for token in head:
+            last[token] = position
+            position += 1
+        self.head.extend(head)
+
+        body_total = 0
+        for token in tokens[len(head) :]:
+            # Sin aparición en las últimas window posiciones el aporte es window
+            distance = position - last.get(token, -window)
+            body_total += distance if distance < window else window
+            last[token] = position
+            position += 1
+
+        self.body_total += body_total
+        self.tail.extend(tokens)
+        self.tokens = position
+        if len(last) > 4 * window:
+            # Las posiciones anteriores a la ventana ya no cambian ningún aporte
+            cutoff = position - window
+            self._last = {t: p for t, p in last.items() if p > cutoff}
+
+    def merge(self, other: "MATTRAccumulator") -> "MATTRAccumulator":
+        """Añade a continuación los tokens resumidos en otro acumulador (in-place)"""
+        if other.window != self.window:
+            raise ValueError(
+                "Solo se pueden combinar acumuladores con la misma ventana"
+            )
+
+        head_size = self.window - 1
+        # Los primeros tokens de other que siguen siendo cabeza global se difieren
+        deferred = max(min(head_size - self.tokens, len(other.head)), 0)
+        context = list(self.tail) + other.head[:deferred]
+        self.body_total += other.body_total + _window_contributions(
+            context, other.head[deferred:], self.window
+        )
+        self.head.extend(other.head[:deferred])
+
+        self.tail.extend(other.tail)
+        self.tokens += other.tokens
+        start = self.tokens - len(self.tail)
+        self._last = {token: start + i for i, token in enumerate(self.tail)}
+        return self
+
+    def __ior__(self, other: "MATTRAccumulator") -> "MATTRAccumulator":
+        return self.merge(other)
+
+    @property
+    def windows(self) -> int:
+        """Número de ventanas completas"""
+        return max(self.tokens - self.window + 1, 0)
+
+    def value(self) -> Optional[float]:
+        """MATTR de la secuencia (None si tiene menos tokens que la ventana)"""
+        if self.windows == 0:
+            return None
+        total = (
+            _window_contributions((), self.head, self.window)
+            + self.body_total
+            # Las "ventanas" que empiezan en los últimos window-1 tokens están
+            # incompletas: se descuentan sus tipos
+            - _suffix_types(list(self.tail))
+        )
+        return total / (self.windows * self.window)
+
+
+def mattr(tokens: Sequence[str], window: int = 50) -> Optional[float]:
+    """MATTR de una secuencia de tokens (None si es más corta que la ventana)"""
+    accumulator = MATTRAccumulator(window)
+    accumulator.update(tokens)
+    return accumulator.value()
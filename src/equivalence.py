@@ -0,0 +1,462 @@
+# src/equivalence.py
+"""
+Arnés diferencial entre el motor de referencia congelado
+(``src/reference.py``) y el motor actual (``BigFiveAnalyzer``).
+
+Genera corpus sintéticos (posts con palabras de los léxicos, negaciones,
+intensificadores, mayúsculas, acentos) y fuzzeados (tipos inesperados,
+unicode, puntuación, valores extremos), los puntúa con ambos motores y
+compara puntajes y metadata campo a campo con una tolerancia. También
+compara ``analyze_sentiment`` texto a texto y mide el tiempo de cada
+motor, así que cada optimización se acompaña de su prueba de
+equivalencia y de su aceleración.
+
+Cada motor (``ENGINES``) es un camino de ejecución del analizador: en
+serie, micro-lotes, pool de procesos, memoria compartida y streaming por
+bloques; los tres últimos se configuran con umbrales mínimos para que se
+ejerciten incluso con datasets pequeños. Con pocos posts por dataset
+domina el costo fijo de cada análisis y de cada pool, así que la tabla
+de tiempos solo se muestra a partir de ``TIMING_MIN_TEXTS`` textos por
+dataset en promedio (o con ``--timing``).
+
+Los datasets con los que la referencia lanza una excepción quedan fuera
+de su dominio: se cuentan aparte y no se comparan.
+
+Uso: ``python -m src.equivalence --datasets 500 --fuzz 500 --engine micro_batch``
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from .metrics import MetricsRegistry
+from .personality import BigFiveAnalyzer
+from .reference import ReferenceBigFiveAnalyzer, ReferenceSentimentAnalyzer
+
+# Vocabulario de los corpus sintéticos: léxicos, sentimiento, negaciones,
+# intensificadores, mayúsculas, acentos, dígitos y guiones bajos
+WORDS = (
+    "feliz triste no muy fiesta amigos arte libro ayudar trabajo proyecto "
+    "nervioso ansioso Hola Feliz NUNCA nada cansado ÁRBOL ñandú día x1 _ hoy "
+    "es martes jamás realmente amor odio música leer metas respeto grupo "
+    "tampoco extremadamente genial horrible Música AMIGOS"
+).split()
+
+# Fragmentos para textos fuzzeados
+FUZZ_FRAGMENTS = (
+    "",
+    " ",
+    "\n\t",
+    "...",
+    "¡¿?!",
+    "😀😭",
+    "#fiesta",
+    "@amigos",
+    "https://ejemplo.com/feliz?x=1",
+    "İstanbul",
+    "straße",
+    "ﬁesta",
+    "​",
+    "٣٤",
+    "①②",
+    "no no no feliz",
+    "muy muy triste",
+    "x" * 200,
+    "a_b_c",
+    "Ñ",
+)
+
+
+def synthetic_dataset(
+    rng: random.Random, max_posts: int = 12, max_words: int = 25
+) -> Dict:
+    """Dataset con posts de palabras aleatorias y campos numéricos variados"""
+    posts = []
+    for _ in range(rng.randint(0, max_posts)):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, max_words)))
+        if rng.random() < 0.2:
+            text = "  " + text + ".!, "
+        post = {
+            "text": text,
+            "reactions": rng.choice([rng.randint(0, 80), rng.random() * 70, True, "x"]),
+            "comments": rng.choice([rng.randint(0, 20), rng.random() * 9.3, None]),
+        }
+        if rng.random() < 0.1:
+            post = {"reactions": 5}
+        posts.append(post)
+    return {
+        "posts": posts,
+        "friends_count": rng.randint(0, 2000),
+        "groups": ["g"] * rng.randint(0, 12),
+        "basic_info": {"bio": "x" * rng.randint(0, 40)},
+    }
+
+
+def _fuzz_text(rng: random.Random):
+    kind = rng.random()
+    if kind < 0.1:
+        return rng.choice([None, 42, 3.5, ["feliz"], {"t": 1}, True])
+    pieces = [
+        rng.choice(FUZZ_FRAGMENTS) if rng.random() < 0.4 else rng.choice(WORDS)
+        for _ in range(rng.randint(0, 15))
+    ]
+    return rng.choice([" ", "", ",", "\n"]).join(pieces)
+
+
+def _fuzz_number(rng: random.Random):
+    return rng.choice(
+        [0, -5, 1e308, -1e-9, float("inf"), True, False, "7", None, rng.random() * 1e4]
+    )
+
+
+def fuzzed_dataset(rng: random.Random) -> object:
+    """Dataset con tipos inesperados, unicode y valores extremos"""
+    if rng.random() < 0.05:
+        return rng.choice([None, [], "posts", {}, {"posts": None}])
+    posts = []
+    for _ in range(rng.randint(0, 10)):
+        if rng.random() < 0.1:
+            posts.append(rng.choice([None, "texto suelto", 5, ["feliz"]]))
+            continue
+        post = {"text": _fuzz_text(rng)}
+        if rng.random() < 0.8:
+            post["reactions"] = _fuzz_number(rng)
+        if rng.random() < 0.8:
+            post["comments"] = _fuzz_number(rng)
+        posts.append(post)
+    return {
+        "posts": posts if rng.random() < 0.95 else "no es una lista",
+        "friends_count": _fuzz_number(rng),
+        "groups": rng.choice([[], ["a"] * 15, "grupos", None, {"a": 1}]),
+        "basic_info": rng.choice(
+            [
+                {"bio": "Responsable y organizada, siempre a tiempo"},
+                {"bio": "   "},
+                {"bio": None},
+                {"bio": 12345},
+                "bio",
+                None,
+            ]
+        ),
+    }
+
+
+def generate_corpus(
+    n_synthetic: int,
+    n_fuzzed: int,
+    seed: int = 0,
+    max_posts: int = 12,
+    max_words: int = 25,
+) -> List:
+    """Datasets sintéticos seguidos de fuzzeados, reproducibles con seed"""
+    rng = random.Random(seed)
+    datasets = [
+        synthetic_dataset(rng, max_posts, max_words) for _ in range(n_synthetic)
+    ]
+    datasets.extend(fuzzed_dataset(rng) for _ in range(n_fuzzed))
+    return datasets
+
+
+# ========== COMPARACIÓN ==========
+
+
+def _diff(expected, actual, tolerance: float, path: str) -> List[str]:
+    """Diferencias entre dos valores (solo las claves de expected en los dict)"""
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict):
+            return [f"{path}: se esperaba un dict, se obtuvo {type(actual).__name__}"]
+        differences = []
+        for key, value in expected.items():
+            if key not in actual:
+                differences.append(f"{path}.{key}: falta")
+            else:
+                differences.extend(
+                    _diff(value, actual[key], tolerance, f"{path}.{key}")
+                )
+        return differences
+    if isinstance(expected, (list, tuple)):
+        if not isinstance(actual, (list, tuple)) or len(actual) != len(expected):
+            return [f"{path}: {expected!r} != {actual!r}"]
+        differences = []
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            differences.extend(_diff(a, b, tolerance, f"{path}[{i}]"))
+        return differences
+    if (
+        isinstance(expected, (int, float))
+        and isinstance(actual, (int, float))
+        and not isinstance(expected, bool)
+        and not isinstance(actual, bool)
+    ):
+        if math.isnan(expected) and math.isnan(actual):
+            return []
+        if expected == actual or abs(expected - actual) <= tolerance:
+            return []
+        return [f"{path}: {expected!r} != {actual!r}"]
+    if expected != actual:
+        return [f"{path}: {expected!r} != {actual!r}"]
+    return []
+
+
+def _run_reference(datasets: List) -> List[Optional[Dict]]:
+    analyzer = ReferenceBigFiveAnalyzer()
+    outputs = []
+    for data in datasets:
+        try:
+            scores = analyzer.calculate_big_five_scores(data)
+        except Exception:
+            outputs.append(None)
+            continue
+        outputs.append({"scores": scores, "metadata": analyzer.results["metadata"]})
+    return outputs
+
+
+def _run_serial(analyzer: BigFiveAnalyzer, datasets: List) -> List[Dict]:
+    outputs = []
+    for data in datasets:
+        try:
+            scores = analyzer.calculate_big_five_scores(data)
+        except Exception as e:
+            outputs.append({"error": type(e).__name__})
+            continue
+        outputs.append({"scores": scores, "metadata": analyzer.results["metadata"]})
+    return outputs
+
+
+def _run_micro_batch(
+    analyzer: BigFiveAnalyzer, datasets: List, batch_size: int = 32
+) -> List[Dict]:
+    outputs = []
+    for start in range(0, len(datasets), batch_size):
+        batch = datasets[start : start + batch_size]
+        try:
+            results = analyzer.calculate_big_five_scores_batch(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                outputs.append({"error": type(e).__name__})
+                continue
+            # Un dataset con error hace fallar el lote: se atribuye uno a uno
+            for data in batch:
+                outputs.extend(_run_micro_batch(analyzer, [data], 1))
+            continue
+        outputs.extend(
+            {"scores": result["big_five_scores"], "metadata": result["metadata"]}
+            for result in results
+        )
+    return outputs
+
+
+ENGINES: Dict[str, Callable] = {
+    "serial": _run_serial,
+    "micro_batch": _run_micro_batch,
+    "parallel": _run_serial,
+    "shared_memory": _run_serial,
+    "streaming": _run_serial,
+}
+
+# Opciones del analizador candidato de cada motor (umbrales mínimos para que
+# los caminos por bloques se usen también con datasets de pocos posts)
+ENGINE_OPTIONS: Dict[str, Dict] = {
+    "serial": {},
+    "micro_batch": {},
+    "parallel": {
+        "parallel_threshold": 2,
+        "chunk_size": 2,
+        "max_workers": 2,
+        "use_shared_memory": False,
+    },
+    "shared_memory": {
+        "parallel_threshold": 2,
+        "chunk_size": 2,
+        "max_workers": 2,
+        "use_shared_memory": True,
+    },
+    "streaming": {"memory_budget_mb": 1e-6},
+}
+
+# Textos por dataset (en promedio) a partir de los cuales se reportan tiempos
+TIMING_MIN_TEXTS = 100
+
+
+def engine_analyzer(engine: str) -> BigFiveAnalyzer:
+    """Analizador candidato de un motor, con el léxico integrado y métricas
+    propias (para no mezclar conteos con el registro global del proceso)"""
+    if engine not in ENGINES:
+        raise ValueError(f"Motor desconocido: {engine} (opciones: {sorted(ENGINES)})")
+    return BigFiveAnalyzer(
+        lexicon_path="",
+        metrics=MetricsRegistry(enabled=False),
+        **ENGINE_OPTIONS[engine],
+    )
+
+
+def _texts(datasets: List) -> List[str]:
+    """Textos (cadenas) de todos los posts, para comparar analyze_sentiment"""
+    texts = []
+    for data in datasets:
+        posts = data.get("posts") if isinstance(data, dict) else None
+        if isinstance(posts, list):
+            texts.extend(
+                post["text"]
+                for post in posts
+                if isinstance(post, dict) and isinstance(post.get("text"), str)
+            )
+    return texts
+
+
+def _timed(func: Callable, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _timing(reference_seconds: float, candidate_seconds: float) -> Dict:
+    return {
+        "reference_seconds": round(reference_seconds, 6),
+        "candidate_seconds": round(candidate_seconds, 6),
+        "speedup": (
+            round(reference_seconds / candidate_seconds, 3)
+            if candidate_seconds > 0
+            else None
+        ),
+    }
+
+
+def compare_engines(
+    datasets: List,
+    engine: str = "serial",
+    analyzer: Optional[BigFiveAnalyzer] = None,
+    tolerance: float = 1e-12,
+    max_reported: int = 20,
+) -> Dict:
+    """Puntúa los datasets con ambos motores y reporta discrepancias y tiempos.
+
+    ``analyzer`` es el motor candidato (por defecto el de engine_analyzer).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Motor desconocido: {engine} (opciones: {sorted(ENGINES)})")
+    if analyzer is None:
+        analyzer = engine_analyzer(engine)
+
+    expected, reference_seconds = _timed(_run_reference, datasets)
+    actual, candidate_seconds = _timed(ENGINES[engine], analyzer, datasets)
+
+    mismatches = []
+    mismatch_count = 0
+    reference_errors = 0
+    for i, (reference, candidate) in enumerate(zip(expected, actual)):
+        if reference is None:
+            reference_errors += 1
+            continue
+        differences = _diff(reference, candidate, tolerance, "")
+        if differences:
+            mismatch_count += 1
+            if len(mismatches) < max_reported:
+                mismatches.append({"dataset": i, "differences": differences[:5]})
+
+    # analyze_sentiment texto a texto
+    texts = _texts(datasets)
+    reference_sentiment = ReferenceSentimentAnalyzer()
+    candidate_sentiment = analyzer.sentiment_analyzer
+    sentiment_expected, sentiment_reference_seconds = _timed(
+        lambda: [reference_sentiment.analyze_sentiment(text) for text in texts]
+    )
+    sentiment_actual, sentiment_candidate_seconds = _timed(
+        lambda: [candidate_sentiment.analyze_sentiment(text) for text in texts]
+    )
+    sentiment_mismatches = 0
+    for i, (a, b) in enumerate(zip(sentiment_expected, sentiment_actual)):
+        differences = _diff(a, b, tolerance, "")
+        if differences:
+            sentiment_mismatches += 1
+            if len(mismatches) < max_reported:
+                mismatches.append({"text": texts[i][:80], "differences": differences})
+
+    return {
+        "engine": engine,
+        "datasets": len(datasets),
+        "compared": len(datasets) - reference_errors,
+        "reference_errors": reference_errors,
+        "texts": len(texts),
+        "timing_representative": len(texts) >= TIMING_MIN_TEXTS * max(len(datasets), 1),
+        "tolerance": tolerance,
+        "mismatch_count": mismatch_count,
+        "sentiment_mismatch_count": sentiment_mismatches,
+        "mismatches": mismatches,
+        "timing": {
+            "calculate_big_five_scores": _timing(reference_seconds, candidate_seconds),
+            "analyze_sentiment": _timing(
+                sentiment_reference_seconds, sentiment_candidate_seconds
+            ),
+        },
+    }
+
+
+def format_report(report: Dict, show_timing: bool = False) -> str:
+    """Tabla de tiempos lado a lado (si los datasets son representativos o
+    show_timing) y resumen de discrepancias"""
+    lines = [
+        f"Motor candidato: {report['engine']} | datasets: {report['datasets']} "
+        f"(comparados {report['compared']}, fuera del dominio de la referencia "
+        f"{report['reference_errors']}) | textos: {report['texts']}",
+    ]
+    if show_timing or report["timing_representative"]:
+        lines.append(
+            f"{'función':<28}{'referencia (s)':>16}{'actual (s)':>14}{'aceleración':>14}"
+        )
+        for name, timing in report["timing"].items():
+            speedup = timing["speedup"]
+            lines.append(
+                f"{name:<28}{timing['reference_seconds']:>16.4f}"
+                f"{timing['candidate_seconds']:>14.4f}"
+                f"{(f'{speedup:.2f}x' if speedup else '-'):>14}"
+            )
+    else:
+        lines.append(
+            f"Tiempos omitidos: menos de {TIMING_MIN_TEXTS} textos por dataset, "
+            "domina el costo fijo de cada análisis (usar --timing para verlos)"
+        )
+    lines.append(
+        f"Discrepancias: {report['mismatch_count']} datasets, "
+        f"{report['sentiment_mismatch_count']} textos (tolerancia {report['tolerance']:g})"
+    )
+    for mismatch in report["mismatches"]:
+        where = (
+            f"dataset {mismatch['dataset']}"
+            if "dataset" in mismatch
+            else f"texto {mismatch['text']!r}"
+        )
+        lines.append(f"  ✗ {where}: {'; '.join(mismatch['differences'])}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Equivalencia y aceleración del motor actual frente a la referencia"
+    )
+    parser.add_argument("--datasets", type=int, default=300, help="Datasets sintéticos")
+    parser.add_argument("--fuzz", type=int, default=300, help="Datasets fuzzeados")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-posts", type=int, default=12)
+    parser.add_argument("--max-words", type=int, default=25)
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="serial")
+    parser.add_argument("--tolerance", type=float, default=1e-12)
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="Mostrar los tiempos aunque los datasets sean pequeños",
+    )
+    args = parser.parse_args(argv)
+
+    datasets = generate_corpus(
+        args.datasets, args.fuzz, args.seed, args.max_posts, args.max_words
+    )
+    report = compare_engines(datasets, args.engine, tolerance=args.tolerance)
+    print(format_report(report, show_timing=args.timing))
+    return 1 if report["mismatch_count"] or report["sentiment_mismatch_count"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
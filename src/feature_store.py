@@ -0,0 +1,175 @@
+# src/feature_store.py
+"""
+Matriz de features por post en disco para modelos posteriores.
+
+Las filas se guardan en un archivo ``.npy`` estándar (se abre con
+``np.load(path, mmap_mode="r")``) y el esquema en un JSON al lado
+(``<archivo>.json``): nombre de cada columna, grupos de columnas, tipo y
+lotes agregados. La cabecera del ``.npy`` se escribe con un tamaño fijo,
+así que agregar un lote solo escribe las filas nuevas al final y
+reescribe la forma en su lugar, sin copiar lo anterior.
+
+La lectura usa ``numpy.memmap``: ``rows(start, stop)`` copia solo las
+filas pedidas, aunque la matriz no quepa en memoria.
+"""
+
+import ast
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+FORMAT_NAME = "bigfive-post-features"
+FORMAT_VERSION = 1
+
+_MAGIC = b"\x93NUMPY\x01\x00"
+# Bytes totales de la cabecera (múltiplo de 64, con espacio para formas grandes)
+_HEADER_SIZE = 128
+
+
+def _header(dtype: np.dtype, shape: Sequence[int]) -> bytes:
+    """Cabecera .npy versión 1.0 rellenada a _HEADER_SIZE bytes"""
+    fields = {
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": False,
+        "shape": tuple(int(n) for n in shape),
+    }
+    text = repr(fields).encode("latin1")
+    padding = _HEADER_SIZE - len(_MAGIC) - 2 - len(text) - 1
+    if padding < 0:
+        raise ValueError(f"Forma demasiado grande para la cabecera: {shape}")
+    text += b" " * padding + b"\n"
+    return _MAGIC + len(text).to_bytes(2, "little") + text
+
+
+def _read_shape(f) -> tuple:
+    header = f.read(_HEADER_SIZE)
+    if header[: len(_MAGIC)] != _MAGIC:
+        raise ValueError("El archivo no tiene una cabecera .npy versión 1.0")
+    return ast.literal_eval(header[len(_MAGIC) + 2 :].decode("latin1"))["shape"]
+
+
+class FeatureStore:
+    """Matriz de features (filas = posts) agregable por lotes y legible con memmap"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.schema_path = self.path.with_name(self.path.name + ".json")
+
+    # ========== ESQUEMA ==========
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists() and self.schema_path.exists()
+
+    def schema(self) -> Dict:
+        """Esquema del JSON lateral (columnas, grupos, tipo, filas y lotes)"""
+        if not self.exists:
+            raise FileNotFoundError(f"Matriz de features no encontrada: {self.path}")
+        with open(self.schema_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @property
+    def columns(self) -> List[str]:
+        return self.schema()["columns"]
+
+    def __len__(self) -> int:
+        return self.schema()["rows"] if self.exists else 0
+
+    def _write_schema(self, schema: Dict):
+        temporary = self.schema_path.with_name(
+            f".{self.schema_path.name}.{os.getpid()}.tmp"
+        )
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(schema, f, indent=2, ensure_ascii=False)
+        os.replace(temporary, self.schema_path)
+
+    # ========== ESCRITURA ==========
+
+    def append(
+        self,
+        matrix: np.ndarray,
+        columns: Sequence[str],
+        groups: Optional[Dict[str, List[int]]] = None,
+        dtype=np.float32,
+        **batch_info,
+    ) -> int:
+        """Agrega filas al final (crea el archivo si no existe); retorna el total.
+
+        ``groups`` asigna rangos ``[inicio, fin)`` de columnas a nombres (solo
+        se guarda al crear). ``batch_info`` se registra con el lote en el
+        esquema (p. ej. el dataset de origen).
+        """
+        matrix = np.asarray(matrix)
+        if matrix.ndim != 2 or matrix.shape[1] != len(columns):
+            raise ValueError("La matriz debe ser 2D con una columna por nombre")
+
+        if self.exists:
+            schema = self.schema()
+            if list(columns) != schema["columns"]:
+                raise ValueError(
+                    "Las columnas no coinciden con las de la matriz existente"
+                )
+            dtype = np.dtype(schema["dtype"])
+        else:
+            dtype = np.dtype(dtype)
+            schema = {
+                "format": FORMAT_NAME,
+                "version": FORMAT_VERSION,
+                "dtype": np.lib.format.dtype_to_descr(dtype),
+                "columns": list(columns),
+                "groups": groups or {},
+                "rows": 0,
+                "batches": [],
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(_header(dtype, (0, len(columns))))
+
+        rows = schema["rows"] + len(matrix)
+        data = np.ascontiguousarray(matrix, dtype=dtype)
+        with open(self.path, "r+b") as f:
+            # Se descarta lo que haya quedado de una escritura interrumpida
+            end = _HEADER_SIZE + schema["rows"] * len(columns) * dtype.itemsize
+            f.seek(end)
+            f.truncate()
+            f.write(data.tobytes())
+            f.flush()
+            f.seek(0)
+            f.write(_header(dtype, (rows, len(columns))))
+
+        schema["rows"] = rows
+        schema["batches"].append(
+            {
+                "start": rows - len(matrix),
+                "rows": len(matrix),
+                "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                **batch_info,
+            }
+        )
+        self._write_schema(schema)
+        return rows
+
+    # ========== LECTURA ==========
+
+    def open(self) -> np.memmap:
+        """Matriz completa como memmap de solo lectura (no carga los datos)"""
+        schema = self.schema()
+        with open(self.path, "rb") as f:
+            shape = _read_shape(f)
+        if shape[0] != schema["rows"]:
+            raise ValueError(
+                f"Filas del archivo ({shape[0]}) y del esquema ({schema['rows']}) no coinciden"
+            )
+        return np.load(self.path, mmap_mode="r")
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Copia en memoria de las filas [start, stop)"""
+        return np.array(self.open()[start:stop])
+
+    def column(self, name: str) -> np.ndarray:
+        """Copia en memoria de una columna por nombre"""
+        return np.array(self.open()[:, self.columns.index(name)])
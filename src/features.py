@@ -0,0 +1,459 @@
+# src/features.py
+"""
+Representación vectorial de los textos: tokenización, vocabulario,
+matriz documento-término dispersa en formato CSR y n-gramas con hashing,
+construidos solo con arreglos de NumPy (sin dependencia de SciPy).
+"""
+
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+WORD_PATTERN = re.compile(r"\b\w+\b")
+
+# Palabras funcionales del español que no se reportan como palabras de contenido
+SPANISH_STOPWORDS = frozenset(
+    {
+        "a",
+        "al",
+        "algo",
+        "algunas",
+        "algunos",
+        "ante",
+        "antes",
+        "aquel",
+        "aquella",
+        "aquellas",
+        "aquellos",
+        "aqui",
+        "aquí",
+        "asi",
+        "así",
+        "aun",
+        "aún",
+        "bien",
+        "cada",
+        "casi",
+        "como",
+        "con",
+        "contra",
+        "cual",
+        "cuales",
+        "cuando",
+        "de",
+        "del",
+        "desde",
+        "donde",
+        "dos",
+        "durante",
+        "e",
+        "el",
+        "ella",
+        "ellas",
+        "ello",
+        "ellos",
+        "en",
+        "entre",
+        "era",
+        "eran",
+        "es",
+        "esa",
+        "esas",
+        "ese",
+        "eso",
+        "esos",
+        "esta",
+        "estaba",
+        "estaban",
+        "estamos",
+        "estar",
+        "estas",
+        "este",
+        "esto",
+        "estos",
+        "estoy",
+        "está",
+        "están",
+        "fue",
+        "fueron",
+        "fui",
+        "ha",
+        "había",
+        "han",
+        "has",
+        "hasta",
+        "hay",
+        "he",
+        "la",
+        "las",
+        "le",
+        "les",
+        "lo",
+        "los",
+        "mas",
+        "me",
+        "mi",
+        "mis",
+        "mucho",
+        "muchos",
+        "muy",
+        "más",
+        "mí",
+        "nada",
+        "ni",
+        "no",
+        "nos",
+        "nosotros",
+        "o",
+        "os",
+        "otra",
+        "otras",
+        "otro",
+        "otros",
+        "para",
+        "pero",
+        "poco",
+        "por",
+        "porque",
+        "que",
+        "quien",
+        "quienes",
+        "quién",
+        "qué",
+        "se",
+        "sea",
+        "ser",
+        "si",
+        "sido",
+        "sin",
+        "sobre",
+        "solo",
+        "son",
+        "soy",
+        "su",
+        "sus",
+        "sí",
+        "sólo",
+        "también",
+        "tan",
+        "tanto",
+        "te",
+        "tener",
+        "tengo",
+        "ti",
+        "tiene",
+        "tienen",
+        "todo",
+        "todos",
+        "tu",
+        "tus",
+        "tú",
+        "un",
+        "una",
+        "unas",
+        "uno",
+        "unos",
+        "usted",
+        "ustedes",
+        "va",
+        "vamos",
+        "van",
+        "y",
+        "ya",
+        "yo",
+        "él",
+    }
+)
+
+
+def tokenize(text: str, lowercase: bool = True) -> List[str]:
+    """Divide un texto en palabras usando el mismo patrón que el analizador"""
+    if lowercase:
+        text = text.lower()
+    return WORD_PATTERN.findall(text)
+
+
+def tokenize_cased(text: str) -> Tuple[List[str], List[str]]:
+    """Tokens del texto tal cual y en minúsculas con una sola tokenización.
+
+    Pasar cada token a minúsculas da los mismos tokens que tokenize(text)
+    salvo si algún carácter cambia de longitud (p. ej. 'İ') o con la sigma
+    mayúscula (su minúscula depende del contexto); en esos casos se
+    tokeniza aparte el texto en minúsculas.
+    """
+    tokens = WORD_PATTERN.findall(text)
+    if not tokens:
+        return tokens, []
+    # Ningún token contiene "\x00": se pasan todos a minúsculas de una vez
+    joined = "\x00".join(tokens)
+    lower = joined.lower()
+    if len(lower) != len(joined) or "Σ" in joined:
+        return tokens, tokenize(text)
+    return tokens, lower.split("\x00")
+
+
+def is_content_word(word: str) -> bool:
+    """Palabra con contenido léxico: no es funcional, número ni una sola letra"""
+    return len(word) > 1 and not word.isdigit() and word not in SPANISH_STOPWORDS
+
+
+class Vocabulary:
+    """Asigna un identificador entero estable a cada palabra"""
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.index: Dict[str, int] = {}
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.index
+
+    def add(self, word: str) -> int:
+        """Devuelve el id de la palabra, registrándola si es nueva"""
+        return self.index.setdefault(word, len(self.index))
+
+    def get(self, word: str, default: int = -1) -> int:
+        """Devuelve el id de la palabra o default si no existe"""
+        return self.index.get(word, default)
+
+    def words(self) -> List[str]:
+        """Lista de palabras ordenadas por id"""
+        return list(self.index)
+
+
+class CSRMatrix:
+    """Matriz dispersa en formato CSR (indptr, indices, data)"""
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        shape: Tuple[int, int],
+    ):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float64)
+        self.shape = (int(shape[0]), int(shape[1]))
+
+        if len(self.indptr) != self.shape[0] + 1:
+            raise ValueError("indptr debe tener n_filas + 1 elementos")
+        if len(self.indices) != len(self.data):
+            raise ValueError("indices y data deben tener la misma longitud")
+
+    @property
+    def nnz(self) -> int:
+        """Número de entradas no nulas"""
+        return len(self.data)
+
+    def row_ids(self) -> np.ndarray:
+        """Fila de cada entrada no nula"""
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def dot(self, weights: np.ndarray) -> np.ndarray:
+        """Producto matriz-vector (o matriz-matriz densa por columnas)"""
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape[0] != self.shape[1]:
+            raise ValueError("Dimensiones incompatibles para el producto")
+
+        rows = self.row_ids()
+        if weights.ndim == 1:
+            return np.bincount(
+                rows, weights=self.data * weights[self.indices], minlength=self.shape[0]
+            )
+
+        contributions = self.data[:, None] * weights[self.indices]
+        return np.column_stack(
+            [
+                np.bincount(rows, weights=contributions[:, j], minlength=self.shape[0])
+                for j in range(weights.shape[1])
+            ]
+        ).reshape(self.shape[0], weights.shape[1])
+
+    def row_sums(self) -> np.ndarray:
+        """Suma de cada fila (tokens por documento)"""
+        return np.bincount(self.row_ids(), weights=self.data, minlength=self.shape[0])
+
+    def column_sums(self) -> np.ndarray:
+        """Suma de cada columna (frecuencia total de cada término)"""
+        return np.bincount(self.indices, weights=self.data, minlength=self.shape[1])
+
+    def to_dense(self) -> np.ndarray:
+        """Convierte a un arreglo denso (solo para matrices pequeñas)"""
+        dense = np.zeros(self.shape, dtype=np.float64)
+        dense[self.row_ids(), self.indices] = self.data
+        return dense
+
+
+def tokenize_corpus(
+    texts: Sequence[str], vocabulary: Optional[Vocabulary] = None
+) -> Tuple[np.ndarray, np.ndarray, Vocabulary]:
+    """Ids de los tokens (en minúsculas) de todos los textos, concatenados, y
+    número de tokens de cada texto (una sola pasada de tokenización)"""
+    if vocabulary is None:
+        vocabulary = Vocabulary()
+
+    token_ids: List[int] = []
+    lengths = np.zeros(len(texts), dtype=np.int64)
+    add = vocabulary.add
+    for row, text in enumerate(texts):
+        tokens = tokenize(text) if isinstance(text, str) else []
+        lengths[row] = len(tokens)
+        token_ids.extend(add(token) for token in tokens)
+
+    return np.asarray(token_ids, dtype=np.int64), lengths, vocabulary
+
+
+def document_term_matrix(
+    token_ids: np.ndarray, lengths: np.ndarray, n_cols: int
+) -> CSRMatrix:
+    """Matriz documento-término (conteos) a partir de un corpus tokenizado"""
+    n_rows = len(lengths)
+    if len(token_ids) == 0:
+        return CSRMatrix(np.zeros(n_rows + 1), [], [], (n_rows, n_cols))
+
+    # Agrupar (fila, término) con una única ordenación vectorizada
+    rows = np.repeat(np.arange(n_rows, dtype=np.int64), lengths)
+    keys = rows * n_cols + token_ids
+    unique_keys, counts = np.unique(keys, return_counts=True)
+
+    unique_rows = unique_keys // n_cols
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(unique_rows, minlength=n_rows), out=indptr[1:])
+
+    return CSRMatrix(indptr, unique_keys % n_cols, counts, (n_rows, n_cols))
+
+
+def build_document_term_matrix(
+    texts: Sequence[str], vocabulary: Optional[Vocabulary] = None
+) -> Tuple[CSRMatrix, Vocabulary]:
+    """Construye la matriz documento-término (conteos) de una lista de textos"""
+    token_ids, lengths, vocabulary = tokenize_corpus(texts, vocabulary)
+    return document_term_matrix(token_ids, lengths, len(vocabulary)), vocabulary
+
+
+def lexicon_vector(words: Iterable[str], vocabulary: Vocabulary) -> np.ndarray:
+    """Vector de pesos (1.0 por palabra del léxico) sobre el vocabulario"""
+    vector = np.zeros(len(vocabulary), dtype=np.float64)
+    for word in {w.lower() for w in words}:
+        word_id = vocabulary.get(word)
+        if word_id >= 0:
+            vector[word_id] = 1.0
+    return vector
+
+
+def lexicon_matrix(
+    lexicons: Dict[str, Iterable[str]], vocabulary: Vocabulary
+) -> Tuple[List[str], np.ndarray]:
+    """Apila los vectores de varios léxicos en una matriz (vocabulario x léxicos)"""
+    names = list(lexicons)
+    if not names:
+        return names, np.zeros((len(vocabulary), 0), dtype=np.float64)
+    matrix = np.column_stack(
+        [lexicon_vector(lexicons[name], vocabulary) for name in names]
+    )
+    return names, matrix.reshape(len(vocabulary), len(names))
+
+
+# Multiplicador para combinar los hashes de las palabras de un n-grama
+# (primo FNV de 64 bits) y constantes del finalizador de splitmix64
+_MIX_MULTIPLIER = np.uint64(0x100000001B3)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """Dispersa los bits de cada hash (los productos desbordan módulo 2**64)"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * _MIX_1
+    values = values ^ (values >> np.uint64(27))
+    values = values * _MIX_2
+    return values ^ (values >> np.uint64(31))
+
+
+class HashedNgramVectorizer:
+    """n-gramas de palabras proyectados a un número fijo de columnas (hashing trick).
+
+    Cada n-grama (dentro de un mismo post) se combina a partir de un hash
+    estable (CRC32) de sus palabras y se asigna a una de ``n_features``
+    columnas, así la memoria por post no depende del tamaño del
+    vocabulario. Con ``alternate_sign`` el signo también sale del hash,
+    para que las colisiones tiendan a cancelarse en lugar de acumularse.
+    """
+
+    def __init__(
+        self,
+        n_features: int = 1024,
+        ngram_range: Tuple[int, int] = (2, 3),
+        alternate_sign: bool = True,
+    ):
+        low, high = ngram_range
+        if n_features < 1 or not 1 <= low <= high:
+            raise ValueError(
+                "n_features >= 1 y ngram_range (min, max) con 1 <= min <= max"
+            )
+
+        self.n_features = n_features
+        self.ngram_range = (low, high)
+        self.alternate_sign = alternate_sign
+
+    def transform(self, texts: Sequence[str]) -> CSRMatrix:
+        """Matriz dispersa (posts x n_features) de los n-gramas de cada texto"""
+        token_ids, lengths, vocabulary = tokenize_corpus(texts)
+        return self.transform_tokens(token_ids, lengths, vocabulary)
+
+    def transform_tokens(
+        self, token_ids: np.ndarray, lengths: np.ndarray, vocabulary: Vocabulary
+    ) -> CSRMatrix:
+        """Igual que transform, sobre un corpus ya tokenizado con tokenize_corpus"""
+        n_rows = len(lengths)
+        word_hashes = np.array(
+            [zlib.crc32(word.encode("utf-8")) for word in vocabulary.words()],
+            dtype=np.uint64,
+        )
+        hashes = word_hashes[token_ids] if len(token_ids) else word_hashes[:0]
+        rows = np.repeat(np.arange(n_rows, dtype=np.int64), lengths)
+
+        all_rows, all_hashes = [], []
+        for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+            starts = len(hashes) - n + 1
+            if starts <= 0:
+                continue
+            # Solo n-gramas que no cruzan el límite entre posts
+            valid = rows[:starts] == rows[n - 1 :]
+            combined = np.full(starts, n, dtype=np.uint64)
+            for k in range(n):
+                combined = combined * _MIX_MULTIPLIER + hashes[k : k + starts]
+            all_rows.append(rows[:starts][valid])
+            all_hashes.append(_mix64(combined[valid]))
+
+        if not all_rows:
+            return CSRMatrix(np.zeros(n_rows + 1), [], [], (n_rows, self.n_features))
+
+        rows = np.concatenate(all_rows)
+        mixed = np.concatenate(all_hashes)
+        columns = (mixed % np.uint64(self.n_features)).astype(np.int64)
+        if self.alternate_sign:
+            signs = np.where(mixed >> np.uint64(63), -1.0, 1.0)
+        else:
+            signs = np.ones(len(mixed))
+
+        keys = rows * self.n_features + columns
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        values = np.bincount(inverse, weights=signs, minlength=len(unique_keys))
+        nonzero = values != 0
+        unique_keys, values = unique_keys[nonzero], values[nonzero]
+
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(unique_keys // self.n_features, minlength=n_rows),
+            out=indptr[1:],
+        )
+        return CSRMatrix(
+            indptr, unique_keys % self.n_features, values, (n_rows, self.n_features)
+        )
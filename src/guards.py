@@ -0,0 +1,62 @@
+# src/guards.py
+"""
+Protecciones contra entradas patológicas.
+
+- Límite de caracteres por post: un documento pegado, spam o una cadena
+  enorme de caracteres repetidos se trunca (``truncate``) o se divide en
+  fragmentos que se analizan como posts separados (``chunk``). El corte se
+  hace en un espacio cuando lo hay, para no partir palabras.
+- Presupuesto de tiempo por dataset: el análisis recibe un instante
+  límite (reloj de pared, válido también en los procesos del pool) y lo
+  revisa entre textos; al superarlo lanza ``AnalysisBudgetExceeded``.
+"""
+
+import time
+from typing import List, Optional
+
+OVERFLOW_MODES = ("truncate", "chunk")
+
+
+class AnalysisBudgetExceeded(TimeoutError):
+    """El análisis de un dataset superó su presupuesto de tiempo"""
+
+
+def limit_text(text: str, max_chars: int, overflow: str = "truncate") -> List[str]:
+    """Fragmentos (sin espacios extremos) de a lo sumo max_chars caracteres.
+
+    Con ``truncate`` solo se conserva el primero; max_chars <= 0 desactiva
+    el límite.
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return [text]
+
+    pieces = []
+    start = 0
+    while start < len(text):
+        end = start + max_chars
+        if end < len(text):
+            # Último espacio de la segunda mitad del bloque (si lo hay)
+            cut = max(
+                text.rfind(" ", start + max_chars // 2, end),
+                text.rfind("\n", start + max_chars // 2, end),
+            )
+            if cut > start:
+                end = cut
+        piece = text[start:end].strip()
+        if piece:
+            pieces.append(piece)
+            if overflow == "truncate":
+                break
+        start = end
+    return pieces
+
+
+def deadline_after(seconds: float) -> Optional[float]:
+    """Instante límite (epoch) dentro de seconds segundos; None sin presupuesto"""
+    return time.time() + seconds if seconds > 0 else None
+
+
+def check_deadline(deadline: Optional[float], stage: str = "análisis"):
+    """Lanza AnalysisBudgetExceeded si ya pasó el instante límite"""
+    if deadline is not None and time.time() > deadline:
+        raise AnalysisBudgetExceeded(f"Presupuesto de tiempo agotado en {stage}")
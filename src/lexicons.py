@@ -0,0 +1,213 @@
+# src/lexicons.py
+"""
+Léxicos versionados y recargables en caliente.
+
+Un ``Lexicon`` es una instantánea inmutable de las listas de palabras de
+los rasgos y de los diccionarios de sentimiento, con una versión (la
+declarada en el archivo o un hash de su contenido). ``LexiconStore`` lee
+un archivo JSON de léxicos y lo vuelve a cargar cuando cambia (llamada
+explícita o vigilancia en un hilo); cada recarga reemplaza la instantánea
+de forma atómica y notifica a los analizadores suscritos, de modo que los
+análisis en curso terminan con la versión anterior.
+
+Formato del archivo (las secciones ausentes se toman del léxico base)::
+
+    {
+      "version": "2024-06-01",
+      "traits": {"extraversion": ["fiesta", ...], ...},
+      "sentiment": {"positive": [...], "negative": [...],
+                    "intensifiers": [...], "negations": [...]}
+    }
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+SENTIMENT_KEYS = ("positive", "negative", "intensifiers", "negations")
+
+
+def _word_list(words, name: str) -> List[str]:
+    """Valida una lista de palabras (ValueError con cualquier otro tipo)"""
+    if not isinstance(words, (list, tuple, set, frozenset)) or not all(
+        isinstance(w, str) for w in words
+    ):
+        raise ValueError(f"{name} debe ser una lista de palabras")
+    return list(words)
+
+
+class Lexicon:
+    """Instantánea inmutable de los léxicos de rasgos y de sentimiento"""
+
+    def __init__(
+        self,
+        traits: Dict[str, Iterable[str]],
+        sentiment: Dict[str, Iterable[str]],
+        version: Optional[str] = None,
+        source: Optional[str] = None,
+    ):
+        missing = [key for key in SENTIMENT_KEYS if key not in sentiment]
+        if missing:
+            raise ValueError(f"Faltan diccionarios de sentimiento: {missing}")
+
+        self._traits: Dict[str, Tuple[str, ...]] = {
+            trait: tuple(_word_list(words, f"El léxico de '{trait}'"))
+            for trait, words in traits.items()
+        }
+        self._sentiment = {
+            key: frozenset(_word_list(sentiment[key], f"El diccionario '{key}'"))
+            for key in SENTIMENT_KEYS
+        }
+
+        self.version = version or self.content_hash()
+        self.source = source
+
+    @property
+    def traits(self) -> Dict[str, List[str]]:
+        """Copia de las listas de palabras por rasgo (en su orden original)"""
+        return {trait: list(words) for trait, words in self._traits.items()}
+
+    @property
+    def sentiment(self) -> Dict[str, frozenset]:
+        return dict(self._sentiment)
+
+    def content_hash(self) -> str:
+        """Hash corto del contenido (independiente del orden de los diccionarios)"""
+        canonical = json.dumps(self.to_dict(include_version=False), sort_keys=True)
+        return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+    def to_dict(self, include_version: bool = True) -> Dict:
+        data = {
+            "traits": self.traits,
+            "sentiment": {key: sorted(words) for key, words in self._sentiment.items()},
+        }
+        if include_version:
+            data["version"] = self.version
+        return data
+
+    @classmethod
+    def from_dict(
+        cls, data: Dict, base: Optional["Lexicon"] = None, source: Optional[str] = None
+    ) -> "Lexicon":
+        """Construye un léxico; las secciones ausentes se completan con base"""
+        if not isinstance(data, dict):
+            raise ValueError("El léxico debe ser un objeto JSON")
+
+        traits = base.traits if base is not None else {}
+        sentiment = base.sentiment if base is not None else {}
+        for section, target in (("traits", traits), ("sentiment", sentiment)):
+            values = data.get(section, {})
+            if not isinstance(values, dict):
+                raise ValueError(f"La sección '{section}' debe ser un objeto JSON")
+            target.update(values)
+
+        version = data.get("version")
+        return cls(
+            traits, sentiment, version=str(version) if version else None, source=source
+        )
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, Lexicon)
+            and self._traits == other._traits
+            and self._sentiment == other._sentiment
+        )
+
+    def __repr__(self) -> str:
+        return f"Lexicon(version={self.version!r}, traits={list(self._traits)})"
+
+
+class LexiconStore:
+    """Archivo de léxicos recargable que notifica a sus suscriptores"""
+
+    def __init__(self, path: Union[str, Path], base: Optional[Lexicon] = None):
+        self.path = Path(path)
+        self.base = base
+        self.last_error: Optional[str] = None
+        self._subscribers: List[Callable[[Lexicon], None]] = []
+        self._signature = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._current = self._read()
+
+    def _file_signature(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self) -> Lexicon:
+        signature = self._file_signature()
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        lexicon = Lexicon.from_dict(data, base=self.base, source=str(self.path))
+        self._signature = signature
+        return lexicon
+
+    @property
+    def current(self) -> Lexicon:
+        """Versión vigente (lectura atómica de una referencia)"""
+        return self._current
+
+    def subscribe(self, callback: Callable[[Lexicon], None]) -> Lexicon:
+        """Registra un callback para cada recarga y lo invoca con la versión vigente"""
+        with self._lock:
+            self._subscribers.append(callback)
+            current = self._current
+        callback(current)
+        return current
+
+    def reload(self) -> Lexicon:
+        """Relee el archivo y publica la versión si cambió (los errores se propagan)"""
+        with self._lock:
+            lexicon = self._read()
+            self.last_error = None
+            if lexicon == self._current and lexicon.version == self._current.version:
+                return self._current
+            self._current = lexicon
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(lexicon)
+        return lexicon
+
+    def check_for_updates(self) -> bool:
+        """Recarga si el archivo cambió; un archivo inválido conserva la versión vigente"""
+        try:
+            if self._file_signature() == self._signature:
+                return False
+            previous = self._current
+            return self.reload() is not previous
+        except (OSError, ValueError) as e:
+            # p. ej. el archivo se está reescribiendo; se reintenta en el próximo ciclo
+            self.last_error = str(e)
+            return False
+
+    def watch(self, interval: float = 2.0) -> "LexiconStore":
+        """Vigila el archivo en un hilo de fondo"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.check_for_updates()
+
+        self._thread = threading.Thread(target=loop, name="lexicon-watch", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene la vigilancia del archivo"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -0,0 +1,99 @@
+# src/memory.py
+"""
+Instrumentación de memoria con ``tracemalloc`` y estimación del costo de
+analizar un corpus, usada por el modo de presupuesto de memoria del
+analizador: si el corpus completo no cabe en el presupuesto, se procesa
+en bloques secuenciales cuyo tamaño sí cabe.
+"""
+
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Bytes asignados por carácter de texto al construir la matriz
+# documento-término y las listas de tokens (medido con tracemalloc: entre
+# 16 y 24 según el tamaño del vocabulario; se usa un margen conservador)
+BYTES_PER_CHAR = 32
+
+MB = 1024 * 1024
+
+
+def estimate_working_set(texts: List[str]) -> int:
+    """Estimación en bytes de la memoria temporal para analizar los textos de una vez"""
+    return sum(len(text) for text in texts) * BYTES_PER_CHAR
+
+
+def streaming_chunk_size(texts: List[str], budget_bytes: int) -> int:
+    """Número de posts por bloque para que cada bloque quepa en el presupuesto"""
+    if not texts:
+        return 1
+    per_post = max(estimate_working_set(texts) / len(texts), 1)
+    return max(int(budget_bytes // per_post), 1)
+
+
+class MemoryProfiler:
+    """Mide asignaciones actuales y pico por fase con tracemalloc.
+
+    Si tracemalloc ya estaba activo (p. ej. lo inició el usuario), se
+    reutiliza y no se detiene al terminar.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.phases: Dict[str, Dict[str, int]] = {}
+        self.peak_bytes = 0
+        self._baseline = 0
+        self._owns_tracing = False
+
+    def start(self) -> "MemoryProfiler":
+        """Comienza a medir (no hace nada si el perfilado está desactivado)"""
+        if not self.enabled:
+            return self
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        self.phases = {}
+        self.peak_bytes = 0
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def stop(self):
+        """Deja de medir si la medición la inició este perfilador"""
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Registra la memoria retenida y el pico de una fase"""
+        if not self.enabled or not tracemalloc.is_tracing():
+            yield
+            return
+
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.phases[name] = {
+                "retained_bytes": current - before,
+                "peak_bytes": peak - before,
+            }
+            self.peak_bytes = max(self.peak_bytes, peak - self._baseline)
+
+    def report(self) -> Optional[Dict]:
+        """Pico total y detalle por fase (None si el perfilado está desactivado)"""
+        if not self.enabled:
+            return None
+        return {
+            "peak_bytes": self.peak_bytes,
+            "peak_mb": round(self.peak_bytes / MB, 3),
+            "phases": dict(self.phases),
+        }
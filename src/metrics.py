@@ -0,0 +1,332 @@
+# src/metrics.py
+"""
+Registro de métricas del análisis (contadores e histogramas de latencia)
+con exportación en formato de texto de Prometheus.
+
+El registro global ``REGISTRY`` lo usa ``BigFiveAnalyzer`` para contar
+posts, tokens y aciertos de léxico y para medir la duración de cada fase
+de ``calculate_big_five_scores``. Desactivado (``METRICS_ENABLED=False``),
+cada operación retorna de inmediato sin tomar el lock.
+
+Las métricas se exportan a un archivo (``write_textfile``, compatible con
+el textfile collector de node_exporter) o por HTTP en ``GET /metrics`` del
+servicio local. Los workers de otros procesos envían sus conteos con
+``drain()`` y el proceso principal los combina con ``merge()``.
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Union
+
+from config import METRICS_ENABLED
+
+# Límites superiores (segundos) de los buckets de latencia
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Contador monótono con etiquetas opcionales"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self.values: Dict[LabelKey, float] = {}
+
+    def inc(self, value: float = 1.0, labels: LabelKey = ()):
+        self.values[labels] = self.values.get(labels, 0.0) + value
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(key)} {_format_value(value)}"
+            for key, value in sorted(self.values.items())
+        ]
+
+
+class Histogram:
+    """Histograma acumulativo de buckets (como el de Prometheus)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # Por etiquetas: [conteos por bucket (no acumulados) + desborde, suma, total]
+        self.series: Dict[LabelKey, list] = {}
+
+    def _series(self, labels: LabelKey) -> list:
+        if labels not in self.series:
+            self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        return self.series[labels]
+
+    def observe(self, value: float, labels: LabelKey = ()):
+        series = self._series(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = (("le", _format_value(bound)),)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(key, le)} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class _NullTimer:
+    """Context manager sin efecto para un registro desactivado"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """Colección de métricas con nombre, segura entre hilos"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, Union[Counter, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    # ========== DEFINICIÓN ==========
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        """Obtiene o registra un contador"""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, help)
+            return self._metrics[name]
+
+    def histogram(
+        self, name: str, help: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Obtiene o registra un histograma"""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, help, buckets)
+            return self._metrics[name]
+
+    def get(self, name: str, **labels) -> float:
+        """Valor de un contador (o total de observaciones de un histograma)"""
+        metric = self._metrics.get(name)
+        if metric is None:
+            return 0.0
+        key = _label_key(labels)
+        with self._lock:
+            if isinstance(metric, Counter):
+                return metric.values.get(key, 0.0)
+            series = metric.series.get(key)
+            return series[2] if series else 0
+
+    # ========== REGISTRO DE VALORES ==========
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        """Incrementa un contador (lo registra si no existe)"""
+        if not self.enabled:
+            return
+        metric = self._metrics.get(name) or self.counter(name)
+        key = _label_key(labels)
+        with self._lock:
+            metric.inc(value, key)
+
+    def observe(self, name: str, value: float, **labels):
+        """Registra una observación en un histograma (lo registra si no existe)"""
+        if not self.enabled:
+            return
+        metric = self._metrics.get(name) or self.histogram(name)
+        key = _label_key(labels)
+        with self._lock:
+            metric.observe(value, key)
+
+    def timer(self, name: str, **labels):
+        """Context manager que observa la duración del bloque en segundos"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name, labels)
+
+    @contextmanager
+    def _timer(self, name: str, labels: Dict):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    # ========== COMBINACIÓN ENTRE PROCESOS ==========
+
+    def _snapshot(self) -> Dict:
+        state = {}
+        for name, metric in self._metrics.items():
+            entry = {"kind": metric.kind, "help": metric.help}
+            if isinstance(metric, Counter):
+                entry["values"] = [[list(k), v] for k, v in metric.values.items()]
+            else:
+                entry["buckets"] = list(metric.buckets)
+                entry["series"] = [
+                    [list(k), list(counts), total, count]
+                    for k, (counts, total, count) in metric.series.items()
+                ]
+            state[name] = entry
+        return state
+
+    def _reset(self):
+        for metric in self._metrics.values():
+            if isinstance(metric, Counter):
+                metric.values.clear()
+            else:
+                metric.series.clear()
+
+    def snapshot(self) -> Dict:
+        """Estado serializable de todas las métricas"""
+        with self._lock:
+            return self._snapshot()
+
+    def reset(self):
+        """Pone todos los valores a cero (conserva las definiciones)"""
+        with self._lock:
+            self._reset()
+
+    def drain(self) -> Dict:
+        """Devuelve el estado y reinicia los valores (deltas de un worker)"""
+        with self._lock:
+            state = self._snapshot()
+            self._reset()
+            return state
+
+    def merge(self, state: Dict) -> "MetricsRegistry":
+        """Suma el estado de otro registro (p. ej. el de un worker)"""
+        if not self.enabled:
+            return self
+        for name, entry in state.items():
+            if entry["kind"] == "counter":
+                metric = self.counter(name, entry.get("help", ""))
+                with self._lock:
+                    for key, value in entry["values"]:
+                        metric.inc(value, tuple(tuple(pair) for pair in key))
+            else:
+                metric = self.histogram(name, entry.get("help", ""), entry["buckets"])
+                with self._lock:
+                    for key, counts, total, count in entry["series"]:
+                        series = metric._series(tuple(tuple(pair) for pair in key))
+                        series[0] = [a + b for a, b in zip(series[0], counts)]
+                        series[1] += total
+                        series[2] += count
+        return self
+
+    # ========== EXPORTACIÓN ==========
+
+    def to_prometheus(self) -> str:
+        """Exposición en formato de texto de Prometheus (versión 0.0.4)"""
+        lines = []
+        with self._lock:
+            for name in sorted(self._metrics):
+                metric = self._metrics[name]
+                if metric.help:
+                    lines.append(f"# HELP {name} {metric.help}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+                lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Union[str, Path]) -> Path:
+        """Escribe la exposición de forma atómica (archivo temporal + reemplazo)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(temporary, path)
+        return path
+
+
+def register_analysis_metrics(registry: "MetricsRegistry") -> "MetricsRegistry":
+    """Define las métricas estándar del análisis (con su texto de ayuda)"""
+    registry.counter("bigfive_analyses_total", "Datasets analizados")
+    registry.counter(
+        "bigfive_analysis_failures_total", "Análisis que terminaron con error"
+    )
+    registry.counter(
+        "bigfive_default_scores_total", "Datasets sin textos (puntajes por defecto)"
+    )
+    registry.counter("bigfive_posts_total", "Posts con texto analizados")
+    registry.counter("bigfive_tokens_total", "Tokens analizados")
+    registry.counter("bigfive_lexicon_hits_total", "Aciertos de léxico por rasgo")
+    registry.histogram(
+        "bigfive_analysis_seconds", "Duración de calculate_big_five_scores"
+    )
+    registry.histogram("bigfive_phase_seconds", "Duración de cada fase del análisis")
+    registry.counter(
+        "bigfive_post_store_cache_total",
+        "Lecturas de cuerpos de posts del almacén por resultado de la caché",
+    )
+    registry.counter(
+        "bigfive_post_store_bodies_written_total",
+        "Cuerpos de posts nuevos escritos en el almacén",
+    )
+    return registry
+
+
+# Registro por defecto del proceso
+REGISTRY = register_analysis_metrics(MetricsRegistry(enabled=METRICS_ENABLED))
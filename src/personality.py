@@ -1,9 +1,86 @@
 # src/personality.py
 import json
+import os
 import re
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Tuple
+from types import MethodType
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from config import (
+    DATASET_TIME_BUDGET,
+    HLL_MIN_POSTS,
+    HLL_PRECISION,
+    JSON_COMPRESSION,
+    LEXICON_PATH,
+    LEXICON_RELOAD_INTERVAL,
+    MATTR_WINDOW,
+    MAX_POST_CHARS,
+    MEMORY_BUDGET_MB,
+    MEMORY_PROFILE,
+    NGRAM_HASH_FEATURES,
+    PARALLEL_CHUNK_SIZE,
+    PARALLEL_MIN_POSTS,
+    PARALLEL_SHARED_MEMORY,
+    PARALLEL_WORKERS,
+    POST_OVERFLOW,
+    SOCIAL_SIGNALS,
+    TOP_WORDS_BATCH,
+    TOP_WORDS_CAPACITY,
+    TOP_WORDS_K,
+    UNIQUE_WORDS_MODE,
+)
+
+from .diversity import MATTRAccumulator
+from .feature_store import FeatureStore
+from .features import (
+    CSRMatrix,
+    HashedNgramVectorizer,
+    Vocabulary,
+    build_document_term_matrix,
+    document_term_matrix,
+    is_content_word,
+    lexicon_matrix,
+    lexicon_vector,
+    tokenize_cased,
+)
+from .guards import OVERFLOW_MODES, check_deadline, deadline_after
+from .lexicons import Lexicon, LexiconStore
+from .memory import MB, MemoryProfiler, estimate_working_set, streaming_chunk_size
+from .metrics import REGISTRY, MetricsRegistry
+from .posts import PostBatch, post_slices
+from .shared_corpus import SharedTextCorpus, shared_posts
+from .sketches import HyperLogLog, SpaceSaving
+from .social import add_signals, empty_signals, scan_text, social_activity
+from .tracing import span, traced, traced_map
+from .utils import compressed_name, open_text, split_compression
+from .weights import (
+    TRAITS,
+    component_matrix,
+    default_weights,
+    evaluate_weight_grid,
+    trait_components,
+    weighted_scores,
+)
+
+
+class _default_or_instance_method:
+    """Método que, llamado sobre la clase, funciona como un classmethod con los
+    diccionarios por defecto y, sobre una instancia, usa los de su léxico"""
+
+    def __init__(self, func):
+        self.__func__ = func
+        self.__doc__ = func.__doc__
+        self.__name__ = func.__name__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            instance = owner()
+        return MethodType(self.__func__, instance)
 
 
 class SpanishSentimentAnalyzer:
@@ -77,48 +154,69 @@ class SpanishSentimentAnalyzer:
     }
     NEGATIONS = {"no", "nunca", "jamás", "tampoco", "nada", "ningún", "ninguna"}
 
+    def __init__(self, lexicon: Optional[Lexicon] = None):
+        # Un léxico versionado reemplaza los diccionarios de la clase en esta instancia
+        if lexicon is not None:
+            sentiment = lexicon.sentiment
+            self.POSITIVE_WORDS = sentiment["positive"]
+            self.NEGATIVE_WORDS = sentiment["negative"]
+            self.INTENSIFIERS = sentiment["intensifiers"]
+            self.NEGATIONS = sentiment["negations"]
+
     @classmethod
-    def analyze_sentiment(cls, text: str) -> Dict[str, float]:
-        """Analiza el sentimiento de un texto en español"""
-        if not text or len(text.strip()) < 5:
-            return {
-                "polarity": 0.0,
-                "subjectivity": 0.0,
-                "label": "NEUTRO",
-                "positive_score": 0,
-                "negative_score": 0,
-            }
+    def default_sentiment_words(cls) -> Dict[str, set]:
+        """Diccionarios de sentimiento incorporados, en el formato de Lexicon"""
+        return {
+            "positive": cls.POSITIVE_WORDS,
+            "negative": cls.NEGATIVE_WORDS,
+            "intensifiers": cls.INTENSIFIERS,
+            "negations": cls.NEGATIONS,
+        }
 
-        words = re.findall(r"\b\w+\b", text.lower())
-        if not words:
-            return {
-                "polarity": 0.0,
-                "subjectivity": 0.0,
-                "label": "NEUTRO",
-                "positive_score": 0,
-                "negative_score": 0,
-            }
+    # Banderas de cada palabra para el análisis por secuencias de tokens
+    POSITIVE_FLAG = 1
+    NEGATIVE_FLAG = 2
+    NEGATION_FLAG = 4
+    INTENSIFIER_FLAG = 8
+
+    def token_flags(self, word: str) -> int:
+        """Codifica la pertenencia de una palabra a los diccionarios como banderas"""
+        flags = 0
+        if word in self.POSITIVE_WORDS:
+            flags |= self.POSITIVE_FLAG
+        if word in self.NEGATIVE_WORDS:
+            flags |= self.NEGATIVE_FLAG
+        if word in self.NEGATIONS:
+            flags |= self.NEGATION_FLAG
+        if word in self.INTENSIFIERS:
+            flags |= self.INTENSIFIER_FLAG
+        return flags
+
+    @classmethod
+    def score_flags(cls, flags: List[int]) -> Tuple[float, float]:
+        """Calcula los puntajes positivo y negativo de una secuencia de banderas"""
+        positive, negative = cls.POSITIVE_FLAG, cls.NEGATIVE_FLAG
+        polar = positive | negative
 
         positive_score = 0
         negative_score = 0
-        total_words = len(words)
 
         i = 0
-        while i < len(words):
-            word = words[i]
+        while i < len(flags):
+            word = flags[i]
 
             # Verificar negaciones (buscar en las siguientes 2 palabras)
             is_negated = False
-            if word in cls.NEGATIONS:
+            if word & cls.NEGATION_FLAG:
                 # Mirar las siguientes 1-3 palabras para ver si hay palabras de sentimiento
-                for lookahead in range(1, min(4, len(words) - i)):
-                    next_word = words[i + lookahead]
-                    if next_word in cls.POSITIVE_WORDS:
+                for lookahead in range(1, min(4, len(flags) - i)):
+                    next_word = flags[i + lookahead]
+                    if next_word & positive:
                         negative_score += 1  # Negación de positivo = negativo
                         is_negated = True
                         i += lookahead  # Saltar palabras procesadas
                         break
-                    elif next_word in cls.NEGATIVE_WORDS:
+                    elif next_word & negative:
                         positive_score += 1  # Negación de negativo = positivo
                         is_negated = True
                         i += lookahead
@@ -130,19 +228,65 @@ class SpanishSentimentAnalyzer:
 
             # Verificar intensificadores
             intensity = 1.0
-            if word in cls.INTENSIFIERS and i + 1 < len(words):
-                next_word = words[i + 1]
-                if next_word in cls.POSITIVE_WORDS or next_word in cls.NEGATIVE_WORDS:
+            if word & cls.INTENSIFIER_FLAG and i + 1 < len(flags):
+                if flags[i + 1] & polar:
                     intensity = 1.5
 
             # Contar palabras positivas/negativas
-            if word in cls.POSITIVE_WORDS:
+            if word & positive:
                 positive_score += intensity
-            elif word in cls.NEGATIVE_WORDS:
+            elif word & negative:
                 negative_score += intensity
 
             i += 1
 
+        return positive_score, negative_score
+
+    @staticmethod
+    def polarity(positive_score: float, negative_score: float) -> float:
+        """Polaridad (-1 a 1) redondeada a partir de los puntajes"""
+        total_score = positive_score + negative_score
+        if total_score > 0:
+            return round((positive_score - negative_score) / total_score, 3)
+        return 0.0
+
+    @_default_or_instance_method
+    def analyze_sentiment(self, text: str) -> Dict[str, float]:
+        """Analiza el sentimiento de un texto en español.
+
+        ``SpanishSentimentAnalyzer.analyze_sentiment(texto)`` usa los
+        diccionarios por defecto; una instancia creada con un ``Lexicon``
+        usa los de ese léxico.
+        """
+        if not text or len(text.strip()) < 5:
+            return _neutral_sentiment()
+
+        return self.analyze_tokens(re.findall(r"\b\w+\b", text.lower()))
+
+    def analyze_tokens(
+        self, words: List[str], emoji_positive: int = 0, emoji_negative: int = 0
+    ) -> Dict[str, float]:
+        """Sentimiento de un texto ya tokenizado (palabras en minúsculas).
+
+        Los emoji con polaridad suman un punto positivo o negativo cada uno
+        y cuentan como palabras para la subjetividad.
+        """
+        return self.analyze_flags(
+            [self.token_flags(word) for word in words], emoji_positive, emoji_negative
+        )
+
+    def analyze_flags(
+        self, flags: List[int], emoji_positive: int = 0, emoji_negative: int = 0
+    ) -> Dict[str, float]:
+        """Sentimiento a partir de las banderas de cada palabra (token_flags)"""
+        if not flags and not (emoji_positive or emoji_negative):
+            return _neutral_sentiment()
+
+        total_words = len(flags) + emoji_positive + emoji_negative
+        positive_score, negative_score = self.score_flags(flags)
+        positive_score += emoji_positive
+        negative_score += emoji_negative
+
         # Calcular polaridad (-1 a 1)
         total_score = positive_score + negative_score
         if total_score > 0:
@@ -170,10 +314,572 @@ class SpanishSentimentAnalyzer:
         }
 
 
+def _neutral_sentiment() -> Dict[str, float]:
+    return {
+        "polarity": 0.0,
+        "subjectivity": 0.0,
+        "label": "NEUTRO",
+        "positive_score": 0,
+        "negative_score": 0,
+    }
+
+
+# Columnas de sentimiento de la matriz de features por post
+SENTIMENT_FEATURES = ("polarity", "subjectivity", "positive_score", "negative_score")
+
+
+def summarize_polarities(polarities: List[float]) -> Dict:
+    """Resume una lista de polaridades en conteos positivos/negativos/neutrales"""
+    positive = sum(1 for p in polarities if p > 0.2)
+    negative = sum(1 for p in polarities if p < -0.2)
+    neutral = len(polarities) - positive - negative
+
+    total = len(polarities) if polarities else 1
+    avg_polarity = sum(polarities) / total if polarities else 0.0
+
+    return {
+        "positive": positive,
+        "negative": negative,
+        "neutral": neutral,
+        "avg_polarity": round(avg_polarity, 3),
+        "sentiment_balance": positive / total if total > 0 else 0.0,
+        "total_texts_analyzed": len(polarities),
+    }
+
+
+def _text_statistics(
+    texts: List[str],
+    lexicons: Dict[str, List[str]],
+    sentiment_analyzer: SpanishSentimentAnalyzer,
+    hll_precision: Optional[int] = None,
+    mattr_window: int = MATTR_WINDOW,
+    top_words_capacity: int = TOP_WORDS_CAPACITY,
+    social_signals: bool = False,
+    deadline: Optional[float] = None,
+    text_index: Optional[np.ndarray] = None,
+) -> Dict:
+    """Conteos parciales de un bloque de textos, combinables entre bloques.
+
+    Es una función de módulo para poder ejecutarse en un pool de procesos.
+    ``deadline`` (epoch) es el límite del presupuesto de tiempo del dataset.
+    ``text_index`` (post de cada texto, ver PostBatch) agrupa los fragmentos
+    de un post largo: su sentimiento se evalúa una vez por post. Sin él,
+    cada texto es un post.
+    """
+    if social_signals:
+        return _social_text_statistics(
+            texts,
+            lexicons,
+            sentiment_analyzer,
+            hll_precision,
+            mattr_window,
+            top_words_capacity,
+            deadline,
+            text_index,
+        )
+
+    vocabulary = Vocabulary()
+    stats = _token_statistics(
+        texts,
+        sentiment_analyzer,
+        hll_precision,
+        mattr_window,
+        deadline,
+        vocabulary,
+        text_index,
+        top_words_capacity=top_words_capacity,
+    )
+    matrix = document_term_matrix(
+        stats.pop("token_ids"), stats.pop("lengths"), len(vocabulary)
+    )
+    stats.update(_matrix_statistics(matrix, vocabulary, lexicons))
+    return stats
+
+
+def _shared_text_statistics(spec: Dict, start: int, end: int, *args) -> Dict:
+    """Conteos parciales de los posts [start, end) de un corpus en memoria
+    compartida (se ejecuta en los workers; args como en _text_statistics)"""
+    texts, text_index = shared_posts(spec, start, end)
+    return _text_statistics(texts, *args, text_index=text_index)
+
+
+def _last_fragments(text_index: Optional[np.ndarray], n_texts: int) -> List[bool]:
+    """Si cada texto es el último (o único) fragmento de su post"""
+    if text_index is None or n_texts == 0:
+        return [True] * n_texts
+    return np.append(np.diff(text_index) != 0, True).tolist()
+
+
+def _social_text_statistics(
+    texts: List[str],
+    lexicons: Dict[str, List[str]],
+    sentiment_analyzer: SpanishSentimentAnalyzer,
+    hll_precision: Optional[int],
+    mattr_window: int,
+    top_words_capacity: int,
+    deadline: Optional[float] = None,
+    text_index: Optional[np.ndarray] = None,
+) -> Dict:
+    """Conteos de un bloque con señales sociales: una sola pasada por texto da
+    los tokens (sin URLs ni menciones), las señales, las palabras más
+    frecuentes y el sentimiento con emoji (uno por post, como en
+    _token_statistics)"""
+    vocabulary = Vocabulary()
+    add = vocabulary.add
+    token_ids: List[int] = []
+    lengths = np.zeros(len(texts), dtype=np.int64)
+    words = 0
+    unique_words = set() if hll_precision is None else HyperLogLog(hll_precision)
+    mattr = MATTRAccumulator(mattr_window)
+    social = empty_signals()
+    top_words = _TopWordsBatches(top_words_capacity)
+    last_fragment = _last_fragments(text_index, len(texts))
+    pending: List[str] = []
+    post_start = 0
+    post_emoji = empty_signals()
+    # Rango de tokens y emoji con polaridad de cada post con sentimiento
+    analyzed: List[Tuple[int, int]] = []
+    emoji: List[Tuple[int, int]] = []
+
+    with span("social_scan", texts=len(texts)):
+        for row, text in enumerate(texts):
+            check_deadline(deadline, "social_scan")
+            tokens, signals = scan_text(text)
+            lower = [token.lower() for token in tokens]
+            lengths[row] = len(lower)
+            token_ids.extend(add(token) for token in lower)
+
+            words += len(tokens)
+            unique_words.update(tokens)
+            mattr.update(tokens)
+            top_words.update(lower)
+            add_signals(social, signals)
+
+            # Los fragmentos de un post dan un solo sentimiento (texto unido)
+            if pending or not last_fragment[row]:
+                pending.append(text)
+                add_signals(post_emoji, signals)
+                if not last_fragment[row]:
+                    continue
+                text, signals, pending = " ".join(pending), post_emoji, []
+                post_emoji = empty_signals()
+
+            # Un post corto con emoji también expresa sentimiento
+            if (text and len(text.strip()) >= 5) or signals["emoji"]:
+                analyzed.append((post_start, len(token_ids)))
+                emoji.append((signals["emoji_positive"], signals["emoji_negative"]))
+            post_start = len(token_ids)
+
+    token_ids = np.asarray(token_ids, dtype=np.int64)
+    with span("sentiment", posts=len(analyzed)):
+        polarities = [
+            sentiment["polarity"]
+            for sentiment in _post_sentiments(
+                token_ids, vocabulary, analyzed, sentiment_analyzer, emoji
+            )
+        ]
+    matrix = document_term_matrix(token_ids, lengths, len(vocabulary))
+    stats = {
+        "words": words,
+        "unique_words": unique_words,
+        "mattr": mattr,
+        "polarities": polarities,
+        "social": social,
+        "top_words": top_words.flush(),
+    }
+    stats.update(_matrix_statistics(matrix, vocabulary, lexicons))
+    return stats
+
+
+def _matrix_statistics(
+    matrix: CSRMatrix,
+    vocabulary: Vocabulary,
+    lexicons: Dict[str, List[str]],
+) -> Dict:
+    """Aciertos por léxico, palabras en minúsculas y aciertos por palabra de
+    la matriz documento-término de un bloque"""
+    traits, weights = lexicon_matrix(lexicons, vocabulary)
+    hits = matrix.dot(weights).sum(axis=0)
+    term_counts = matrix.column_sums()
+    term_ids = np.flatnonzero(term_counts)
+
+    stats = {
+        "trait_hits": {trait: float(hits[j]) for j, trait in enumerate(traits)},
+        "words_lower": float(matrix.data.sum()),
+    }
+    stats["lexicon_words"] = _lexicon_word_counts(
+        term_ids, term_counts[term_ids], _lexicon_word_ids(lexicons, vocabulary)
+    )
+    return stats
+
+
+def _lexicon_word_ids(
+    lexicons: Dict[str, List[str]], vocabulary: Vocabulary
+) -> Dict[str, List[Tuple[str, int]]]:
+    """Palabras (en minúsculas) de cada léxico presentes en el vocabulario y su id"""
+    word_ids = {}
+    for trait, words in lexicons.items():
+        pairs = [(word, vocabulary.get(word)) for word in {w.lower() for w in words}]
+        word_ids[trait] = [(word, word_id) for word, word_id in pairs if word_id >= 0]
+    return word_ids
+
+
+class _TopWordsBatches:
+    """Palabras de contenido más frecuentes de la pasada de tokenización.
+
+    Los tokens se cuentan en sub-lotes de a lo sumo ``batch`` tokens (más
+    los del último texto) que se pasan al sketch Space-Saving al llenarse:
+    la memoria queda acotada por ``batch`` y ``capacity`` y no por el
+    vocabulario del bloque.
+    """
+
+    def __init__(self, capacity: int, batch: int = TOP_WORDS_BATCH):
+        self.sketch = SpaceSaving(capacity)
+        self.batch = batch
+        self.counts: Counter = Counter()
+        self.tokens = 0
+
+    def update(self, words: List[str]):
+        """Cuenta los tokens (en minúsculas) de un texto"""
+        self.counts.update(words)
+        self.tokens += len(words)
+        if self.tokens >= self.batch:
+            self.flush()
+
+    def flush(self) -> SpaceSaving:
+        """Pasa el sub-lote pendiente al sketch y lo devuelve"""
+        if self.counts:
+            self.sketch.update_counts(
+                (word, count)
+                for word, count in self.counts.items()
+                if is_content_word(word)
+            )
+            self.counts.clear()
+        self.tokens = 0
+        return self.sketch
+
+
+def _lexicon_word_counts(
+    term_ids: np.ndarray,
+    term_counts: np.ndarray,
+    lexicon_word_ids: Dict[str, List[Tuple[str, int]]],
+) -> Dict[str, Dict[str, int]]:
+    """Aciertos por palabra de cada léxico (exactos: acotados por el tamaño
+    del léxico); ``term_ids`` está ordenado"""
+    term_counts = term_counts.astype(np.int64)
+
+    def count_of(word_id: int) -> int:
+        position = np.searchsorted(term_ids, word_id)
+        if position < len(term_ids) and term_ids[position] == word_id:
+            return int(term_counts[position])
+        return 0
+
+    lexicon_words = {}
+    for trait, pairs in lexicon_word_ids.items():
+        counts = {word: count_of(word_id) for word, word_id in pairs}
+        lexicon_words[trait] = {word: count for word, count in counts.items() if count}
+    return lexicon_words
+
+
+def _token_statistics(
+    texts: List[str],
+    sentiment_analyzer: SpanishSentimentAnalyzer,
+    hll_precision: Optional[int] = None,
+    mattr_window: int = MATTR_WINDOW,
+    deadline: Optional[float] = None,
+    vocabulary: Optional[Vocabulary] = None,
+    text_index: Optional[np.ndarray] = None,
+    ngram_vectorizer: Optional[HashedNgramVectorizer] = None,
+    post_sentiments: bool = False,
+    top_words_capacity: Optional[int] = None,
+) -> Dict:
+    """Palabras, vocabulario, MATTR, polaridades e ids de tokens de un bloque.
+
+    Cada texto se tokeniza una sola vez (tokenize_cased): los tokens tal
+    cual dan la diversidad léxica y los tokens en minúsculas el
+    sentimiento, la matriz documento-término (sus ids en ``vocabulary``
+    se devuelven en ``token_ids`` y ``lengths``) y, con
+    ``ngram_vectorizer``, los n-gramas de cada texto (``ngrams``). Los
+    fragmentos de un post (mismo ``text_index``) dan una sola polaridad,
+    la del texto unido; con ``post_sentiments`` también se devuelve el
+    sentimiento completo de esos posts (``sentiments``) y la fila de su
+    último fragmento (``sentiment_rows``). Con ``top_words_capacity`` el
+    sketch de palabras más frecuentes (``top_words``) se actualiza en la
+    misma pasada, por sub-lotes de tokens. El vocabulario es un conjunto
+    exacto o, si se da ``hll_precision``, un HyperLogLog de memoria fija;
+    ambos y el acumulador de MATTR se combinan entre bloques con ``|=``.
+    """
+    if vocabulary is None:
+        vocabulary = Vocabulary()
+    add = vocabulary.add
+    token_ids: List[int] = []
+    lengths = np.zeros(len(texts), dtype=np.int64)
+    words = 0
+    unique_words = set() if hll_precision is None else HyperLogLog(hll_precision)
+    mattr = MATTRAccumulator(mattr_window)
+    top_words = None
+    if top_words_capacity is not None:
+        top_words = _TopWordsBatches(top_words_capacity)
+    last_fragment = _last_fragments(text_index, len(texts))
+    pending: List[str] = []
+    post_start = 0
+    # Rango de tokens (en token_ids) y fila de cada post con sentimiento
+    analyzed: List[Tuple[int, int]] = []
+    analyzed_rows: List[int] = []
+    with span("tokenize", texts=len(texts)):
+        for row, text in enumerate(texts):
+            check_deadline(deadline, "tokenize")
+            tokens, lower = tokenize_cased(text)
+            lengths[row] = len(lower)
+            token_ids.extend(add(token) for token in lower)
+
+            # La diversidad léxica usa los tokens sin pasar a minúsculas
+            words += len(tokens)
+            unique_words.update(tokens)
+            mattr.update(tokens)
+            if top_words is not None:
+                top_words.update(lower)
+
+            # Los fragmentos de un post dan una sola polaridad (texto unido)
+            if pending or not last_fragment[row]:
+                pending.append(text)
+                if not last_fragment[row]:
+                    continue
+                text, pending = " ".join(pending), []
+
+            if text and len(text.strip()) >= 5:
+                analyzed.append((post_start, len(token_ids)))
+                analyzed_rows.append(row)
+            post_start = len(token_ids)
+
+    token_ids = np.asarray(token_ids, dtype=np.int64)
+    with span("sentiment", posts=len(analyzed)):
+        # Mismos tokens que analyze_sentiment(text)
+        sentiments = _post_sentiments(
+            token_ids, vocabulary, analyzed, sentiment_analyzer
+        )
+    stats = {
+        "words": words,
+        "unique_words": unique_words,
+        "mattr": mattr,
+        "polarities": [sentiment["polarity"] for sentiment in sentiments],
+        "token_ids": token_ids,
+        "lengths": lengths,
+    }
+    if top_words is not None:
+        stats["top_words"] = top_words.flush()
+    if post_sentiments:
+        stats["sentiments"] = sentiments
+        stats["sentiment_rows"] = np.asarray(analyzed_rows, dtype=np.int64)
+    if ngram_vectorizer is not None:
+        with span("ngram_features", cat="features", texts=len(texts)):
+            stats["ngrams"] = ngram_vectorizer.transform_tokens(
+                token_ids, lengths, vocabulary
+            )
+    return stats
+
+
+def _post_sentiments(
+    token_ids: np.ndarray,
+    vocabulary: Vocabulary,
+    posts: List[Tuple[int, int]],
+    sentiment_analyzer: SpanishSentimentAnalyzer,
+    emoji: Optional[List[Tuple[int, int]]] = None,
+) -> List[Dict[str, float]]:
+    """Sentimiento de cada post a partir de su rango [inicio, fin) de token_ids.
+
+    Las banderas de sentimiento se calculan una vez por palabra distinta del
+    bloque; ``emoji`` da los emoji positivos y negativos de cada post.
+    """
+    if not posts:
+        return []
+    words = vocabulary.words()
+    present = np.unique(token_ids)
+    flag_of = np.zeros(len(words), dtype=np.int64)
+    flag_of[present] = [
+        sentiment_analyzer.token_flags(words[i]) for i in present.tolist()
+    ]
+    flags = flag_of[token_ids].tolist()
+    analyze = sentiment_analyzer.analyze_flags
+    if emoji is None:
+        return [analyze(flags[a:b]) for a, b in posts]
+    return [
+        analyze(flags[a:b], positive, negative)
+        for (a, b), (positive, negative) in zip(posts, emoji)
+    ]
+
+
+def _grouped_text_statistics(
+    groups: List[List[str]],
+    lexicons: Dict[str, List[str]],
+    sentiment_analyzer: SpanishSentimentAnalyzer,
+    hll_precisions: Optional[List[Optional[int]]] = None,
+    mattr_window: int = MATTR_WINDOW,
+    top_words_capacity: int = TOP_WORDS_CAPACITY,
+    social_signals: bool = False,
+    deadline: Optional[float] = None,
+    text_indexes: Optional[List[Optional[np.ndarray]]] = None,
+) -> List[Dict]:
+    """Conteos de varios corpus con una sola matriz documento-término.
+
+    Los aciertos por léxico de todos los posts salen de un único producto
+    disperso y se reducen por grupo; cada grupo debe tener al menos un texto.
+    Con señales sociales cada grupo se cuenta con su propia pasada.
+    ``text_indexes`` da el ``text_index`` de cada grupo.
+    """
+    if hll_precisions is None:
+        hll_precisions = [None] * len(groups)
+    if text_indexes is None:
+        text_indexes = [None] * len(groups)
+    if social_signals:
+        return [
+            _social_text_statistics(
+                group,
+                lexicons,
+                sentiment_analyzer,
+                hll_precision,
+                mattr_window,
+                top_words_capacity,
+                deadline,
+                text_index,
+            )
+            for group, hll_precision, text_index in zip(
+                groups, hll_precisions, text_indexes
+            )
+        ]
+    # Una pasada por grupo con un vocabulario común; después una sola matriz
+    vocabulary = Vocabulary()
+    results = [
+        _token_statistics(
+            group,
+            sentiment_analyzer,
+            hll_precision,
+            mattr_window,
+            deadline,
+            vocabulary,
+            text_index,
+            top_words_capacity=top_words_capacity,
+        )
+        for group, hll_precision, text_index in zip(
+            groups, hll_precisions, text_indexes
+        )
+    ]
+    texts = sum(len(group) for group in groups)
+    with span("document_term_matrix", texts=texts, groups=len(groups)):
+        matrix = document_term_matrix(
+            np.concatenate([stats.pop("token_ids") for stats in results]),
+            np.concatenate([stats.pop("lengths") for stats in results]),
+            len(vocabulary),
+        )
+        traits, weights = lexicon_matrix(lexicons, vocabulary)
+
+        starts = np.cumsum([0] + [len(group) for group in groups[:-1]])
+        hits = np.add.reduceat(matrix.dot(weights), starts, axis=0)
+        words_lower = np.add.reduceat(matrix.row_sums(), starts)
+
+    lexicon_word_ids = _lexicon_word_ids(lexicons, vocabulary)
+    row_bounds = np.append(starts, texts)
+
+    for g, stats in enumerate(results):
+        stats["trait_hits"] = {
+            trait: float(hits[g, j]) for j, trait in enumerate(traits)
+        }
+        stats["words_lower"] = float(words_lower[g])
+
+        # Frecuencias de los términos de las filas del grupo
+        first, last = matrix.indptr[row_bounds[g]], matrix.indptr[row_bounds[g + 1]]
+        term_ids, inverse = np.unique(matrix.indices[first:last], return_inverse=True)
+        term_counts = np.bincount(inverse, weights=matrix.data[first:last])
+        stats["lexicon_words"] = _lexicon_word_counts(
+            term_ids, term_counts, lexicon_word_ids
+        )
+    return results
+
+
+def _merge_text_statistics(partials: List[Dict], merged: Dict = None) -> Dict:
+    """Combina conteos parciales en el mismo orden de los bloques (sobre merged si se da)"""
+    if merged is None:
+        merged = {
+            "trait_hits": {},
+            "words_lower": 0.0,
+            "words": 0,
+            "unique_words": None,
+            "mattr": None,
+            "top_words": None,
+            "lexicon_words": {},
+            "polarities": [],
+        }
+    for partial in partials:
+        for trait, hits in partial["trait_hits"].items():
+            merged["trait_hits"][trait] = merged["trait_hits"].get(trait, 0.0) + hits
+        merged["words_lower"] += partial["words_lower"]
+        merged["words"] += partial["words"]
+        for key in ("unique_words", "mattr", "top_words"):
+            if merged[key] is None:
+                merged[key] = partial[key]
+            else:
+                merged[key] |= partial[key]
+        for trait, counts in partial["lexicon_words"].items():
+            target = merged["lexicon_words"].setdefault(trait, {})
+            for word, count in counts.items():
+                target[word] = target.get(word, 0) + count
+        merged["polarities"].extend(partial["polarities"])
+        if "social" in partial:
+            add_signals(merged.setdefault("social", empty_signals()), partial["social"])
+    return merged
+
+
+def _top_words_metadata(top_words: SpaceSaving, k: int) -> Dict:
+    """Palabras más frecuentes con su cota de error (frecuencia real en
+    [count - error, count]; las no listadas aparecen a lo sumo floor veces)"""
+    return {
+        "words": [
+            {"word": word, "count": count, "error": error}
+            for word, count, error in top_words.top(k)
+        ],
+        "floor": top_words.floor,
+        "capacity": top_words.capacity,
+    }
+
+
+def _unique_words_counting(unique_words) -> Dict:
+    """Modo de conteo de palabras únicas y su error relativo típico"""
+    if isinstance(unique_words, HyperLogLog):
+        return {
+            "mode": "hyperloglog",
+            "precision": unique_words.precision,
+            "relative_error": round(unique_words.relative_error, 5),
+        }
+    return {"mode": "exact", "relative_error": 0.0}
+
+
 class BigFiveAnalyzer:
-    def __init__(self):
+    def __init__(
+        self,
+        parallel_threshold: int = PARALLEL_MIN_POSTS,
+        chunk_size: int = PARALLEL_CHUNK_SIZE,
+        max_workers: int = PARALLEL_WORKERS,
+        use_shared_memory: bool = PARALLEL_SHARED_MEMORY,
+        memory_budget_mb: float = MEMORY_BUDGET_MB,
+        profile_memory: bool = MEMORY_PROFILE,
+        lexicon: Optional[Lexicon] = None,
+        lexicon_path: str = LEXICON_PATH,
+        lexicon_reload_interval: float = LEXICON_RELOAD_INTERVAL,
+        metrics: Optional[MetricsRegistry] = None,
+        unique_words_mode: str = UNIQUE_WORDS_MODE,
+        hll_precision: int = HLL_PRECISION,
+        hll_min_posts: int = HLL_MIN_POSTS,
+        mattr_window: int = MATTR_WINDOW,
+        top_words_k: int = TOP_WORDS_K,
+        top_words_capacity: int = TOP_WORDS_CAPACITY,
+        ngram_features: int = NGRAM_HASH_FEATURES,
+        social_signals: bool = SOCIAL_SIGNALS,
+        max_post_chars: int = MAX_POST_CHARS,
+        post_overflow: str = POST_OVERFLOW,
+        time_budget: float = DATASET_TIME_BUDGET,
+    ):
         # Palabras clave para cada rasgo EN ESPAÑOL (expandidas)
-        self.neuroticism_words = [
+        neuroticism_words = [
             "ansioso",
             "preocupado",
             "nervioso",
@@ -194,7 +900,7 @@ class BigFiveAnalyzer:
             "abatido",
         ]
 
-        self.extraversion_words = [
+        extraversion_words = [
             "fiesta",
             "amigos",
             "social",
@@ -216,7 +922,7 @@ class BigFiveAnalyzer:
             "júbilo",
         ]
 
-        self.openness_words = [
+        openness_words = [
             "arte",
             "música",
             "creativo",
@@ -241,7 +947,7 @@ class BigFiveAnalyzer:
             "ciencia",
         ]
 
-        self.agreeableness_words = [
+        agreeableness_words = [
             "amable",
             "compasivo",
             "ayudar",
@@ -262,7 +968,7 @@ class BigFiveAnalyzer:
             "colaborar",
         ]
 
-        self.conscientiousness_words = [
+        conscientiousness_words = [
             "organizado",
             "responsable",
             "disciplinado",
@@ -285,15 +991,136 @@ class BigFiveAnalyzer:
             "constante",
         ]
 
+        # Léxico versionado vigente (las listas anteriores son las incorporadas)
+        self.default_lexicon = Lexicon(
+            {
+                "extraversion": extraversion_words,
+                "neuroticism": neuroticism_words,
+                "openness": openness_words,
+                "agreeableness": agreeableness_words,
+                "conscientiousness": conscientiousness_words,
+            },
+            SpanishSentimentAnalyzer.default_sentiment_words(),
+        )
+        self.set_lexicon(lexicon or self.default_lexicon)
+        self.lexicon_store = None
+        if lexicon_path:
+            self.lexicon_store = self.watch_lexicon(
+                lexicon_path, lexicon_reload_interval
+            )
+
+        # Registro de métricas (por defecto el global del proceso)
+        self.metrics = metrics if metrics is not None else REGISTRY
+
         # Inicializar resultados
         self.results = {}
-        self.sentiment_analyzer = SpanishSentimentAnalyzer()
+
+        # Emoji, hashtags, menciones y URLs en la pasada de tokenización
+        self.social_signals = social_signals
+
+        # Pesos de los componentes de cada rasgo (ver src/weights.py)
+        self.trait_weights = default_weights(social_signals)
+
+        # Procesamiento por bloques en paralelo (solo para corpus grandes)
+        self.parallel_threshold = parallel_threshold
+        self.chunk_size = max(chunk_size, 1)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_shared_memory = use_shared_memory
+
+        # Presupuesto de memoria (0 = sin límite) e instrumentación con tracemalloc
+        self.memory_budget_mb = memory_budget_mb
+        self.profile_memory = profile_memory
+
+        # Palabras únicas exactas o aproximadas con HyperLogLog (corpus masivos)
+        if unique_words_mode not in ("exact", "hll", "auto"):
+            raise ValueError("unique_words_mode debe ser 'exact', 'hll' o 'auto'")
+        self.unique_words_mode = unique_words_mode
+        self.hll_precision = hll_precision
+        self.hll_min_posts = hll_min_posts
+        # Ventana de la diversidad léxica MATTR (independiente del tamaño del corpus)
+        self.mattr_window = mattr_window
+        # Palabras más frecuentes reportadas y contadores de su sketch
+        self.top_words_k = top_words_k
+        self.top_words_capacity = max(top_words_capacity, top_words_k)
+        # Bigramas y trigramas por post en un número fijo de columnas
+        self.ngram_vectorizer = HashedNgramVectorizer(ngram_features, (2, 3))
+        # Límite de caracteres por post y presupuesto de tiempo por dataset
+        # (ver src/guards.py)
+        if post_overflow not in OVERFLOW_MODES:
+            raise ValueError("post_overflow debe ser 'truncate' o 'chunk'")
+        self.max_post_chars = max_post_chars
+        self.post_overflow = post_overflow
+        self.time_budget = time_budget
+
+    # ========== LÉXICOS VERSIONADOS ==========
+
+    def set_lexicon(self, lexicon: Lexicon):
+        """Reemplaza el léxico de forma atómica (los análisis en curso usan el anterior)"""
+        missing = [trait for trait in TRAITS if trait not in lexicon.traits]
+        if missing:
+            raise ValueError(f"El léxico no define los rasgos: {missing}")
+
+        # Una sola asignación publica el léxico y su analizador de sentimiento juntos
+        self._active_lexicon = (lexicon, SpanishSentimentAnalyzer(lexicon))
+
+    def _set_trait_words(self, trait: str, words: List[str]):
+        """Reemplaza las palabras de un rasgo publicando un léxico nuevo"""
+        lexicon = self.lexicon
+        traits = lexicon.traits
+        traits[trait] = words
+        self.set_lexicon(Lexicon(traits, lexicon.sentiment))
+
+    # Palabras de cada rasgo en el léxico vigente (una copia; asignarlas
+    # publica un léxico nuevo con set_lexicon)
+    extraversion_words = property(
+        lambda self: self.lexicon.traits["extraversion"],
+        lambda self, words: self._set_trait_words("extraversion", words),
+    )
+    neuroticism_words = property(
+        lambda self: self.lexicon.traits["neuroticism"],
+        lambda self, words: self._set_trait_words("neuroticism", words),
+    )
+    openness_words = property(
+        lambda self: self.lexicon.traits["openness"],
+        lambda self, words: self._set_trait_words("openness", words),
+    )
+    agreeableness_words = property(
+        lambda self: self.lexicon.traits["agreeableness"],
+        lambda self, words: self._set_trait_words("agreeableness", words),
+    )
+    conscientiousness_words = property(
+        lambda self: self.lexicon.traits["conscientiousness"],
+        lambda self, words: self._set_trait_words("conscientiousness", words),
+    )
+
+    def lexicon_snapshot(self) -> Tuple[Lexicon, "SpanishSentimentAnalyzer"]:
+        """Léxico vigente y su analizador de sentimiento, consistentes entre sí"""
+        return self._active_lexicon
+
+    @property
+    def lexicon(self) -> Lexicon:
+        return self._active_lexicon[0]
+
+    @property
+    def sentiment_analyzer(self) -> "SpanishSentimentAnalyzer":
+        return self._active_lexicon[1]
+
+    def watch_lexicon(
+        self, path: str, interval: float = LEXICON_RELOAD_INTERVAL
+    ) -> LexiconStore:
+        """Carga un archivo de léxicos y lo recarga al cambiar (interval 0 = solo reload())"""
+        store = LexiconStore(path, base=self.default_lexicon)
+        store.subscribe(self.set_lexicon)
+        if interval > 0:
+            store.watch(interval)
+        return store
+
+    def get_trait_lexicons(self) -> Dict[str, List[str]]:
+        """Devuelve las listas de palabras clave indexadas por rasgo"""
+        return self.lexicon.traits
 
     def analyze_text_sentiment(self, texts: List[str]) -> Dict:
         """Analiza el sentimiento de una lista de textos EN ESPAÑOL"""
-        positive = 0
-        negative = 0
-        neutral = 0
         polarities = []
 
         for text in texts:
@@ -304,68 +1131,405 @@ class BigFiveAnalyzer:
             sentiment = self.sentiment_analyzer.analyze_sentiment(text)
             polarities.append(sentiment["polarity"])
 
-            if sentiment["polarity"] > 0.2:
-                positive += 1
-            elif sentiment["polarity"] < -0.2:
-                negative += 1
-            else:
-                neutral += 1
-
-        total = len(polarities) if polarities else 1
-        avg_polarity = sum(polarities) / total if polarities else 0.0
-
-        return {
-            "positive": positive,
-            "negative": negative,
-            "neutral": neutral,
-            "avg_polarity": round(avg_polarity, 3),
-            "sentiment_balance": positive / total if total > 0 else 0.0,
-            "total_texts_analyzed": len(polarities),
-        }
+        return summarize_polarities(polarities)
 
     def calculate_word_frequency(self, texts: List[str], word_list: List[str]) -> float:
         """Calcula la frecuencia de palabras de una lista en los textos."""
         if not texts or not word_list:
             return 0.0
 
-        all_text = " ".join(texts).lower()
-        words = re.findall(r"\b\w+\b", all_text)
-        total_words = len(words)
+        matrix, vocabulary = build_document_term_matrix(texts)
+        total_words = matrix.data.sum()
 
         if total_words == 0:
             return 0.0
 
         # Contar palabras objetivo (insensible a mayúsculas/minúsculas)
-        word_list_lower = [w.lower() for w in word_list]
-        word_set = set(word_list_lower)
+        target_count = matrix.dot(lexicon_vector(word_list, vocabulary)).sum()
+
+        return float(target_count / total_words)
+
+    def _trait_hits(self, texts: List[str]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Aciertos de cada léxico por post (matriz dispersa x matriz de léxicos)"""
+        matrix, vocabulary = build_document_term_matrix(texts)
+        traits, weights = lexicon_matrix(self.get_trait_lexicons(), vocabulary)
+        return traits, matrix.dot(weights), matrix.row_sums()
+
+    def calculate_trait_frequencies(self, texts: List[str]) -> Dict[str, float]:
+        """Calcula la frecuencia de todos los léxicos de rasgos en una sola pasada"""
+        traits, hits, words_per_post = self._trait_hits(texts)
+        total_words = words_per_post.sum()
+        if total_words == 0:
+            return {trait: 0.0 for trait in traits}
+        totals = hits.sum(axis=0)
+        return {trait: float(totals[j] / total_words) for j, trait in enumerate(traits)}
+
+    def calculate_post_trait_frequencies(
+        self, texts: List[str]
+    ) -> Dict[str, np.ndarray]:
+        """Calcula la frecuencia de cada léxico de rasgo por post"""
+        traits, hits, words_per_post = self._trait_hits(texts)
+        safe_words = np.where(words_per_post > 0, words_per_post, 1)
+        return {
+            trait: np.where(words_per_post > 0, hits[:, j] / safe_words, 0.0)
+            for j, trait in enumerate(traits)
+        }
 
-        target_count = sum(1 for word in words if word in word_set)
+    def calculate_post_ngram_features(
+        self, texts: List[str], dense: bool = False
+    ) -> Union[CSRMatrix, np.ndarray]:
+        """Bigramas y trigramas de cada post con hashing (posts x ngram_features)"""
+        with span("ngram_features", cat="features", posts=len(texts)):
+            matrix = self.ngram_vectorizer.transform(texts)
+        return matrix.to_dense() if dense else matrix
+
+    def calculate_post_features(
+        self, data: Dict
+    ) -> Tuple[np.ndarray, List[str], Dict[str, List[int]]]:
+        """Matriz de features por post: palabras, aciertos de léxico, sentimiento,
+        interacción y n-gramas con hashing (una fila por post, ceros sin texto).
+
+        Retorna la matriz, el nombre de cada columna y los grupos de columnas
+        (rangos [inicio, fin)).
+        """
+        lexicon, sentiment_analyzer = self.lexicon_snapshot()
+        batch = self._post_batch(data)
+        n_ngrams = self.ngram_vectorizer.n_features
+
+        columns = ["words"]
+        groups = {"words": [0, 1]}
+        for name, names in (
+            ("lexicon", [f"lexicon_{trait}" for trait in lexicon.traits]),
+            ("sentiment", list(SENTIMENT_FEATURES)),
+            ("engagement", ["reactions", "comments"]),
+            ("ngrams", [f"ngram_{i}" for i in range(n_ngrams)]),
+        ):
+            groups[name] = [len(columns), len(columns) + len(names)]
+            columns.extend(names)
+
+        features = np.zeros((len(batch), len(columns)), dtype=np.float64)
+        features[:, groups["engagement"][0]] = batch.reactions
+        features[:, groups["engagement"][0] + 1] = batch.comments
+
+        with span("post_features", cat="features", posts=len(batch)):
+            # Una sola pasada de tokenización (la del análisis) para los
+            # conteos, los léxicos, el sentimiento y los n-gramas
+            rows = batch.text_index
+            vocabulary = Vocabulary()
+            stats = _token_statistics(
+                batch.texts,
+                sentiment_analyzer,
+                vocabulary=vocabulary,
+                text_index=rows,
+                ngram_vectorizer=self.ngram_vectorizer,
+                post_sentiments=True,
+            )
+            counts = document_term_matrix(
+                stats["token_ids"], stats["lengths"], len(vocabulary)
+            )
+            _, weights = lexicon_matrix(lexicon.traits, vocabulary)
+            # Los fragmentos de un post largo (mismo índice) se suman
+            np.add.at(features[:, 0], rows, counts.row_sums())
+            start, stop = groups["lexicon"]
+            np.add.at(features[:, start:stop], rows, counts.dot(weights))
+
+            # Sentimiento de cada post con los tokens de sus fragmentos (los
+            # mismos que tokenizaría analyze_sentiment sobre el texto unido);
+            # los posts sin sentimiento quedan en cero, como el neutro
+            start, stop = groups["sentiment"]
+            if stats["sentiments"]:
+                features[rows[stats["sentiment_rows"]], start:stop] = [
+                    [sentiment[key] for key in SENTIMENT_FEATURES]
+                    for sentiment in stats["sentiments"]
+                ]
+
+            ngrams = stats["ngrams"]
+            np.add.at(
+                features,
+                (rows[ngrams.row_ids()], groups["ngrams"][0] + ngrams.indices),
+                ngrams.data,
+            )
 
-        return target_count / total_words
+        return features, columns, groups
+
+    def export_post_features(self, data: Dict, path, **batch_info) -> FeatureStore:
+        """Agrega las features por post de un dataset a una matriz en disco"""
+        features, columns, groups = self.calculate_post_features(data)
+        store = FeatureStore(path)
+        with span("export_post_features", cat="io", posts=len(features)):
+            store.append(
+                features,
+                columns,
+                groups,
+                lexicon_version=self.lexicon.version,
+                **batch_info,
+            )
+        return store
+
+    def _post_batch(self, data: Dict, timestamps: bool = False) -> PostBatch:
+        """Campos de los posts de un dataset con el límite de caracteres aplicado"""
+        batch = PostBatch.from_posts(
+            data.get("posts", []),
+            timestamps,
+            self.max_post_chars,
+            self.post_overflow,
+        )
+        if batch.oversized:
+            self.metrics.inc("bigfive_oversized_posts_total", batch.oversized)
+        return batch
+
+    def _hll_precision_for(self, n_texts: int) -> Optional[int]:
+        """Precisión del HyperLogLog para un corpus (None = conteo exacto)"""
+        if self.unique_words_mode == "hll" or (
+            self.unique_words_mode == "auto" and n_texts >= self.hll_min_posts
+        ):
+            return self.hll_precision
+        return None
+
+    def _collect_text_statistics(
+        self,
+        texts: List[str],
+        snapshot: Tuple[Lexicon, "SpanishSentimentAnalyzer"] = None,
+        deadline: Optional[float] = None,
+        text_index: Optional[np.ndarray] = None,
+    ) -> Tuple[Dict, Dict]:
+        """Calcula los conteos del corpus en serie o por bloques en un pool de procesos.
+
+        Al pasar ``deadline`` (epoch) se lanza AnalysisBudgetExceeded si el
+        análisis no termina a tiempo. Con ``text_index`` los bloques no
+        separan los fragmentos de un post.
+        """
+        lexicon, sentiment_analyzer = snapshot or self.lexicon_snapshot()
+        lexicons = lexicon.traits
+        hll_precision = self._hll_precision_for(len(texts))
+
+        # Un corpus que no cabe en el presupuesto se procesa por bloques en serie
+        # (cada worker de un pool sumaría su propia memoria al contenedor)
+        budget_bytes = int(self.memory_budget_mb * MB)
+        estimated = estimate_working_set(texts)
+        if budget_bytes > 0 and estimated > budget_bytes:
+            chunk_size = streaming_chunk_size(texts, budget_bytes)
+            slices = post_slices(text_index, len(texts), chunk_size)
+            stats = self._streaming_statistics(
+                texts,
+                lexicons,
+                sentiment_analyzer,
+                slices,
+                hll_precision,
+                deadline,
+                text_index,
+            )
+            return stats, {
+                "mode": "streaming",
+                "chunks": len(slices),
+                "workers": 1,
+                "estimated_bytes": estimated,
+                "budget_bytes": budget_bytes,
+            }
+
+        slices = post_slices(text_index, len(texts), self.chunk_size)
+        n_chunks = len(slices)
+        workers = min(self.max_workers, n_chunks)
+
+        if len(texts) < self.parallel_threshold or workers < 2:
+            stats = _text_statistics(
+                texts,
+                lexicons,
+                sentiment_analyzer,
+                hll_precision,
+                self.mattr_window,
+                self.top_words_capacity,
+                self.social_signals,
+                deadline,
+                text_index,
+            )
+            return stats, {"mode": "serial", "chunks": 1, "workers": 1}
+
+        use_shared_memory = self.use_shared_memory
+        if use_shared_memory:
+            stats = self._shared_memory_statistics(
+                texts,
+                lexicons,
+                sentiment_analyzer,
+                workers,
+                hll_precision,
+                deadline,
+                text_index,
+            )
+        else:
+            chunks = [texts[start:end] for start, end in slices]
+            indexes = [
+                text_index[start:end] if text_index is not None else None
+                for start, end in slices
+            ]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                partials = traced_map(
+                    executor,
+                    _text_statistics,
+                    chunks,
+                    [lexicons] * len(chunks),
+                    [sentiment_analyzer] * len(chunks),
+                    [hll_precision] * len(chunks),
+                    [self.mattr_window] * len(chunks),
+                    [self.top_words_capacity] * len(chunks),
+                    [self.social_signals] * len(chunks),
+                    [deadline] * len(chunks),
+                    indexes,
+                )
+            stats = _merge_text_statistics(partials)
+
+        return stats, {
+            "mode": "shared_memory" if use_shared_memory else "parallel",
+            "chunks": n_chunks,
+            "workers": workers,
+        }
+
+    def _streaming_statistics(
+        self,
+        texts: List[str],
+        lexicons: Dict[str, List[str]],
+        sentiment_analyzer: "SpanishSentimentAnalyzer",
+        slices: List[Tuple[int, int]],
+        hll_precision: Optional[int] = None,
+        deadline: Optional[float] = None,
+        text_index: Optional[np.ndarray] = None,
+    ) -> Dict:
+        """Acumula los conteos bloque a bloque sin materializar el corpus completo"""
+        merged = _merge_text_statistics([])
+        for start, end in slices:
+            partial = _text_statistics(
+                texts[start:end],
+                lexicons,
+                sentiment_analyzer,
+                hll_precision,
+                self.mattr_window,
+                self.top_words_capacity,
+                self.social_signals,
+                deadline,
+                text_index[start:end] if text_index is not None else None,
+            )
+            _merge_text_statistics([partial], merged)
+        return merged
+
+    def _shared_memory_statistics(
+        self,
+        texts: List[str],
+        lexicons: Dict[str, List[str]],
+        sentiment_analyzer: "SpanishSentimentAnalyzer",
+        workers: int,
+        hll_precision: Optional[int] = None,
+        deadline: Optional[float] = None,
+        text_index: Optional[np.ndarray] = None,
+    ) -> Dict:
+        """Conteos del corpus con los textos en memoria compartida: cada worker
+        decodifica y procesa su rango de posts"""
+        with SharedTextCorpus(texts, text_index) as corpus:
+            slices = corpus.slices(self.chunk_size)
+            n = len(slices)
+            executor = ProcessPoolExecutor(max_workers=workers)
+            try:
+                partials = traced_map(
+                    executor,
+                    _shared_text_statistics,
+                    [corpus.spec] * n,
+                    [start for start, _ in slices],
+                    [end for _, end in slices],
+                    [lexicons] * n,
+                    [sentiment_analyzer] * n,
+                    [hll_precision] * n,
+                    [self.mattr_window] * n,
+                    [self.top_words_capacity] * n,
+                    [self.social_signals] * n,
+                    [deadline] * n,
+                )
+            except BaseException:
+                # Cancelar lo pendiente antes de liberar la memoria compartida
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+            executor.shutdown(wait=True)
+        return _merge_text_statistics(partials)
 
     def calculate_big_five_scores(self, data: Dict) -> Dict[str, float]:
         """Calcula puntuaciones para los cinco rasgos EN ESPAÑOL."""
+        profiler = MemoryProfiler(enabled=self.profile_memory)
+        try:
+            with profiler, self.metrics.timer("bigfive_analysis_seconds"), span(
+                "calculate_big_five_scores"
+            ):
+                scores = self._score_dataset(data, profiler)
+        except Exception:
+            self.metrics.inc("bigfive_analysis_failures_total")
+            raise
+        self.metrics.inc("bigfive_analyses_total")
+
+        # Pico y asignaciones por fase (solo del proceso principal)
+        if profiler.enabled:
+            self.results["metadata"]["memory"] = profiler.report()
+        return scores
+
+    @contextmanager
+    def _phase(self, profiler: MemoryProfiler, name: str):
+        """Mide una fase: memoria (si se perfila), duración en las métricas y span"""
+        with profiler.phase(name), self.metrics.timer(
+            "bigfive_phase_seconds", phase=name
+        ), span(name, cat="phase"):
+            yield
+
+    def _score_dataset(self, data: Dict, profiler: MemoryProfiler) -> Dict[str, float]:
+        """Cuerpo del análisis, con las fases instrumentadas por el perfilador"""
+        # Instantánea del léxico: una recarga durante el análisis no lo afecta
+        snapshot = self.lexicon_snapshot()
+        lexicon_version = snapshot[0].version
+        deadline = deadline_after(self.time_budget)
+
         # Validación robusta
         if not data or not isinstance(data, dict):
             return self._get_default_scores()
 
-        # Extraer posts de forma segura
-        posts = data.get("posts", [])
-        if not isinstance(posts, list):
-            posts = []
-
-        posts_text = []
-        for post in posts:
-            if isinstance(post, dict):
-                text = post.get("text", "")
-                if text and isinstance(text, str) and len(text.strip()) > 0:
-                    posts_text.append(text.strip())
+        # Extraer y validar todos los campos de los posts en una pasada
+        with self._phase(profiler, "extract_posts"):
+            batch = self._post_batch(data)
+        posts_text = batch.texts
 
         # Si no hay textos válidos
         if not posts_text:
             return self._get_default_scores()
 
-        all_text = " ".join(posts_text)
+        # Conteos del corpus en una pasada (por bloques en paralelo si es grande)
+        with self._phase(profiler, "text_statistics"):
+            stats, processing = self._collect_text_statistics(
+                posts_text, snapshot, deadline, batch.text_index
+            )
+
+        return self._build_results(
+            data, batch, stats, processing, lexicon_version, profiler
+        )
+
+    def _build_results(
+        self,
+        data: Dict,
+        batch: PostBatch,
+        stats: Dict,
+        processing: Dict,
+        lexicon_version: str,
+        profiler: MemoryProfiler,
+    ) -> Dict[str, float]:
+        """Componentes, puntuaciones y self.results a partir de los conteos del corpus"""
+        # Posts con texto (los fragmentos de un post largo cuentan una vez)
+        n_posts = batch.n_text_posts
+
+        if self.metrics.enabled:
+            self.metrics.inc("bigfive_posts_total", n_posts)
+            self.metrics.inc("bigfive_tokens_total", stats["words"])
+            for trait, hits in stats["trait_hits"].items():
+                self.metrics.inc("bigfive_lexicon_hits_total", hits, trait=trait)
+
+        # Frecuencias de los cinco léxicos (producto matriz dispersa por bloque)
+        words_lower = stats["words_lower"]
+        word_frequencies = {
+            trait: hits / words_lower if words_lower > 0 else 0.0
+            for trait, hits in stats["trait_hits"].items()
+        }
 
         # 1. EXTRAVERSIÓN
         friends_count = data.get("friends_count", 0)
@@ -373,27 +1537,10 @@ class BigFiveAnalyzer:
             friends_count = 0
 
         # Calcular reacciones totales
-        total_reactions = 0
-        for post in posts:
-            if isinstance(post, dict):
-                reactions = post.get("reactions", 0)
-                if isinstance(reactions, (int, float)):
-                    total_reactions += reactions
-
-        extraversion_score = (
-            min(friends_count / 1000, 1.0) * 0.3  # Normalizar amigos (max 1000)
-            + min(total_reactions / max(len(posts_text), 1) / 50, 1.0)
-            * 0.4  # Reacciones por post
-            + self.calculate_word_frequency(posts_text, self.extraversion_words) * 0.3
-        )
+        total_reactions = batch.total_reactions
 
         # 2. NEUROTICISMO
-        sentiment = self.analyze_text_sentiment(posts_text)
-        neuroticism_score = (
-            (sentiment["negative"] / max(sentiment["total_texts_analyzed"], 1)) * 0.4
-            + (1 - sentiment["sentiment_balance"]) * 0.3
-            + self.calculate_word_frequency(posts_text, self.neuroticism_words) * 0.3
-        )
+        sentiment = summarize_polarities(stats["polarities"])
 
         # 3. APERTURA
         groups = data.get("groups", [])
@@ -401,89 +1548,189 @@ class BigFiveAnalyzer:
             groups = []
 
         # Calcular diversidad léxica
-        words = re.findall(r"\b\w+\b", all_text)
-        if words:
-            unique_words = len(set(words))
-            lexical_diversity = unique_words / len(words)
+        unique_words = len(stats["unique_words"])
+        if stats["words"]:
+            lexical_diversity = unique_words / stats["words"]
         else:
             lexical_diversity = 0
-
-        openness_score = (
-            min(len(groups) / 10, 1.0) * 0.3  # Normalizar grupos (max 10)
-            + self.calculate_word_frequency(posts_text, self.openness_words) * 0.4
-            + lexical_diversity * 0.3
-        )
+        # MATTR: promedio en ventanas fijas (con menos tokens que la ventana, el TTR)
+        mattr = stats["mattr"].value()
+        if mattr is None:
+            mattr = lexical_diversity
 
         # 4. AMABILIDAD
-        total_comments = 0
-        for post in posts:
-            if isinstance(post, dict):
-                comments = post.get("comments", 0)
-                if isinstance(comments, (int, float)):
-                    total_comments += comments
-
-        agreeableness_score = (
-            (sentiment["positive"] / max(sentiment["total_texts_analyzed"], 1)) * 0.4
-            + self.calculate_word_frequency(posts_text, self.agreeableness_words) * 0.4
-            + min(total_comments / max(len(posts_text), 1) / 10, 1.0)
-            * 0.2  # Normalizar comentarios
-        )
+        total_comments = batch.total_comments
 
         # 5. RESPONSABILIDAD
         basic_info = data.get("basic_info", {})
         bio_text = basic_info.get("bio", "") if isinstance(basic_info, dict) else ""
-
-        conscientiousness_score = (
-            self.calculate_word_frequency(posts_text, self.conscientiousness_words)
-            * 0.6
-            + (1.0 if len(posts_text) >= 5 else 0.3)
-            * 0.2  # Consistencia (mínimo 5 posts)
-            + (1.0 if bio_text and len(bio_text.strip()) > 20 else 0.3)
-            * 0.2  # Biografía completa
+        if not isinstance(bio_text, str):
+            bio_text = ""
+
+        # Componentes normalizados de cada rasgo (se ponderan con trait_weights)
+        components = trait_components(
+            posts=n_posts,
+            reactions=total_reactions,
+            comments=total_comments,
+            positive=sentiment["positive"],
+            negative=sentiment["negative"],
+            analyzed=sentiment["total_texts_analyzed"],
+            word_frequencies=word_frequencies,
+            lexical_diversity=lexical_diversity,
+            social_signals=(
+                social_activity(stats["social"], n_posts) if "social" in stats else 0.0
+            ),
+            friends_count=friends_count,
+            groups=len(groups),
+            bio_complete=bool(bio_text and len(bio_text.strip()) > 20),
         )
-
-        # Normalizar scores a 0-1
-        scores = {
-            "extraversion": min(max(extraversion_score, 0.0), 1.0),
-            "neuroticism": min(max(neuroticism_score, 0.0), 1.0),
-            "openness": min(max(openness_score, 0.0), 1.0),
-            "agreeableness": min(max(agreeableness_score, 0.0), 1.0),
-            "conscientiousness": min(max(conscientiousness_score, 0.0), 1.0),
+        components = {
+            trait: {name: float(value) for name, value in values.items()}
+            for trait, values in components.items()
         }
 
+        # Ponderar y normalizar scores a 0-1
+        with self._phase(profiler, "scoring"):
+            scores = weighted_scores(components, self.trait_weights)
+
         # Almacenar resultados
         self.results = {
             "big_five_scores": scores,
             "metadata": {
-                "posts_analyzed": len(posts_text),
-                "words_analyzed": len(words),
-                "unique_words": len(set(words)) if words else 0,
+                "posts_analyzed": n_posts,
+                "words_analyzed": stats["words"],
+                "unique_words": unique_words,
+                "unique_words_counting": _unique_words_counting(stats["unique_words"]),
                 "lexical_diversity": round(lexical_diversity, 3),
+                "lexical_diversity_mattr": round(mattr, 3),
+                "mattr_window": self.mattr_window,
+                "top_words": _top_words_metadata(stats["top_words"], self.top_words_k),
+                "top_lexicon_words": {
+                    trait: [
+                        {"word": word, "count": count}
+                        for word, count in sorted(
+                            counts.items(), key=lambda item: (-item[1], item[0])
+                        )[: self.top_words_k]
+                    ]
+                    for trait, counts in stats["lexicon_words"].items()
+                },
                 "sentiment_analysis": sentiment,
+                "processing": processing,
+                "lexicon_version": lexicon_version,
+                "oversized_posts": batch.oversized,
             },
             "calculated_components": {
                 "extraversion": {
                     "friends_normalized": min(friends_count / 1000, 1.0),
-                    "reactions_per_post": total_reactions / max(len(posts_text), 1),
-                    "word_frequency": self.calculate_word_frequency(
-                        posts_text, self.extraversion_words
-                    ),
+                    "reactions_per_post": total_reactions / max(n_posts, 1),
+                    "word_frequency": word_frequencies["extraversion"],
                 },
                 "neuroticism": {
                     "negative_ratio": sentiment["negative"]
                     / max(sentiment["total_texts_analyzed"], 1),
                     "sentiment_balance": sentiment["sentiment_balance"],
-                    "word_frequency": self.calculate_word_frequency(
-                        posts_text, self.neuroticism_words
-                    ),
+                    "word_frequency": word_frequencies["neuroticism"],
                 },
             },
+            "component_features": components,
         }
+        if "social" in stats:
+            self.results["metadata"]["social_signals"] = dict(stats["social"])
 
         return scores
 
+    def calculate_big_five_scores_batch(self, datasets: List[Dict]) -> List[Dict]:
+        """Analiza varios datasets juntos y devuelve los resultados de cada uno.
+
+        Los textos de todos se tokenizan en una sola matriz dispersa; los
+        puntajes son idénticos a los de calculate_big_five_scores por dataset.
+        self.results queda con los del último dataset.
+        """
+        with self.metrics.timer("bigfive_phase_seconds", phase="micro_batch"), span(
+            "micro_batch", cat="phase", datasets=len(datasets)
+        ):
+            results = self._score_batch(datasets)
+        self.metrics.inc("bigfive_analyses_total", len(datasets))
+        return results
+
+    def _score_batch(self, datasets: List[Dict]) -> List[Dict]:
+        snapshot = self.lexicon_snapshot()
+        lexicon_version = snapshot[0].version
+        profiler = MemoryProfiler(enabled=False)
+        # Los datasets del lote comparten un presupuesto proporcional
+        deadline = deadline_after(self.time_budget * len(datasets))
+
+        batches = [
+            self._post_batch(data) if data and isinstance(data, dict) else None
+            for data in datasets
+        ]
+        scored = [
+            i for i, batch in enumerate(batches) if batch is not None and batch.texts
+        ]
+
+        groups = [batches[i].texts for i in scored]
+        statistics = (
+            _grouped_text_statistics(
+                groups,
+                snapshot[0].traits,
+                snapshot[1],
+                [self._hll_precision_for(len(group)) for group in groups],
+                self.mattr_window,
+                self.top_words_capacity,
+                self.social_signals,
+                deadline,
+                [batches[i].text_index for i in scored],
+            )
+            if groups
+            else []
+        )
+        stats_by_index = dict(zip(scored, statistics))
+        processing = {
+            "mode": "micro_batch",
+            "chunks": 1,
+            "workers": 1,
+            "batch_size": len(datasets),
+        }
+
+        results = []
+        for i, data in enumerate(datasets):
+            if i in stats_by_index:
+                self._build_results(
+                    data,
+                    batches[i],
+                    stats_by_index[i],
+                    processing,
+                    lexicon_version,
+                    profiler,
+                )
+            else:
+                self._get_default_scores()
+            results.append(self.results)
+        return results
+
+    def evaluate_weight_configurations(
+        self, grid: np.ndarray, components_list: List[Dict] = None
+    ) -> np.ndarray:
+        """Evalúa una rejilla de pesos (configs x rasgos x componentes) sin reanalizar.
+
+        Por defecto usa los componentes del último análisis; devuelve un
+        arreglo (configs x datasets x rasgos).
+        """
+        if components_list is None:
+            if "component_features" not in self.results:
+                raise ValueError(
+                    "No hay componentes calculados. Ejecute calculate_big_five_scores primero."
+                )
+            components_list = [self.results["component_features"]]
+
+        grid = np.asarray(grid, dtype=np.float64)
+        if grid.ndim == 2:
+            grid = grid[None]
+        return evaluate_weight_grid(component_matrix(components_list), grid)
+
     def _get_default_scores(self) -> Dict[str, float]:
         """Retorna scores por defecto cuando no hay datos"""
+        self.metrics.inc("bigfive_default_scores_total")
         default_scores = {
             "extraversion": 0.5,
             "neuroticism": 0.5,
@@ -507,6 +1754,7 @@ class BigFiveAnalyzer:
                     "sentiment_balance": 0.5,
                     "total_texts_analyzed": 0,
                 },
+                "lexicon_version": self.lexicon.version,
             },
         }
 
@@ -541,13 +1789,16 @@ class BigFiveAnalyzer:
 
         return "\n".join(report)
 
-    def generate_report(self) -> str:
+    @traced("generate_report", cat="report")
+    def generate_report(self, results: Dict = None) -> str:
         """Genera un reporte legible de los resultados almacenados en self.results."""
-        if not self.results:
+        if results is None:
+            results = self.results
+        if not results:
             return "No hay resultados para reportar"
 
-        scores = self.results.get("big_five_scores", {})
-        metadata = self.results.get("metadata", {})
+        scores = results.get("big_five_scores", {})
+        metadata = results.get("metadata", {})
 
         report = []
         report.append("=" * 60)
@@ -625,25 +1876,44 @@ class BigFiveAnalyzer:
 
         return "\n".join(report)
 
-    def save_results(self, filename: str = "big5_analysis.json"):
-        """Guarda los resultados en un archivo JSON y el reporte en texto."""
-        if not self.results:
+    @traced("save_results", cat="io")
+    def save_results(
+        self,
+        filename: str = "big5_analysis.json",
+        results: Dict = None,
+        folder: str = "data/results",
+        compression: Optional[str] = JSON_COMPRESSION,
+    ):
+        """Guarda los resultados en un archivo JSON y el reporte en texto.
+
+        Si se pasa ``results`` se guarda esa instantánea en lugar de
+        self.results (útil para escribir desde otro hilo). Ambos archivos se
+        comprimen según la extensión del nombre o ``compression`` (ver
+        src/utils.py).
+        """
+        if results is None:
+            results = self.results
+        if not results:
             print(
                 "No hay resultados para guardar. Ejecute calculate_big_five_scores primero."
             )
             return
 
-        output_path = Path("data/results") / filename
+        filename, compression = compressed_name(filename, compression)
+        output_path = Path(folder) / filename
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        with open_text(output_path, "w", compression) as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
 
         print(f"💾 Resultados guardados en: {output_path}")
 
-        # Guardar también reporte en texto
-        txt_path = output_path.with_suffix(".txt")
-        with open(txt_path, "w", encoding="utf-8") as f:
-            f.write(self.generate_report())
+        # Guardar también reporte en texto (con la misma compresión)
+        name, _ = split_compression(output_path.name)
+        txt_name, _ = compressed_name(Path(name).with_suffix(".txt").name, compression)
+        txt_path = output_path.with_name(txt_name)
+        with open_text(txt_path, "w", compression) as f:
+            f.write(self.generate_report(results))
 
         print(f"📄 Reporte guardado en: {txt_path}")
+        return output_path
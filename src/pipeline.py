@@ -0,0 +1,150 @@
+# src/pipeline.py
+"""
+Pipeline de E/S con prefetch: mientras el analizador puntúa un archivo,
+un pool de hilos ya está leyendo y parseando los siguientes, y otro hilo
+escribe los resultados anteriores. Las colas están acotadas para que
+nunca haya más de ``prefetch`` archivos cargados en memoria.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .tracing import span
+
+
+class StageStats:
+    """Tiempo ocupado y elementos procesados por una etapa del pipeline"""
+
+    def __init__(self, name: str, workers: int = 1):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Registra un elemento procesado (seguro entre hilos)"""
+        with self._lock:
+            self.items += 1
+            self.busy_seconds += seconds
+
+    def to_dict(self, wall_seconds: float) -> Dict:
+        """Resumen con la utilización relativa al tiempo total"""
+        capacity = wall_seconds * self.workers
+        return {
+            "items": self.items,
+            "workers": self.workers,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "utilization": (
+                round(self.busy_seconds / capacity, 4) if capacity > 0 else 0.0
+            ),
+        }
+
+
+class PrefetchPipeline:
+    """Encadena carga (hilos), procesamiento (hilo actual) y guardado (hilo) con colas acotadas"""
+
+    def __init__(
+        self,
+        load: Callable[[Any], Any],
+        process: Callable[[Any, Any], Any],
+        save: Optional[Callable[[Any, Any], Any]] = None,
+        prefetch: int = 4,
+        io_workers: int = 4,
+    ):
+        if prefetch < 1 or io_workers < 1:
+            raise ValueError("prefetch e io_workers deben ser al menos 1")
+
+        self.load = load
+        self.process = process
+        self.save = save
+        self.prefetch = prefetch
+        self.io_workers = io_workers
+        self.stats: Dict[str, StageStats] = {}
+        self.wait_seconds = 0.0
+        self.wall_seconds = 0.0
+
+    def _timed(self, stage: StageStats, func: Callable, *args):
+        """Ejecuta func midiendo su tiempo en la etapa dada"""
+        start = time.perf_counter()
+        try:
+            with span(stage.name, cat="pipeline"):
+                return func(*args)
+        finally:
+            stage.record(time.perf_counter() - start)
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """Procesa todos los elementos en orden y devuelve sus resultados"""
+        self.stats = {
+            "load": StageStats("load", self.io_workers),
+            "process": StageStats("process"),
+            "save": StageStats("save"),
+        }
+        self.wait_seconds = 0.0
+        start = time.perf_counter()
+
+        results = []
+        pending_loads: deque = deque()
+        pending_saves: deque = deque()
+        iterator = iter(items)
+
+        loader = ThreadPoolExecutor(self.io_workers, thread_name_prefix="prefetch")
+        writer = ThreadPoolExecutor(1, thread_name_prefix="writer")
+
+        def submit_next() -> bool:
+            for item in iterator:
+                future = loader.submit(self._timed, self.stats["load"], self.load, item)
+                pending_loads.append((item, future))
+                return True
+            return False
+
+        try:
+            # Llenar la cola de prefetch
+            while len(pending_loads) < self.prefetch and submit_next():
+                pass
+
+            while pending_loads:
+                item, future = pending_loads.popleft()
+                waited = time.perf_counter()
+                data = future.result()
+                self.wait_seconds += time.perf_counter() - waited
+                submit_next()
+
+                result = self._timed(self.stats["process"], self.process, item, data)
+                results.append(result)
+                del data
+
+                if self.save is not None:
+                    # Contrapresión: no acumular más de prefetch escrituras pendientes
+                    while len(pending_saves) >= self.prefetch:
+                        pending_saves.popleft().result()
+                    pending_saves.append(
+                        writer.submit(
+                            self._timed, self.stats["save"], self.save, item, result
+                        )
+                    )
+
+            for save_future in pending_saves:
+                save_future.result()
+        except BaseException:
+            for _, future in pending_loads:
+                future.cancel()
+            for save_future in pending_saves:
+                save_future.cancel()
+            raise
+        finally:
+            loader.shutdown(wait=True, cancel_futures=True)
+            writer.shutdown(wait=True)
+            self.wall_seconds = time.perf_counter() - start
+
+        return results
+
+    def report(self) -> Dict:
+        """Utilización de cada etapa en la última ejecución"""
+        report = {name: s.to_dict(self.wall_seconds) for name, s in self.stats.items()}
+        report["wall_seconds"] = round(self.wall_seconds, 4)
+        report["process_wait_seconds"] = round(self.wait_seconds, 4)
+        return report
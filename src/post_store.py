@@ -0,0 +1,330 @@
+# src/post_store.py
+"""
+Almacén de posts crudos direccionado por contenido, deduplicado entre
+snapshots.
+
+El cuerpo de cada post (todo menos los campos que cambian entre snapshots,
+como reacciones y comentarios) se serializa en forma canónica y se guarda
+una sola vez bajo su hash en un archivo de cuerpos de solo escritura al
+final (``bodies.pack``), con su posición en un índice (``bodies.idx``).
+Cada snapshot es un manifiesto JSON comprimido con gzip: los campos del
+dataset, y por post el hash de su cuerpo y sus campos propios del snapshot. Guardar un
+snapshot casi igual al anterior solo escribe los posts nuevos y el
+manifiesto.
+
+Al cargar un snapshot solo se lee el manifiesto; los cuerpos se leen al
+acceder a cada post, con una caché LRU compartida cuyos aciertos y fallos
+se cuentan en las métricas. Un solo proceso escribe en el almacén.
+
+Para no volver a codificar y hashear los posts sin cambios, cada instancia
+recuerda los cuerpos del último snapshot que guardó (por texto) y reutiliza
+su hash si el cuerpo es igual.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from config import POST_STORE_CACHE_SIZE
+
+from .metrics import REGISTRY, MetricsRegistry
+from .tracing import span
+from .utils import open_text
+
+FORMAT_NAME = "bigfive-post-snapshot"
+FORMAT_VERSION = 1
+
+# Campos de un post que cambian entre snapshots (van en el manifiesto)
+SNAPSHOT_FIELDS = ("reactions", "comments", "shares", "timestamp")
+
+
+# Codificadores reutilizados: json.dumps con opciones crea uno en cada llamada
+_CANONICAL = json.JSONEncoder(
+    sort_keys=True, ensure_ascii=False, separators=(",", ":")
+).encode
+_COMPACT = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _canonical(value: Any) -> bytes:
+    return _CANONICAL(value).encode("utf-8")
+
+
+def content_hash(body: bytes) -> str:
+    """Hash del cuerpo canónico de un post (BLAKE2b de 128 bits, hex)"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class SnapshotPosts(Sequence):
+    """Posts de un snapshot, reensamblados al acceder a cada uno"""
+
+    def __init__(self, store: "PostStore", entries: List[Dict]):
+        self._store = store
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._post(entry) for entry in self._entries[index]]
+        return self._post(self._entries[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        for entry in self._entries:
+            yield self._post(entry)
+
+    def _post(self, entry: Dict) -> Any:
+        post = self._store.body(entry["h"])
+        if isinstance(post, dict):
+            post.update((key, value) for key, value in entry.items() if key != "h")
+        return post
+
+    def hashes(self) -> List[str]:
+        return [entry["h"] for entry in self._entries]
+
+
+class Snapshot:
+    """Snapshot cargado: campos del dataset y posts perezosos"""
+
+    def __init__(self, name: str, manifest: Dict, posts: SnapshotPosts):
+        self.name = name
+        self.created_at = manifest["created_at"]
+        self.fields = manifest["fields"]
+        self.posts = posts
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+    def to_dict(self) -> Dict:
+        """Dataset completo como el que se guardó (lee todos los cuerpos)"""
+        return {**self.fields, "posts": list(self.posts)}
+
+
+class PostStore:
+    """Cuerpos de posts únicos por hash y manifiestos de snapshots"""
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        snapshot_fields: Sequence[str] = SNAPSHOT_FIELDS,
+        cache_size: int = POST_STORE_CACHE_SIZE,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.root = Path(root)
+        self.pack_path = self.root / "bodies.pack"
+        self.index_path = self.root / "bodies.idx"
+        self.snapshots_path = self.root / "snapshots"
+        self.snapshot_fields = tuple(snapshot_fields)
+        self.cache_size = max(cache_size, 0)
+        self.metrics = metrics if metrics is not None else REGISTRY
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._reader = None
+        self._index: Dict[str, tuple] = {}
+        # Cuerpos del último snapshot guardado: texto -> (cuerpo, hash)
+        self._previous: Dict[str, tuple] = {}
+        self._load_index()
+
+    # ========== ÍNDICE ==========
+
+    def _load_index(self):
+        """Posición de cada cuerpo; ignora entradas de una escritura interrumpida"""
+        if not self.index_path.exists():
+            return
+        pack_size = self.pack_path.stat().st_size if self.pack_path.exists() else 0
+        with open(self.index_path, "r", encoding="ascii") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 3:
+                    continue
+                digest, offset, length = parts[0], int(parts[1]), int(parts[2])
+                if offset + length <= pack_size:
+                    self._index[digest] = (offset, length)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._index
+
+    @property
+    def bodies(self) -> int:
+        """Cuerpos únicos guardados"""
+        return len(self._index)
+
+    # ========== ESCRITURA ==========
+
+    def _digest(self, post: Any, current: Dict[str, tuple]) -> tuple:
+        """Hash del cuerpo de un post, su forma canónica si hubo que calcularla
+        (None si se reutilizó del snapshot anterior) y sus campos del snapshot"""
+        if not isinstance(post, dict):
+            body = _canonical(post)
+            return content_hash(body), body, {}
+        body = {k: v for k, v in post.items() if k not in self.snapshot_fields}
+        fields = {k: post[k] for k in self.snapshot_fields if k in post}
+        text = body.get("text")
+        if not isinstance(text, str):
+            canonical = _canonical(body)
+            return content_hash(canonical), canonical, fields
+        known = self._previous.get(text)
+        # Solo se reutiliza un hash cuyo cuerpo ya está en el pack
+        if known is not None and known[0] == body and known[1] in self._index:
+            current[text] = known
+            return known[1], None, fields
+        canonical = _canonical(body)
+        digest = content_hash(canonical)
+        current[text] = (body, digest)
+        return digest, canonical, fields
+
+    def save(self, name: str, data: Dict) -> Dict:
+        """Guarda un dataset como snapshot (reemplaza uno con el mismo nombre).
+
+        Retorna los posts, los cuerpos nuevos y los bytes escritos.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("El snapshot debe ser un diccionario")
+        posts = data.get("posts", [])
+        if not isinstance(posts, list):
+            posts = []
+
+        entries = []
+        new_bodies = {}
+        current: Dict[str, tuple] = {}
+        for post in posts:
+            digest, body, fields = self._digest(post, current)
+            if body is not None and digest not in self._index:
+                new_bodies.setdefault(digest, body)
+            entries.append({"h": digest, **fields})
+
+        with self._lock, span("post_store_save", cat="io", snapshot=name):
+            written = self._append_bodies(new_bodies)
+            manifest = {
+                "format": FORMAT_NAME,
+                "version": FORMAT_VERSION,
+                "created_at": time.time(),
+                "fields": {k: v for k, v in data.items() if k != "posts"},
+                "posts": entries,
+            }
+            written += self._write_manifest(name, manifest)
+        # Después de escribir: si algo falla se vuelve a hashear todo
+        self._previous = current
+
+        self.metrics.inc("bigfive_post_store_bodies_written_total", len(new_bodies))
+        return {
+            "snapshot": name,
+            "posts": len(entries),
+            "new_bodies": len(new_bodies),
+            "bytes_written": written,
+        }
+
+    def _append_bodies(self, bodies: Dict[str, bytes]) -> int:
+        """Agrega los cuerpos al pack y después al índice (así un índice nunca
+        apunta a bytes sin escribir). Las entradas nuevas solo se publican
+        en el índice en memoria cuando los dos ficheros están escritos: si
+        la escritura falla, los cuerpos se vuelven a escribir en el
+        siguiente guardado."""
+        if not bodies:
+            return 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        entries = {}
+        written = 0
+        with open(self.pack_path, "ab") as pack:
+            offset = pack.tell()
+            for digest, body in bodies.items():
+                pack.write(body)
+                entries[digest] = (offset, len(body))
+                offset += len(body)
+                written += len(body)
+            pack.flush()
+            os.fsync(pack.fileno())
+        with open(self.index_path, "a", encoding="ascii") as index:
+            index.writelines(
+                f"{digest} {offset} {size}\n"
+                for digest, (offset, size) in entries.items()
+            )
+        self._index.update(entries)
+        return written
+
+    def _manifest_path(self, name: str) -> Path:
+        if not name or Path(name).name != name:
+            raise ValueError(f"Nombre de snapshot inválido: {name!r}")
+        return self.snapshots_path / f"{name}.json.gz"
+
+    def _write_manifest(self, name: str, manifest: Dict) -> int:
+        path = self._manifest_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        # Codificar de una vez usa el codificador en C (json.dump no)
+        content = _COMPACT(manifest)
+        # Nivel 1: los hashes casi no se comprimen y el nivel 6 dobla el tiempo
+        with gzip.open(temporary, "wb", compresslevel=1) as f:
+            f.write(content.encode("utf-8"))
+        size = temporary.stat().st_size
+        os.replace(temporary, path)
+        return size
+
+    # ========== LECTURA ==========
+
+    def snapshots(self) -> List[str]:
+        """Nombres de los snapshots guardados, ordenados"""
+        if not self.snapshots_path.exists():
+            return []
+        return sorted(
+            path.name[: -len(".json.gz")]
+            for path in self.snapshots_path.glob("*.json.gz")
+        )
+
+    def load(self, name: str) -> Snapshot:
+        """Snapshot con sus posts perezosos (solo se lee el manifiesto)"""
+        path = self._manifest_path(name)
+        if not path.exists():
+            raise FileNotFoundError(f"Snapshot no encontrado: {name}")
+        with span("post_store_load", cat="io", snapshot=name), open_text(path) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_NAME:
+            raise ValueError(f"{path} no es un manifiesto de snapshot")
+        return Snapshot(name, manifest, SnapshotPosts(self, manifest["posts"]))
+
+    def body(self, digest: str) -> Any:
+        """Cuerpo de un post (una copia nueva en cada llamada)"""
+        with self._lock:
+            raw = self._cache.get(digest)
+            hit = raw is not None
+            if hit:
+                self._cache.move_to_end(digest)
+            else:
+                raw = self._read(digest)
+                if self.cache_size:
+                    self._cache[digest] = raw
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+        self.metrics.inc(
+            "bigfive_post_store_cache_total", result="hit" if hit else "miss"
+        )
+        return json.loads(raw)
+
+    def _read(self, digest: str) -> bytes:
+        if digest not in self._index:
+            raise KeyError(f"Cuerpo de post no encontrado: {digest}")
+        offset, length = self._index[digest]
+        if self._reader is None:
+            self._reader = open(self.pack_path, "rb")
+        self._reader.seek(offset)
+        return self._reader.read(length)
+
+    def close(self):
+        with self._lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+            self._cache.clear()
+
+    def __enter__(self) -> "PostStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,218 @@
+# src/posts.py
+"""
+Representación columnar de los posts de un dataset.
+
+``PostBatch`` valida y extrae todos los campos en una sola pasada sobre la
+lista cruda de diccionarios: los textos válidos (sin espacios extremos) en
+una lista y los campos numéricos en arreglos de NumPy. Los pasos de
+puntuación consumen el lote en lugar de recorrer los diccionarios.
+"""
+
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .guards import limit_text
+
+
+def parse_timestamp(value) -> Optional[float]:
+    """Convierte un timestamp (epoch numérico o ISO 8601) a segundos epoch"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value.strip():
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return datetime.fromisoformat(value.strip()).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def sequential_sum(values: np.ndarray) -> float:
+    """Suma de izquierda a derecha (mismo redondeo que sumar en un bucle de Python)"""
+    if len(values) == 0:
+        return 0.0
+    # Como en Python, un desborde da inf sin advertencia
+    with np.errstate(over="ignore", invalid="ignore"):
+        return float(np.add.accumulate(values)[-1])
+
+
+def post_slices(
+    text_index: Optional[np.ndarray], n_texts: int, chunk_size: int
+) -> List[Tuple[int, int]]:
+    """Rangos de textos [inicio, fin) de unos ``chunk_size`` textos que no
+    separan los fragmentos de un mismo post (sin índice, cortes fijos)"""
+    starts = np.arange(0, n_texts, chunk_size, dtype=np.int64)
+    if text_index is not None and len(starts) > 1:
+        # Cada corte avanza hasta el primer texto del post siguiente
+        starts[1:] = np.searchsorted(
+            text_index, text_index[starts[1:] - 1], side="right"
+        )
+        starts = np.unique(starts[starts < n_texts])
+    ends = np.append(starts[1:], n_texts)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+class PostBatch:
+    """Columnas de los posts tipo diccionario de un dataset.
+
+    - ``reactions`` / ``comments``: valor numérico de cada post (0 si falta
+      o no es numérico).
+    - ``texts``: textos no vacíos, ya sin espacios extremos.
+    - ``text_index``: posición (entre los posts) de cada texto, no
+      decreciente; un post largo fragmentado aporta varios textos, así que
+      los promedios por post usan ``n_text_posts`` y no ``n_texts``.
+    - ``overflowed``: si el texto de cada post superaba el límite de
+      caracteres (``oversized`` cuenta esos posts).
+    - ``timestamps``: epoch de cada post (NaN si no es válido); solo se
+      calcula si se pide en ``from_posts``.
+    """
+
+    __slots__ = (
+        "reactions",
+        "comments",
+        "texts",
+        "text_index",
+        "timestamps",
+        "overflowed",
+    )
+
+    def __init__(
+        self,
+        reactions: np.ndarray,
+        comments: np.ndarray,
+        texts: List[str],
+        text_index: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+        overflowed: Optional[np.ndarray] = None,
+    ):
+        self.reactions = reactions
+        self.comments = comments
+        self.texts = texts
+        self.text_index = text_index
+        self.timestamps = timestamps
+        if overflowed is None:
+            overflowed = np.zeros(len(reactions), dtype=bool)
+        self.overflowed = overflowed
+
+    @classmethod
+    def from_posts(
+        cls,
+        posts,
+        timestamps: bool = False,
+        max_chars: int = 0,
+        overflow: str = "truncate",
+    ) -> "PostBatch":
+        """Valida y extrae todos los campos en una pasada (ignora lo que no sea dict).
+
+        Los textos de más de ``max_chars`` caracteres se truncan o fragmentan
+        según ``overflow`` (ver src/guards.py); max_chars <= 0 no los limita.
+        """
+        if not isinstance(posts, list):
+            posts = []
+
+        reactions = []
+        comments = []
+        texts = []
+        text_index = []
+        times = [] if timestamps else None
+        overflowed = []
+
+        for post in posts:
+            if not isinstance(post, dict):
+                continue
+            position = len(reactions)
+
+            value = post.get("reactions", 0)
+            reactions.append(value if isinstance(value, (int, float)) else 0)
+            value = post.get("comments", 0)
+            comments.append(value if isinstance(value, (int, float)) else 0)
+
+            text = post.get("text", "")
+            overflowed.append(False)
+            if text and isinstance(text, str):
+                text = text.strip()
+                if max_chars > 0 and len(text) > max_chars:
+                    overflowed[-1] = True
+                    for piece in limit_text(text, max_chars, overflow):
+                        texts.append(piece)
+                        text_index.append(position)
+                elif text:
+                    texts.append(text)
+                    text_index.append(position)
+
+            if times is not None:
+                timestamp = parse_timestamp(post.get("timestamp"))
+                times.append(np.nan if timestamp is None else timestamp)
+
+        return cls(
+            np.array(reactions, dtype=np.float64),
+            np.array(comments, dtype=np.float64),
+            texts,
+            np.array(text_index, dtype=np.int64),
+            np.array(times, dtype=np.float64) if times is not None else None,
+            np.array(overflowed, dtype=bool),
+        )
+
+    def __len__(self) -> int:
+        return len(self.reactions)
+
+    @property
+    def n_texts(self) -> int:
+        return len(self.texts)
+
+    @property
+    def n_text_posts(self) -> int:
+        """Posts con texto (cada post cuenta una vez aunque esté fragmentado)"""
+        if len(self.text_index) == 0:
+            return 0
+        return int(np.count_nonzero(np.diff(self.text_index))) + 1
+
+    @property
+    def oversized(self) -> int:
+        """Posts cuyo texto superaba el límite de caracteres"""
+        return int(np.count_nonzero(self.overflowed))
+
+    @property
+    def total_reactions(self) -> float:
+        return sequential_sum(self.reactions)
+
+    @property
+    def total_comments(self) -> float:
+        return sequential_sum(self.comments)
+
+    def post_texts(self) -> List[Optional[str]]:
+        """Texto de cada post (None si no tiene texto válido; los fragmentos
+        de un post largo se unen con un espacio)"""
+        texts: List[Optional[str]] = [None] * len(self)
+        for position, text in zip(self.text_index.tolist(), self.texts):
+            previous = texts[position]
+            texts[position] = text if previous is None else f"{previous} {text}"
+        return texts
+
+    def take(self, indices: Sequence[int]) -> "PostBatch":
+        """Nuevo lote con los posts indicados, en ese orden"""
+        indices = np.asarray(indices, dtype=np.int64)
+        # Rango de textos de cada post (text_index es no decreciente)
+        first = np.searchsorted(self.text_index, indices, side="left")
+        last = np.searchsorted(self.text_index, indices, side="right")
+        counts = last - first
+
+        return PostBatch(
+            self.reactions[indices],
+            self.comments[indices],
+            [
+                self.texts[i]
+                for start, end in zip(first.tolist(), last.tolist())
+                for i in range(start, end)
+            ],
+            np.repeat(np.arange(len(indices), dtype=np.int64), counts),
+            self.timestamps[indices] if self.timestamps is not None else None,
+            self.overflowed[indices],
+        )
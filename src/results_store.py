@@ -0,0 +1,382 @@
+# src/results_store.py
+"""
+Almacén local de resultados en SQLite.
+
+Cada análisis es una fila de ``runs`` (dataset, fecha, versión del léxico,
+posts y palabras analizadas, modo de procesamiento), sus puntajes van en
+``scores`` (una fila por rasgo) y los resultados completos en ``metadata``
+como JSON. Los índices por dataset, fecha y versión del léxico permiten
+consultar y comparar ejecuciones sin abrir un archivo por resultado.
+
+La base usa WAL: las consultas no bloquean la escritura ni al revés. Los
+resultados se acumulan en memoria y se escriben por lotes, cada lote en
+una sola transacción. Los workers de un pool no escriben: devuelven sus
+resultados al proceso principal, que es el único escritor, así que no hay
+contención por el bloqueo de escritura de SQLite.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from config import RESULTS_DB, RESULTS_DB_BATCH_SIZE
+
+from .utils import json_stem, open_text
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    lexicon_version TEXT NOT NULL,
+    posts_analyzed INTEGER NOT NULL,
+    words_analyzed INTEGER NOT NULL,
+    processing_mode TEXT,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS scores (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    trait TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (run_id, trait)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS metadata (
+    run_id INTEGER PRIMARY KEY REFERENCES runs(id) ON DELETE CASCADE,
+    results TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_dataset ON runs(dataset, created_at);
+CREATE INDEX IF NOT EXISTS runs_created_at ON runs(created_at);
+CREATE INDEX IF NOT EXISTS runs_lexicon_version ON runs(lexicon_version, created_at);
+CREATE INDEX IF NOT EXISTS scores_trait ON scores(trait, score);
+"""
+
+RUN_COLUMNS = (
+    "id",
+    "dataset",
+    "created_at",
+    "lexicon_version",
+    "posts_analyzed",
+    "words_analyzed",
+    "processing_mode",
+    "source",
+)
+
+
+class ResultsStore:
+    """Resultados de análisis en SQLite, escritos por lotes desde un solo proceso"""
+
+    def __init__(
+        self,
+        path: Union[str, Path] = RESULTS_DB,
+        batch_size: int = RESULTS_DB_BATCH_SIZE,
+    ):
+        if not path:
+            raise ValueError("Se requiere la ruta de la base de resultados")
+        self.path = Path(path)
+        self.batch_size = max(batch_size, 1)
+        self._pending: List[Tuple] = []
+        self._lock = threading.RLock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = None
+
+    # ========== CONEXIÓN ==========
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Conexión del proceso actual (un proceso hijo abre la suya)"""
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Con WAL, NORMAL solo sincroniza en los checkpoints
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def close(self):
+        """Escribe lo pendiente y cierra la conexión"""
+        with self._lock:
+            self.flush()
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ========== ESCRITURA ==========
+
+    def add(
+        self,
+        dataset: str,
+        results: Dict,
+        created_at: Optional[float] = None,
+        source: str = "",
+    ):
+        """Agrega los resultados de un análisis; se escriben al completar un lote"""
+        with self._lock:
+            self._pending.append(
+                (
+                    dataset,
+                    time.time() if created_at is None else created_at,
+                    results,
+                    source,
+                )
+            )
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> int:
+        """Escribe los resultados pendientes en una transacción; retorna cuántos"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+            try:
+                connection = self.connection
+                with connection:
+                    for dataset, created_at, results, source in pending:
+                        self._insert(connection, dataset, created_at, results, source)
+            except BaseException:
+                # Sin escribir: se conservan para el próximo intento
+                self._pending[:0] = pending
+                raise
+            return len(pending)
+
+    @staticmethod
+    def _insert(
+        connection: sqlite3.Connection,
+        dataset: str,
+        created_at: float,
+        results: Dict,
+        source: str,
+    ):
+        metadata = results.get("metadata", {})
+        run_id = connection.execute(
+            "INSERT INTO runs (dataset, created_at, lexicon_version, "
+            "posts_analyzed, words_analyzed, processing_mode, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                dataset,
+                created_at,
+                metadata.get("lexicon_version", ""),
+                metadata.get("posts_analyzed", 0),
+                metadata.get("words_analyzed", 0),
+                metadata.get("processing", {}).get("mode"),
+                source,
+            ),
+        ).lastrowid
+        connection.executemany(
+            "INSERT INTO scores (run_id, trait, score) VALUES (?, ?, ?)",
+            [
+                (run_id, trait, float(score))
+                for trait, score in results.get("big_five_scores", {}).items()
+            ],
+        )
+        connection.execute(
+            "INSERT INTO metadata (run_id, results) VALUES (?, ?)",
+            (run_id, json.dumps(results, ensure_ascii=False)),
+        )
+
+    def import_folder(
+        self, folder: Union[str, Path], pattern: str = "*_results.json*"
+    ) -> int:
+        """Importa resultados guardados como JSON, comprimidos o no (con la
+        fecha del archivo)"""
+        count = 0
+        for path in sorted(Path(folder).glob(pattern)):
+            with open_text(path) as f:
+                results = json.load(f)
+            if not isinstance(results, dict) or "big_five_scores" not in results:
+                continue
+            dataset = json_stem(path)
+            if dataset.endswith("_results"):
+                dataset = dataset[: -len("_results")]
+            self.add(dataset, results, path.stat().st_mtime, source=str(path))
+            count += 1
+        self.flush()
+        return count
+
+    # ========== CONSULTAS ==========
+
+    def runs(
+        self,
+        dataset: Optional[str] = None,
+        lexicon_version: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """Ejecuciones (más recientes primero) con sus puntajes, filtradas por
+        dataset, versión del léxico y rango de fechas [since, until)"""
+        conditions, parameters = [], []
+        for condition, value in (
+            ("dataset = ?", dataset),
+            ("lexicon_version = ?", lexicon_version),
+            ("created_at >= ?", since),
+            ("created_at < ?", until),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        limit_clause = "LIMIT ?" if limit is not None else ""
+        if limit is not None:
+            parameters.append(limit)
+
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT r.*, s.trait, s.score FROM "
+                f"(SELECT * FROM runs {where} "
+                f"ORDER BY created_at DESC, id DESC {limit_clause}) AS r "
+                f"LEFT JOIN scores AS s ON s.run_id = r.id "
+                f"ORDER BY r.created_at DESC, r.id DESC",
+                parameters,
+            ).fetchall()
+
+        runs: Dict[int, Dict] = {}
+        for row in rows:
+            run = runs.get(row[0])
+            if run is None:
+                run = runs[row[0]] = dict(zip(RUN_COLUMNS, row))
+                run["scores"] = {}
+            if row[-2] is not None:
+                run["scores"][row[-2]] = row[-1]
+        return list(runs.values())
+
+    def latest(self, dataset: str) -> Optional[Dict]:
+        """Ejecución más reciente de un dataset (None si no hay)"""
+        runs = self.runs(dataset=dataset, limit=1)
+        return runs[0] if runs else None
+
+    def results(self, run_id: int) -> Optional[Dict]:
+        """Resultados completos de una ejecución, como los de save_results"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT results FROM metadata WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def history(self, dataset: str, trait: str) -> List[Tuple[float, float]]:
+        """Puntaje de un rasgo en las ejecuciones de un dataset (fecha, puntaje)"""
+        with self._lock:
+            return self.connection.execute(
+                "SELECT r.created_at, s.score FROM runs AS r "
+                "JOIN scores AS s ON s.run_id = r.id AND s.trait = ? "
+                "WHERE r.dataset = ? ORDER BY r.created_at, r.id",
+                (trait, dataset),
+            ).fetchall()
+
+    def datasets(self) -> List[Dict]:
+        """Datasets con su número de ejecuciones y la fecha de la última"""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT dataset, COUNT(*), MAX(created_at) FROM runs "
+                "GROUP BY dataset ORDER BY dataset"
+            ).fetchall()
+        return [
+            {"dataset": dataset, "runs": runs, "last_run": last_run}
+            for dataset, runs, last_run in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+
+# ========== CLI ==========
+
+
+def _timestamp(value: str) -> float:
+    """Fecha ISO (2024-05-01 o 2024-05-01T10:00) a epoch"""
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _format_time(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _print_runs(runs: Iterable[Dict]):
+    for run in runs:
+        scores = " ".join(
+            f"{trait[:4]}={score:.3f}" for trait, score in run["scores"].items()
+        )
+        print(
+            f"#{run['id']} {_format_time(run['created_at'])} {run['dataset']} "
+            f"[{run['lexicon_version']}] {run['posts_analyzed']} posts | {scores}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Consultas al almacén de resultados")
+    parser.add_argument("--db", default=RESULTS_DB or "data/results/results.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runs = commands.add_parser("runs", help="Lista ejecuciones")
+    runs.add_argument("--dataset")
+    runs.add_argument("--lexicon-version")
+    runs.add_argument("--since", type=_timestamp, help="Fecha ISO inicial")
+    runs.add_argument("--until", type=_timestamp, help="Fecha ISO final (excluida)")
+    runs.add_argument("--limit", type=int, default=20)
+
+    show = commands.add_parser("show", help="Resultados completos de una ejecución")
+    show.add_argument("run_id", type=int)
+
+    history = commands.add_parser("history", help="Puntaje de un rasgo en el tiempo")
+    history.add_argument("dataset")
+    history.add_argument("trait")
+
+    commands.add_parser("datasets", help="Datasets con ejecuciones")
+
+    import_parser = commands.add_parser(
+        "import", help="Importa archivos *_results.json(.gz) de una carpeta"
+    )
+    import_parser.add_argument("folder")
+
+    args = parser.parse_args(argv)
+    with ResultsStore(args.db) as store:
+        if args.command == "runs":
+            _print_runs(
+                store.runs(
+                    args.dataset,
+                    args.lexicon_version,
+                    args.since,
+                    args.until,
+                    args.limit,
+                )
+            )
+        elif args.command == "show":
+            results = store.results(args.run_id)
+            if results is None:
+                print(f"❌ Ejecución no encontrada: {args.run_id}")
+                return 1
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+        elif args.command == "history":
+            for created_at, score in store.history(args.dataset, args.trait):
+                print(f"{_format_time(created_at)} {score:.3f}")
+        elif args.command == "datasets":
+            for row in store.datasets():
+                print(
+                    f"{row['dataset']}: {row['runs']} ejecuciones "
+                    f"(última {_format_time(row['last_run'])})"
+                )
+        else:
+            print(f"✅ {store.import_folder(args.folder)} resultados importados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+# src/service.py
+"""
+Servicio HTTP local de análisis Big Five.
+
+Mantiene un ``BigFiveAnalyzer`` cargado y atiende solicitudes JSON con un
+dataset (``{"posts": [...], "friends_count": ..., ...}``). Las solicitudes
+concurrentes se agrupan en micro-lotes (hasta ``max_batch_size`` o
+``max_wait_ms``) que se puntúan juntos con
+``calculate_big_five_scores_batch``. La latencia de cada solicitud se
+resume con un sketch KLL para reportar percentiles.
+
+Rutas:
+    POST /analyze  -> {"big_five_scores": ..., "metadata": ...}
+    GET  /health   -> estado y versión del léxico
+    GET  /stats    -> solicitudes, tamaño de lote y percentiles de latencia
+    GET  /metrics  -> métricas del análisis en formato Prometheus
+
+Uso: ``python -m src.service --port 8765``
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from config import (
+    QUANTILE_SKETCH_K,
+    SERVICE_HOST,
+    SERVICE_MAX_BATCH_SIZE,
+    SERVICE_MAX_WAIT_MS,
+    SERVICE_PORT,
+)
+
+from .personality import BigFiveAnalyzer
+from .sketches import KLLSketch
+
+LATENCY_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+_STOP = object()
+
+
+class MicroBatchService:
+    """Agrupa solicitudes concurrentes en micro-lotes para un analizador compartido"""
+
+    def __init__(
+        self,
+        analyzer: Optional[BigFiveAnalyzer] = None,
+        max_batch_size: int = SERVICE_MAX_BATCH_SIZE,
+        max_wait_ms: float = SERVICE_MAX_WAIT_MS,
+        sketch_k: int = QUANTILE_SKETCH_K,
+    ):
+        if max_batch_size < 1 or max_wait_ms < 0:
+            raise ValueError("max_batch_size debe ser >= 1 y max_wait_ms >= 0")
+
+        self.analyzer = analyzer or BigFiveAnalyzer()
+        self.analyzer.metrics.histogram(
+            "bigfive_service_request_seconds",
+            "Latencia de las solicitudes del servicio",
+        )
+        self.analyzer.metrics.histogram(
+            "bigfive_service_batch_size",
+            "Solicitudes por micro-lote",
+            buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+        )
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+        self._lock = threading.Lock()
+        self._latency_ms = KLLSketch(k=sketch_k)
+        self.requests = 0
+        self.failures = 0
+        self.batches = 0
+
+    # ========== CICLO DE VIDA ==========
+
+    def start(self) -> "MicroBatchService":
+        """Inicia el hilo que arma y puntúa los micro-lotes"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._dispatch_loop, name="micro-batch", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Termina de puntuar lo pendiente y detiene el hilo"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # ========== SOLICITUDES ==========
+
+    def submit(self, data: Dict) -> Future:
+        """Encola un dataset; el futuro se resuelve con sus resultados"""
+        future: Future = Future()
+        self._queue.put((data, future, time.perf_counter()))
+        return future
+
+    def analyze(self, data: Dict, timeout: Optional[float] = None) -> Dict:
+        """Analiza un dataset (bloquea hasta que se puntúe su micro-lote)"""
+        return self.submit(data).result(timeout)
+
+    def _collect(self, first) -> Tuple[List, bool]:
+        """Arma un lote a partir de la primera solicitud, hasta llenarlo o agotar la espera"""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _dispatch_loop(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stopping = self._collect(first)
+            self._score(batch)
+
+    def _score(self, batch: List):
+        """Puntúa un micro-lote y resuelve los futuros de sus solicitudes.
+
+        Si el lote falla, cada dataset se vuelve a puntuar por separado: un
+        dataset lento o malformado solo hace fallar su propia solicitud.
+        """
+        datasets = [data for data, _, _ in batch]
+        try:
+            outcomes = [
+                (result, None)
+                for result in self.analyzer.calculate_big_five_scores_batch(datasets)
+            ]
+        except Exception as e:
+            outcomes = [(None, e)] if len(batch) == 1 else self._score_each(datasets)
+
+        finished = time.perf_counter()
+        with self._lock:
+            self.batches += 1
+            self.requests += len(batch)
+            self.failures += sum(1 for _, error in outcomes if error is not None)
+            for _, _, enqueued in batch:
+                self._latency_ms.update((finished - enqueued) * 1000)
+
+        metrics = self.analyzer.metrics
+        for _, _, enqueued in batch:
+            metrics.observe("bigfive_service_request_seconds", finished - enqueued)
+        metrics.observe("bigfive_service_batch_size", len(batch))
+
+        for (_, future, _), (result, error) in zip(batch, outcomes):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(
+                    {
+                        "big_five_scores": result["big_five_scores"],
+                        "metadata": result["metadata"],
+                    }
+                )
+
+    def _score_each(self, datasets: List[Dict]) -> List[Tuple]:
+        """(resultado, error) de cada dataset puntuado por separado"""
+        outcomes = []
+        for data in datasets:
+            try:
+                result = self.analyzer.calculate_big_five_scores_batch([data])[0]
+                outcomes.append((result, None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
+
+    def stats(self) -> Dict:
+        """Solicitudes atendidas, tamaño medio de lote y percentiles de latencia (ms)"""
+        with self._lock:
+            latency = {}
+            if self._latency_ms.count:
+                latency = {
+                    f"p{q * 100:g}": round(value, 3)
+                    for q, value in zip(
+                        LATENCY_QUANTILES, self._latency_ms.quantiles(LATENCY_QUANTILES)
+                    )
+                }
+                latency["max"] = round(self._latency_ms.max_value, 3)
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "batches": self.batches,
+                "avg_batch_size": (
+                    round(self.requests / self.batches, 3) if self.batches else 0.0
+                ),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "latency_ms": latency,
+            }
+
+
+class _AnalysisHandler(BaseHTTPRequestHandler):
+    server: "AnalysisHTTPServer"
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/health":
+            self._send_json(
+                200,
+                {"status": "ok", "lexicon_version": service.analyzer.lexicon.version},
+            )
+        elif self.path == "/stats":
+            self._send_json(200, service.stats())
+        elif self.path == "/metrics":
+            body = service.analyzer.metrics.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"error": f"Ruta no encontrada: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/analyze":
+            self._send_json(404, {"error": f"Ruta no encontrada: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            data = json.loads(self.rfile.read(length) or b"null")
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {"error": f"JSON inválido: {e}"})
+            return
+        if not isinstance(data, dict):
+            self._send_json(400, {"error": "Se esperaba un objeto JSON con 'posts'"})
+            return
+
+        try:
+            self._send_json(200, self.server.service.analyze(data))
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        # Sin log por solicitud: las métricas están en /stats
+        pass
+
+
+class AnalysisHTTPServer(ThreadingHTTPServer):
+    """Servidor HTTP con un hilo por conexión que delega en un MicroBatchService"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: MicroBatchService):
+        super().__init__(address, _AnalysisHandler)
+        self.service = service
+
+
+def create_server(
+    host: str = SERVICE_HOST,
+    port: int = SERVICE_PORT,
+    service: Optional[MicroBatchService] = None,
+) -> AnalysisHTTPServer:
+    """Crea el servidor (port=0 elige un puerto libre) con su servicio ya iniciado"""
+    service = (service or MicroBatchService()).start()
+    return AnalysisHTTPServer((host, port), service)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Servicio HTTP local de análisis Big Five"
+    )
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--max-batch-size", type=int, default=SERVICE_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=SERVICE_MAX_WAIT_MS)
+    args = parser.parse_args(argv)
+
+    server = create_server(
+        args.host,
+        args.port,
+        MicroBatchService(
+            max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms
+        ),
+    )
+    host, port = server.server_address[:2]
+    print(f"🚀 Servicio de análisis en http://{host}:{port} (Ctrl-C para detener)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Deteniendo servicio")
+    finally:
+        server.server_close()
+        server.service.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# src/shared_corpus.py
+"""
+Textos de un corpus en memoria compartida para los workers del pool de procesos.
+
+El proceso principal solo codifica los textos en UTF-8 y coloca los bytes,
+concatenados, en un bloque de ``multiprocessing.shared_memory`` junto con
+los offsets en bytes de cada post (y, si se da, el índice de post de cada
+texto, para no separar los fragmentos de un post largo). El corpus no pasa
+por el pipe del pool: cada worker se adjunta a los bloques y decodifica su
+rango de posts directamente desde la memoria compartida (el único texto
+que copia es el ``str`` de cada post). Ahí hace todo el trabajo por texto
+(tokenización, léxicos, sentimiento, MATTR y palabras únicas) y devuelve
+conteos parciales combinables.
+"""
+
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .posts import post_slices
+
+
+class SharedTextCorpus:
+    """Propietario de los bloques de memoria compartida de un corpus de textos.
+
+    Debe usarse como context manager: al salir (incluso por error o
+    KeyboardInterrupt) los bloques se cierran y se liberan.
+    """
+
+    def __init__(self, texts: List[str], text_index: Optional[np.ndarray] = None):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.spec: Dict[str, Tuple[str, str, Tuple[int, ...]]] = {}
+
+        encoded = [text.encode("utf-8") for text in texts]
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        self.n_posts = len(texts)
+        self.text_index = text_index
+
+        try:
+            self._share("text", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+            self._share("offsets", offsets)
+            if text_index is not None:
+                self._share("text_index", np.asarray(text_index, dtype=np.int64))
+        except BaseException:
+            self.close()
+            raise
+
+    def _share(self, name: str, array: np.ndarray):
+        """Copia un arreglo a un bloque nuevo de memoria compartida"""
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._blocks.append(block)
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        view[...] = array
+        self.spec[name] = (block.name, array.dtype.str, array.shape)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def slices(self, chunk_size: int) -> List[Tuple[int, int]]:
+        """Rangos de posts [inicio, fin) asignados a cada worker"""
+        return post_slices(self.text_index, self.n_posts, chunk_size)
+
+    def close(self):
+        """Cierra y libera todos los bloques (idempotente)"""
+        while self._blocks:
+            block = self._blocks.pop()
+            try:
+                block.close()
+            finally:
+                try:
+                    block.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def _attach(spec: Dict) -> Tuple[Dict[str, np.ndarray], List]:
+    """Adjunta los bloques descritos en spec sin copiar los datos"""
+    arrays = {}
+    blocks = []
+    try:
+        for name, (block_name, dtype, shape) in spec.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    except BaseException:
+        for block in blocks:
+            block.close()
+        raise
+    return arrays, blocks
+
+
+def shared_texts(spec: Dict, start: int, end: int) -> List[str]:
+    """Textos de los posts [start, end) de un corpus compartido (en los workers)"""
+    return shared_posts(spec, start, end)[0]
+
+
+def shared_posts(
+    spec: Dict, start: int, end: int
+) -> Tuple[List[str], Optional[np.ndarray]]:
+    """Textos de los posts [start, end) y su índice de post (None si el corpus
+    no lo tiene)"""
+    arrays, blocks = _attach(spec)
+    data = None
+    try:
+        offsets = arrays["offsets"][start : end + 1].tolist()
+        # Cada texto se decodifica desde la vista del bloque, sin copiar sus bytes
+        data = memoryview(arrays["text"])
+        texts = [str(data[a:b], "utf-8") for a, b in zip(offsets[:-1], offsets[1:])]
+        text_index = None
+        if "text_index" in arrays:
+            text_index = arrays["text_index"][start:end].copy()
+    finally:
+        if data is not None:
+            data.release()
+        arrays.clear()
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                # Aún hay vistas vivas (p. ej. en un traceback); el SO libera
+                # el mapeo al terminar el proceso
+                pass
+    return texts, text_index
@@ -0,0 +1,502 @@
+# src/sketches.py
+"""
+Estructuras probabilísticas (sketches) para resumir grandes volúmenes de
+resultados con memoria acotada. Todas son combinables (merge) y
+serializables a diccionarios JSON, de modo que pueden calcularse en
+distintos procesos o ejecuciones y unirse después.
+
+- ``KLLSketch``: cuantiles aproximados.
+- ``HyperLogLog``: número aproximado de elementos distintos.
+- ``SpaceSaving``: elementos más frecuentes con cotas de error garantizadas.
+"""
+
+import base64
+import hashlib
+import heapq
+import math
+import random
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+
+class KLLSketch:
+    """Sketch de cuantiles KLL (Karnin-Lang-Liberty) combinable y serializable.
+
+    Mantiene una jerarquía de compactadores: cada elemento del nivel ``h``
+    representa ``2**h`` observaciones. La memoria crece como O(k) y el
+    error de rango normalizado es aproximadamente ``1.7 / k``.
+    """
+
+    def __init__(self, k: int = 200, c: float = 2 / 3, seed: Optional[int] = None):
+        if k < 8:
+            raise ValueError("k debe ser al menos 8")
+        if not 0.5 <= c < 1:
+            raise ValueError("c debe estar en el rango [0.5, 1)")
+
+        self.k = k
+        self.c = c
+        self.count = 0
+        self.min_value: Optional[float] = None
+        self.max_value: Optional[float] = None
+        self.levels: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+
+    # ========== ACTUALIZACIÓN ==========
+
+    def update(self, value: float):
+        """Añade una observación al sketch"""
+        value = float(value)
+        if math.isnan(value):
+            return
+
+        self.count += 1
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+
+        self.levels[0].append(value)
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def update_many(self, values: Iterable[float]):
+        """Añade varias observaciones al sketch"""
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Combina otro sketch en este (in-place) y lo devuelve"""
+        if other.k != self.k:
+            raise ValueError("Solo se pueden combinar sketches con el mismo k")
+        if other.count == 0:
+            return self
+
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+
+        self.count += other.count
+        if self.min_value is None or other.min_value < self.min_value:
+            self.min_value = other.min_value
+        if self.max_value is None or other.max_value > self.max_value:
+            self.max_value = other.max_value
+
+        self._compress()
+        return self
+
+    def _capacity(self, level: int) -> int:
+        """Capacidad del compactador en un nivel (los niveles altos guardan más)"""
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * self.c**depth)), 2)
+
+    def _compress(self):
+        """Compacta los niveles que exceden su capacidad"""
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+
+                items.sort()
+                # Si el número es impar, un elemento se queda en este nivel
+                leftover = [items.pop()] if len(items) % 2 else []
+                offset = self._rng.randint(0, 1)
+                self.levels[level + 1].extend(items[offset::2])
+                self.levels[level] = leftover
+            level += 1
+
+    # ========== CONSULTAS ==========
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def retained(self) -> int:
+        """Número de valores almacenados realmente en memoria"""
+        return sum(len(items) for items in self.levels)
+
+    @property
+    def normalized_rank_error(self) -> float:
+        """Error de rango normalizado aproximado (cota con ~99% de confianza)"""
+        return 1.7 / self.k
+
+    def _weighted_items(self) -> Tuple[List[float], List[int]]:
+        """Devuelve valores ordenados y sus pesos acumulados"""
+        pairs = sorted(
+            (value, 1 << level)
+            for level, items in enumerate(self.levels)
+            for value in items
+        )
+        values = [value for value, _ in pairs]
+        cumulative = []
+        total = 0
+        for _, weight in pairs:
+            total += weight
+            cumulative.append(total)
+        return values, cumulative
+
+    def quantile(self, q: float) -> float:
+        """Devuelve el valor aproximado del cuantil q (0-1)"""
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q debe estar en el rango [0, 1]")
+        if self.count == 0:
+            return float("nan")
+        if q == 0.0:
+            return self.min_value
+        if q == 1.0:
+            return self.max_value
+
+        values, cumulative = self._weighted_items()
+        target = q * cumulative[-1]
+        for value, cum_weight in zip(values, cumulative):
+            if cum_weight >= target:
+                return value
+        return self.max_value
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Devuelve varios cuantiles a la vez"""
+        return [self.quantile(q) for q in qs]
+
+    def percentile(self, p: float) -> float:
+        """Atajo para cuantiles expresados en porcentaje (0-100)"""
+        return self.quantile(p / 100)
+
+    def rank(self, value: float) -> float:
+        """Fracción aproximada de observaciones menores o iguales a value"""
+        if self.count == 0:
+            return 0.0
+        values, cumulative = self._weighted_items()
+        below = 0
+        for item, cum_weight in zip(values, cumulative):
+            if item > value:
+                break
+            below = cum_weight
+        return below / cumulative[-1]
+
+    # ========== SERIALIZACIÓN ==========
+
+    def to_dict(self) -> Dict:
+        """Serializa el sketch a un diccionario compatible con JSON"""
+        return {
+            "type": "kll",
+            "k": self.k,
+            "c": self.c,
+            "count": self.count,
+            "min": self.min_value,
+            "max": self.max_value,
+            "levels": [list(items) for items in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, seed: Optional[int] = None) -> "KLLSketch":
+        """Reconstruye un sketch serializado con to_dict"""
+        if data.get("type") != "kll":
+            raise ValueError("El diccionario no corresponde a un sketch KLL")
+
+        sketch = cls(k=data["k"], c=data["c"], seed=seed)
+        sketch.count = data["count"]
+        sketch.min_value = data["min"]
+        sketch.max_value = data["max"]
+        sketch.levels = [list(items) for items in data["levels"]] or [[]]
+        return sketch
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Número de bits significativos de cada entero sin signo de 64 bits"""
+    values = values.copy()
+    lengths = np.zeros(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = values >= (np.uint64(1) << np.uint64(shift))
+        lengths[mask] += shift
+        values[mask] >>= np.uint64(shift)
+    lengths += (values > 0).astype(np.uint8)
+    return lengths
+
+
+def _hll_sigma(x: float) -> float:
+    if x == 1.0:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _hll_tau(x: float) -> float:
+    if x == 0.0 or x == 1.0:
+        return 0.0
+    y, z = 1.0, 1.0 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+class HyperLogLog:
+    """Contador aproximado de elementos distintos (HyperLogLog) combinable.
+
+    Usa ``2**precision`` registros de un byte y un hash estable de 64 bits
+    (blake2b), así los sketches de distintos procesos o ejecuciones se
+    combinan tomando el máximo por registro. El error relativo típico es
+    ``1.04 / sqrt(2**precision)`` (0.81% con la precisión 14 por defecto).
+
+    Los elementos se acumulan en un buffer sin repetidos que se vuelca a
+    los registros cada ``buffer_size`` elementos, de modo que la memoria
+    queda acotada y el hash se calcula por lotes.
+    """
+
+    def __init__(self, precision: int = 14, buffer_size: int = 1 << 16):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision debe estar entre 4 y 18")
+
+        self.precision = precision
+        self.buffer_size = max(buffer_size, 1)
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+        self._pending = set()
+
+    # ========== ACTUALIZACIÓN ==========
+
+    def add(self, item: str):
+        """Añade un elemento"""
+        self._pending.add(item)
+        if len(self._pending) >= self.buffer_size:
+            self.flush()
+
+    def update(self, items: Iterable[str]):
+        """Añade varios elementos (misma interfaz que set.update)"""
+        self._pending.update(items)
+        if len(self._pending) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Vuelca el buffer de elementos pendientes a los registros"""
+        if not self._pending:
+            return
+        digests = b"".join(
+            hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest()
+            for item in self._pending
+        )
+        self._pending = set()
+        hashes = np.frombuffer(digests, dtype="<u8")
+
+        # Los primeros bits eligen el registro; el resto, la racha de ceros
+        shift = np.uint64(64 - self.precision)
+        index = (hashes >> shift).astype(np.int64)
+        remainder = hashes << np.uint64(self.precision)
+        ranks = np.minimum(65 - _bit_length(remainder).astype(np.int64), int(shift) + 1)
+        np.maximum.at(self.registers, index, ranks.astype(np.uint8))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Combina otro sketch en este (in-place) y lo devuelve"""
+        if other.precision != self.precision:
+            raise ValueError("Solo se pueden combinar sketches con la misma precisión")
+        other.flush()
+        self.flush()
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def __ior__(self, other: "HyperLogLog") -> "HyperLogLog":
+        return self.merge(other)
+
+    # ========== CONSULTAS ==========
+
+    @property
+    def relative_error(self) -> float:
+        """Error relativo típico (una desviación estándar) de la estimación"""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def estimate(self) -> float:
+        """Número estimado de elementos distintos.
+
+        Usa el estimador mejorado de Ertl (2017), sin sesgo en la
+        transición entre rango pequeño y grande ni tablas de corrección.
+        """
+        self.flush()
+        m = len(self.registers)
+        q = 64 - self.precision
+        counts = np.bincount(self.registers, minlength=q + 2)
+
+        z = m * _hll_tau(1 - counts[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + counts[k])
+        z += m * _hll_sigma(counts[0] / m)
+        return m * m / (2 * math.log(2) * z)
+
+    def __len__(self) -> int:
+        return int(round(self.estimate()))
+
+    # ========== SERIALIZACIÓN ==========
+
+    def to_dict(self) -> Dict:
+        """Serializa el sketch a un diccionario compatible con JSON"""
+        self.flush()
+        return {
+            "type": "hyperloglog",
+            "precision": self.precision,
+            "registers": base64.b64encode(self.registers.tobytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "HyperLogLog":
+        """Reconstruye un sketch serializado con to_dict"""
+        if data.get("type") != "hyperloglog":
+            raise ValueError("El diccionario no corresponde a un sketch HyperLogLog")
+
+        sketch = cls(precision=data["precision"])
+        registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8)
+        if len(registers) != len(sketch.registers):
+            raise ValueError("El número de registros no coincide con la precisión")
+        sketch.registers = registers.copy()
+        return sketch
+
+
+class SpaceSaving:
+    """Elementos más frecuentes (heavy hitters) con memoria fija: Space-Saving.
+
+    Mantiene como máximo ``capacity`` contadores. Cada conteo reportado es
+    una cota superior: la frecuencia real está en ``[count - error, count]``.
+    Un elemento sin contador aparece a lo sumo ``floor`` veces, y
+    ``floor <= total / capacity`` para un sketch actualizado elemento a
+    elemento. Los sketches se combinan sumando las estimaciones (los
+    elementos ausentes en un sketch lleno cuentan con su ``floor``).
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("capacity debe ser al menos 1")
+
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.total = 0
+        # Cota de la frecuencia de cualquier elemento sin contador
+        self.floor = 0
+
+    # ========== ACTUALIZACIÓN ==========
+
+    def update(self, item: str, count: int = 1):
+        """Añade count apariciones de un elemento"""
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            # Reemplaza al mínimo: el nuevo hereda su conteo como error
+            evicted = min(self.counts, key=self.counts.get)
+            minimum = self.counts.pop(evicted)
+            del self.errors[evicted]
+            self.floor = max(self.floor, minimum)
+            self.counts[item] = minimum + count
+            self.errors[item] = minimum
+
+    def update_counts(
+        self, counts: Union[Mapping[str, int], Iterable[Tuple[str, int]]]
+    ):
+        """Añade conteos exactos de un bloque (p. ej. las frecuencias de un chunk).
+
+        ``counts`` es un diccionario o un iterable de pares (elemento, conteo)
+        sin repetidos; se recorre una vez guardando solo los ``capacity``
+        mayores, así la memoria no crece con el número de elementos.
+        """
+        pairs = counts.items() if isinstance(counts, Mapping) else counts
+        total = 0
+
+        def counted():
+            nonlocal total
+            for item, count in pairs:
+                total += count
+                yield item, count
+
+        # El siguiente al último conservado acota a todos los descartados
+        ranked = heapq.nsmallest(
+            self.capacity + 1, counted(), key=lambda pair: (-pair[1], pair[0])
+        )
+        exact = SpaceSaving(self.capacity)
+        exact.counts = dict(ranked[: self.capacity])
+        exact.errors = dict.fromkeys(exact.counts, 0)
+        exact.total = total
+        if len(ranked) > self.capacity:
+            exact.floor = ranked[-1][1]
+        self.merge(exact)
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Combina otro sketch en este (in-place) y lo devuelve"""
+        items = self.counts.keys() | other.counts.keys()
+        counts = {
+            item: self.counts.get(item, self.floor)
+            + other.counts.get(item, other.floor)
+            for item in items
+        }
+        errors = {
+            item: self.errors.get(item, self.floor)
+            + other.errors.get(item, other.floor)
+            for item in items
+        }
+        self.total += other.total
+        self.floor += other.floor
+
+        if len(counts) > self.capacity:
+            ranked = sorted(counts, key=lambda item: (-counts[item], item))
+            dropped = ranked[self.capacity :]
+            self.floor = max(self.floor, counts[dropped[0]])
+            for item in dropped:
+                del counts[item]
+                del errors[item]
+
+        self.counts = counts
+        self.errors = errors
+        return self
+
+    def __ior__(self, other: "SpaceSaving") -> "SpaceSaving":
+        return self.merge(other)
+
+    # ========== CONSULTAS ==========
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def top(self, n: int) -> List[Tuple[str, int, int]]:
+        """Los n elementos con mayor conteo: (elemento, conteo, error máximo)"""
+        ranked = sorted(self.counts, key=lambda item: (-self.counts[item], item))
+        return [(item, self.counts[item], self.errors[item]) for item in ranked[:n]]
+
+    # ========== SERIALIZACIÓN ==========
+
+    def to_dict(self) -> Dict:
+        """Serializa el sketch a un diccionario compatible con JSON"""
+        return {
+            "type": "space_saving",
+            "capacity": self.capacity,
+            "total": self.total,
+            "floor": self.floor,
+            "items": [
+                [item, count, self.errors[item]]
+                for item, count, _ in self.top(len(self))
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SpaceSaving":
+        """Reconstruye un sketch serializado con to_dict"""
+        if data.get("type") != "space_saving":
+            raise ValueError("El diccionario no corresponde a un sketch Space-Saving")
+
+        sketch = cls(capacity=data["capacity"])
+        sketch.total = data["total"]
+        sketch.floor = data["floor"]
+        for item, count, error in data["items"]:
+            sketch.counts[item] = count
+            sketch.errors[item] = error
+        return sketch
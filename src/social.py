@@ -0,0 +1,119 @@
+# src/social.py
+"""
+Señales sociales de los posts: emoji, hashtags, menciones y URLs.
+
+``scan_text`` recorre el texto una sola vez con una expresión regular
+que clasifica cada coincidencia. Devuelve los tokens de palabra (como
+``\\b\\w+\\b``, pero sin los fragmentos de URLs ni los nombres de usuario
+de las menciones; el texto de un hashtag sí cuenta como palabra) y los
+conteos de cada señal. La polaridad de los emoji sale de una tabla
+compacta de rangos de codepoints.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+SOCIAL_PATTERN = re.compile(
+    r"(?P<url>(?:https?://|www\.)\S+)"
+    r"|(?<!\w)(?P<mention>@\w+)"
+    r"|(?<!\w)#(?P<hashtag>\w+)"
+    r"|(?P<emoji>[\u2600-\u27bf\U0001f1e6-\U0001f1ff\U0001f300-\U0001faff])"
+    r"|(?P<word>\b\w+\b)"
+)
+
+# Señales por post (emoji + hashtags + menciones) que saturan el componente
+SIGNALS_PER_POST_SATURATION = 3.0
+
+SIGNALS = ("emoji", "emoji_positive", "emoji_negative", "hashtags", "mentions", "urls")
+
+# Rangos [inicio, fin] de codepoints con polaridad (1 positiva, -1 negativa),
+# ordenados por inicio; el resto de los emoji son neutros
+EMOJI_POLARITY_RANGES = (
+    (0x2639, 0x2639, -1),  # ☹
+    (0x263A, 0x263A, 1),  # ☺
+    (0x2764, 0x2764, 1),  # ❤
+    (0x1F389, 0x1F38A, 1),  # 🎉 🎊
+    (0x1F44D, 0x1F44D, 1),  # 👍
+    (0x1F44E, 0x1F44E, -1),  # 👎
+    (0x1F44F, 0x1F44F, 1),  # 👏
+    (0x1F493, 0x1F493, 1),  # 💓
+    (0x1F494, 0x1F494, -1),  # 💔
+    (0x1F495, 0x1F49F, 1),  # 💕 ... 💟
+    (0x1F600, 0x1F60E, 1),  # 😀 ... 😎
+    (0x1F612, 0x1F616, -1),  # 😒 ... 😖
+    (0x1F617, 0x1F61D, 1),  # 😗 ... 😝
+    (0x1F61E, 0x1F62B, -1),  # 😞 ... 😫
+    (0x1F62D, 0x1F62D, -1),  # 😭
+    (0x1F630, 0x1F631, -1),  # 😰 😱
+    (0x1F641, 0x1F641, -1),  # 🙁
+    (0x1F642, 0x1F642, 1),  # 🙂
+    (0x1F64C, 0x1F64C, 1),  # 🙌
+    (0x1F917, 0x1F917, 1),  # 🤗
+    (0x1F923, 0x1F923, 1),  # 🤣
+    (0x1F929, 0x1F929, 1),  # 🤩
+    (0x1F92C, 0x1F92C, -1),  # 🤬
+    (0x1F970, 0x1F970, 1),  # 🥰
+    (0x1F973, 0x1F973, 1),  # 🥳
+    (0x1F97A, 0x1F97A, -1),  # 🥺
+)
+
+_RANGE_STARTS = [start for start, _, _ in EMOJI_POLARITY_RANGES]
+
+
+def emoji_polarity(emoji: str) -> int:
+    """Polaridad de un emoji (1, -1 o 0 si es neutro o desconocido)"""
+    codepoint = ord(emoji)
+    i = bisect_right(_RANGE_STARTS, codepoint) - 1
+    if i >= 0 and codepoint <= EMOJI_POLARITY_RANGES[i][1]:
+        return EMOJI_POLARITY_RANGES[i][2]
+    return 0
+
+
+def empty_signals() -> Dict[str, int]:
+    return {signal: 0 for signal in SIGNALS}
+
+
+def scan_text(text: str) -> Tuple[List[str], Dict[str, int]]:
+    """Tokens de palabra (sin URLs ni menciones) y conteos de señales del texto"""
+    tokens: List[str] = []
+    signals = empty_signals()
+    for match in SOCIAL_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == "word":
+            tokens.append(match.group())
+        elif kind == "hashtag":
+            signals["hashtags"] += 1
+            tokens.append(match.group(kind))
+        elif kind == "emoji":
+            signals["emoji"] += 1
+            polarity = emoji_polarity(match.group())
+            if polarity > 0:
+                signals["emoji_positive"] += 1
+            elif polarity < 0:
+                signals["emoji_negative"] += 1
+        elif kind == "mention":
+            signals["mentions"] += 1
+        else:
+            signals["urls"] += 1
+    return tokens, signals
+
+
+def add_signals(total: Dict[str, int], signals: Dict[str, int]) -> Dict[str, int]:
+    """Suma los conteos de signals en total (in-place)"""
+    for signal, count in signals.items():
+        total[signal] = total.get(signal, 0) + count
+    return total
+
+
+def social_activity(signals: Dict[str, int], n_posts: int) -> float:
+    """Componente de extraversión: emoji, hashtags y menciones por post (0-1).
+
+    Los conteos y ``n_posts`` también pueden ser arreglos (uno por ventana).
+    """
+    per_post = (signals["emoji"] + signals["hashtags"] + signals["mentions"]) / (
+        np.maximum(n_posts, 1)
+    )
+    return np.minimum(per_post / SIGNALS_PER_POST_SATURATION, 1.0)
@@ -0,0 +1,276 @@
+# src/timeseries.py
+"""
+Puntuación Big Five por ventanas de tiempo.
+
+Los posts se ordenan por ``timestamp`` y sus conteos por post (tokens,
+aciertos de léxico por rasgo, sentimiento, reacciones, comentarios y, si
+el analizador las usa, señales sociales) se guardan como sumas prefijas.
+Así los componentes aditivos de cualquier rango de tiempo se obtienen en
+O(1), y una serie temporal completa con operaciones vectorizadas de NumPy.
+
+Las palabras distintas (diversidad léxica) no son aditivas: cada ventana
+las cuenta recorriendo sus tokens, con coste lineal en el tamaño de la
+ventana.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .features import tokenize_cased
+from .personality import BigFiveAnalyzer
+from .posts import PostBatch
+from .social import scan_text, social_activity
+from .weights import (
+    COMPONENT_KEYS,
+    TRAITS,
+    evaluate_weight_grid,
+    trait_components,
+    weight_matrix,
+)
+
+DAY_SECONDS = 86400.0
+
+
+class TraitTimeIndex:
+    """Índice temporal de características por post basado en sumas prefijas.
+
+    Solo se indexan los posts con ``timestamp`` válido. Si todos los posts
+    lo tienen, puntuar el rango completo reproduce exactamente
+    ``BigFiveAnalyzer.calculate_big_five_scores``.
+    """
+
+    def __init__(self, data: Dict, analyzer: Optional[BigFiveAnalyzer] = None):
+        self.analyzer = analyzer or BigFiveAnalyzer()
+        if not isinstance(data, dict):
+            data = {}
+
+        # Campos constantes del dataset (no dependen de la ventana)
+        friends_count = data.get("friends_count", 0)
+        if not isinstance(friends_count, (int, float)):
+            friends_count = 0
+        groups = data.get("groups", [])
+        if not isinstance(groups, list):
+            groups = []
+        basic_info = data.get("basic_info", {})
+        bio_text = basic_info.get("bio", "") if isinstance(basic_info, dict) else ""
+        if not isinstance(bio_text, str):
+            bio_text = ""
+
+        self.friends_count = friends_count
+        self.groups = len(groups)
+        self.bio_complete = bool(bio_text and len(bio_text.strip()) > 20)
+
+        batch = PostBatch.from_posts(
+            data.get("posts", []),
+            timestamps=True,
+            max_chars=self.analyzer.max_post_chars,
+            overflow=self.analyzer.post_overflow,
+        )
+        timed = np.flatnonzero(~np.isnan(batch.timestamps))
+        order = timed[np.argsort(batch.timestamps[timed], kind="stable")]
+        batch = batch.take(order)
+
+        self.timestamps = batch.timestamps
+        self._build_prefix_sums(batch)
+
+    def _build_prefix_sums(self, batch: PostBatch):
+        """Calcula los conteos por post del lote y acumula sus prefijos"""
+        n = len(batch)
+        social_signals = self.analyzer.social_signals
+        lexicon, sentiment_analyzer = self.analyzer.lexicon_snapshot()
+        self.lexicon_version = lexicon.version
+        lexicons = {
+            trait: {w.lower() for w in words} for trait, words in lexicon.traits.items()
+        }
+
+        counts = {
+            name: np.zeros(n, dtype=np.float64)
+            for name in (
+                "posts_text",
+                "words_lower",
+                "words",
+                "analyzed",
+                "positive",
+                "negative",
+                "reactions",
+                "comments",
+                "emoji",
+                "hashtags",
+                "mentions",
+            )
+        }
+        hits = {trait: np.zeros(n, dtype=np.float64) for trait in TRAITS}
+
+        vocabulary: Dict[str, int] = {}
+        token_ids = []
+        self.token_offsets = np.zeros(n + 1, dtype=np.int64)
+
+        counts["reactions"][:] = batch.reactions
+        counts["comments"][:] = batch.comments
+        counts["posts_text"][batch.text_index] = 1
+
+        for j, text in enumerate(batch.post_texts()):
+            if text is not None:
+                if social_signals:
+                    # Mismos tokens que el analizador: sin URLs ni menciones
+                    words, signals = scan_text(text)
+                    lower_words = [w.lower() for w in words]
+                    for signal in ("emoji", "hashtags", "mentions"):
+                        counts[signal][j] = signals[signal]
+                else:
+                    (words, lower_words), signals = tokenize_cased(text), None
+                counts["words_lower"][j] = len(lower_words)
+                for trait in TRAITS:
+                    word_set = lexicons[trait]
+                    hits[trait][j] = sum(1 for w in lower_words if w in word_set)
+
+                # La diversidad léxica usa los tokens sin pasar a minúsculas
+                counts["words"][j] = len(words)
+                token_ids.extend(
+                    vocabulary.setdefault(w, len(vocabulary)) for w in words
+                )
+
+                sentiment = None
+                if signals is not None:
+                    # Un post corto con emoji también expresa sentimiento
+                    if len(text.strip()) >= 5 or signals["emoji"]:
+                        sentiment = sentiment_analyzer.analyze_tokens(
+                            lower_words,
+                            signals["emoji_positive"],
+                            signals["emoji_negative"],
+                        )
+                elif len(text.strip()) >= 5:
+                    # Mismos tokens que analyze_sentiment(text)
+                    sentiment = sentiment_analyzer.analyze_tokens(lower_words)
+                if sentiment is not None:
+                    counts["analyzed"][j] = 1
+                    if sentiment["polarity"] > 0.2:
+                        counts["positive"][j] = 1
+                    elif sentiment["polarity"] < -0.2:
+                        counts["negative"][j] = 1
+
+            self.token_offsets[j + 1] = len(token_ids)
+
+        self.prefix = {
+            name: np.concatenate(([0.0], np.cumsum(values)))
+            for name, values in counts.items()
+        }
+        self.hit_prefix = {
+            trait: np.concatenate(([0.0], np.cumsum(values)))
+            for trait, values in hits.items()
+        }
+
+        # Posición de la aparición anterior de cada token (-1 si es la primera).
+        # Las palabras distintas en [a, b) son las posiciones con prev < a.
+        ids = np.array(token_ids, dtype=np.int64)
+        order = np.argsort(ids, kind="stable")
+        self.previous_occurrence = np.full(len(ids), -1, dtype=np.int64)
+        if len(ids) > 1:
+            same = ids[order[1:]] == ids[order[:-1]]
+            self.previous_occurrence[order[1:][same]] = order[:-1][same]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _distinct_words(self, token_start: np.ndarray, token_end: np.ndarray):
+        """Cuenta palabras distintas por ventana.
+
+        No hay suma prefija para este conteo: cada ventana recorre sus
+        tokens, así que el coste es O(tokens de la ventana) y no O(1).
+        """
+        distinct = np.zeros(len(token_start), dtype=np.float64)
+        for w, (a, b) in enumerate(zip(token_start, token_end)):
+            if b > a:
+                distinct[w] = np.count_nonzero(self.previous_occurrence[a:b] < a)
+        return distinct
+
+    def score_windows(
+        self, starts: Sequence[float], ends: Sequence[float]
+    ) -> Dict[str, np.ndarray]:
+        """Puntúa varias ventanas [inicio, fin) en una sola pasada vectorizada.
+
+        Todo es O(1) por ventana salvo la diversidad léxica, lineal en los
+        tokens de cada ventana (ver ``_distinct_words``).
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        lo = np.searchsorted(self.timestamps, starts, side="left")
+        hi = np.searchsorted(self.timestamps, ends, side="left")
+        hi = np.maximum(hi, lo)
+
+        s = {name: prefix[hi] - prefix[lo] for name, prefix in self.prefix.items()}
+        words_lower = s["words_lower"]
+        safe_words = np.where(words_lower > 0, words_lower, 1)
+
+        def frequency(trait):
+            hits = self.hit_prefix[trait][hi] - self.hit_prefix[trait][lo]
+            return np.where(words_lower > 0, hits / safe_words, 0.0)
+
+        posts_text = s["posts_text"]
+        distinct = self._distinct_words(self.token_offsets[lo], self.token_offsets[hi])
+        lexical_diversity = np.where(
+            s["words"] > 0, distinct / np.where(s["words"] > 0, s["words"], 1), 0.0
+        )
+
+        components = trait_components(
+            posts=posts_text,
+            reactions=s["reactions"],
+            comments=s["comments"],
+            positive=s["positive"],
+            negative=s["negative"],
+            analyzed=s["analyzed"],
+            word_frequencies={trait: frequency(trait) for trait in TRAITS},
+            lexical_diversity=lexical_diversity,
+            social_signals=(
+                social_activity(s, posts_text) if self.analyzer.social_signals else 0.0
+            ),
+            friends_count=self.friends_count,
+            groups=self.groups,
+            bio_complete=self.bio_complete,
+        )
+        features = np.column_stack(
+            [
+                np.broadcast_to(components[trait][component], (len(starts),))
+                for trait, component in COMPONENT_KEYS
+            ]
+        ).reshape(len(starts), len(COMPONENT_KEYS))
+        scores = evaluate_weight_grid(
+            features, weight_matrix(self.analyzer.trait_weights)
+        )
+
+        # Sin textos en la ventana se usan los scores por defecto (0.5)
+        result = {
+            trait: np.where(posts_text > 0, scores[:, t], 0.5)
+            for t, trait in enumerate(TRAITS)
+        }
+        result["components"] = features
+        result["start"] = starts
+        result["end"] = ends
+        result["posts"] = posts_text.astype(np.int64)
+        result["words"] = s["words"].astype(np.int64)
+        return result
+
+    def score_range(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Dict[str, float]:
+        """Puntúa un único rango de tiempo [inicio, fin)"""
+        if start is None:
+            start = -np.inf
+        if end is None:
+            end = np.inf
+        windows = self.score_windows([start], [end])
+        return {trait: float(windows[trait][0]) for trait in TRAITS}
+
+    def rolling(
+        self, window: float = 30 * DAY_SECONDS, step: float = DAY_SECONDS
+    ) -> Dict[str, np.ndarray]:
+        """Serie temporal de rasgos con ventanas móviles [t, t + window)"""
+        if window <= 0 or step <= 0:
+            raise ValueError("window y step deben ser positivos")
+        if len(self.timestamps) == 0:
+            return self.score_windows([], [])
+
+        first, last = self.timestamps[0], self.timestamps[-1]
+        starts = first + step * np.arange(int((last - first) // step) + 1)
+        return self.score_windows(starts, starts + window)
@@ -0,0 +1,243 @@
+# src/tracing.py
+"""
+Trazas de ejecución en formato Chrome Trace Event (visibles en Perfetto o
+``chrome://tracing``).
+
+``span(name)`` es un context manager (y ``traced()`` un decorador) que
+registra un evento completo (``"ph": "X"``) con su proceso, hilo, inicio y
+duración; los spans anidados se ven anidados en el visor. El tracer global
+``TRACER`` se activa con ``TRACE_ENABLED`` o al definir ``TRACE_FILE``;
+desactivado, ``span`` retorna un context manager vacío.
+
+Los procesos hijos (pools del analizador y del orquestador asíncrono)
+ejecutan su trabajo con ``run_traced``, que devuelve los eventos del
+worker junto con el resultado; el proceso principal los agrega con
+``merge()`` y todo queda en una sola línea de tiempo. Los tiempos usan el
+reloj de pared en microsegundos, común a todos los procesos.
+"""
+
+import functools
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from config import TRACE_ENABLED, TRACE_FILE
+
+# Desfase entre perf_counter y el reloj de pared, fijado al importar el módulo
+_CLOCK_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+
+def _now_us() -> float:
+    """Microsegundos desde epoch con la resolución de perf_counter"""
+    return (time.perf_counter_ns() + _CLOCK_OFFSET_NS) / 1000
+
+
+class _NullSpan:
+    """Context manager sin efecto para un tracer desactivado"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Span en curso; al salir registra el evento completo"""
+
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end = _now_us()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(
+            self.name, self.cat, self.start, end - self.start, self.args
+        )
+        return False
+
+
+class Tracer:
+    """Colector de spans de un proceso, seguro entre hilos"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._events: List[Dict] = []
+        self._named_threads = set()
+        self._lock = threading.Lock()
+
+    # ========== REGISTRO ==========
+
+    def span(self, name: str, cat: str = "analysis", **args):
+        """Context manager que registra la duración del bloque"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def traced(self, name: Optional[str] = None, cat: str = "analysis"):
+        """Decorador que envuelve cada llamada a la función en un span"""
+
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, span_name, cat, {}):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def _record(self, name: str, cat: str, start: float, duration: float, args: Dict):
+        pid = os.getpid()
+        tid = threading.get_native_id()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round(start, 3),
+            "dur": round(duration, 3),
+            "pid": pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = {key: _jsonable(value) for key, value in args.items()}
+        with self._lock:
+            if (pid, tid) not in self._named_threads:
+                # Metadatos para que el visor muestre el nombre de proceso e hilo
+                self._named_threads.add((pid, tid))
+                self._events.append(_metadata("thread_name", pid, tid, _thread_name()))
+                if tid == pid:
+                    self._events.append(
+                        _metadata("process_name", pid, tid, _process_name())
+                    )
+            self._events.append(event)
+
+    # ========== COMBINACIÓN ENTRE PROCESOS ==========
+
+    def events(self) -> List[Dict]:
+        """Copia de los eventos registrados"""
+        with self._lock:
+            return list(self._events)
+
+    def reset(self):
+        """Descarta los eventos registrados"""
+        with self._lock:
+            self._events.clear()
+            self._named_threads.clear()
+
+    def _after_fork(self):
+        # El lock pudo quedar tomado por otro hilo del padre: se reemplaza
+        self._lock = threading.Lock()
+        self._events = []
+        self._named_threads = set()
+
+    def drain(self) -> List[Dict]:
+        """Devuelve los eventos y vacía el buffer (eventos de un worker)"""
+        with self._lock:
+            events = self._events
+            self._events = []
+            self._named_threads.clear()
+            return events
+
+    def merge(self, events: List[Dict]) -> "Tracer":
+        """Agrega los eventos de otro proceso a la línea de tiempo"""
+        if self.enabled and events:
+            with self._lock:
+                self._events.extend(events)
+        return self
+
+    # ========== EXPORTACIÓN ==========
+
+    def to_dict(self) -> Dict:
+        """Documento Chrome Trace Event (eventos ordenados por inicio)"""
+        events = sorted(self.events(), key=lambda e: (e["ph"] != "M", e.get("ts", 0)))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Union[str, Path]) -> Path:
+        """Escribe la traza en JSON (se abre en Perfetto o chrome://tracing)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        return path
+
+
+def _metadata(kind: str, pid: int, tid: int, name: str) -> Dict:
+    return {"name": kind, "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+
+
+def _thread_name() -> str:
+    return threading.current_thread().name
+
+
+def _process_name() -> str:
+    return multiprocessing.current_process().name
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+# Tracer por defecto del proceso
+TRACER = Tracer(enabled=TRACE_ENABLED or bool(TRACE_FILE))
+
+# Un proceso hijo creado con fork no debe reenviar los eventos del padre
+os.register_at_fork(after_in_child=TRACER._after_fork)
+
+
+def span(name: str, cat: str = "analysis", **args):
+    """Span en el tracer global"""
+    return TRACER.span(name, cat, **args)
+
+
+def traced(name: Optional[str] = None, cat: str = "analysis"):
+    """Decorador que traza cada llamada en el tracer global"""
+    return TRACER.traced(name, cat)
+
+
+def run_traced(func: Callable, *args):
+    """Ejecuta func en un worker con la traza activa; devuelve (resultado, eventos).
+
+    Se usa como función del pool (``executor.map(run_traced, [func] * n, ...)``)
+    solo cuando el proceso principal está trazando.
+    """
+    TRACER.enabled = True
+    with TRACER.span(getattr(func, "__name__", "task"), cat="worker"):
+        result = func(*args)
+    return result, TRACER.drain()
+
+
+def traced_map(executor, func: Callable, *iterables: Iterable) -> List:
+    """``executor.map`` que, con la traza activa, agrega los spans de los workers"""
+    if not TRACER.enabled:
+        return list(executor.map(func, *iterables))
+    results = []
+    for result, events in executor.map(run_traced, itertools.repeat(func), *iterables):
+        TRACER.merge(events)
+        results.append(result)
+    return results
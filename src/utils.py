@@ -1,25 +1,123 @@
 # src/utils.py
+import bz2
+import gzip
 import json
+import lzma
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import IO, Any, Dict, Optional, Tuple, Union
 
+from config import JSON_COMPRESSION
 
-def save_json(data: Any, filename: str, folder: str = "raw_json") -> Path:
-    """Guarda datos como JSON en la carpeta especificada"""
+from .tracing import span
+
+# ========== COMPRESIÓN ==========
+
+# Extensión de cada formato (la extensión del archivo tiene prioridad sobre
+# la configuración) y primeros bytes con los que se detecta al leer
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "lzma": ".xz", "bz2": ".bz2"}
+_SUFFIX_COMPRESSION = {suffix: name for name, suffix in COMPRESSION_SUFFIXES.items()}
+_MAGIC_NUMBERS = (
+    (b"\x1f\x8b", "gzip"),
+    (b"\xfd7zXZ\x00", "lzma"),
+    (b"BZh", "bz2"),
+)
+_OPENERS = {"gzip": gzip.open, "lzma": lzma.open, "bz2": bz2.open}
+# Nivel intermedio: casi la razón del máximo con bastante menos CPU
+_WRITE_OPTIONS = {
+    "gzip": {"compresslevel": 6},
+    "lzma": {"preset": 6},
+    "bz2": {"compresslevel": 9},
+}
+
+
+def split_compression(filename: str) -> Tuple[str, Optional[str]]:
+    """Nombre sin la extensión de compresión y el formato que indica (o None)"""
+    suffix = Path(filename).suffix.lower()
+    if suffix in _SUFFIX_COMPRESSION:
+        return filename[: -len(suffix)], _SUFFIX_COMPRESSION[suffix]
+    return filename, None
+
+
+def detect_compression(path: Union[str, Path]) -> Optional[str]:
+    """Formato de compresión de un archivo según sus primeros bytes"""
+    with open(path, "rb") as f:
+        head = f.read(6)
+    for magic, compression in _MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_text(
+    path: Union[str, Path], mode: str = "r", compression: Optional[str] = None
+) -> IO[str]:
+    """Abre un archivo de texto UTF-8, comprimido o no, en modo "r" o "w".
+
+    La compresión es por flujo: se comprime (o descomprime) a medida que se
+    escribe (o lee), sin armar el contenido completo en memoria. Al leer,
+    si no se indica, se detecta por los primeros bytes.
+    """
+    if mode == "r" and compression is None:
+        compression = detect_compression(path)
+    if not compression:
+        return open(path, mode, encoding="utf-8")
+    if compression not in _OPENERS:
+        raise ValueError(
+            f"Compresión desconocida: {compression} (gzip, lzma, bz2 o vacío)"
+        )
+    options = _WRITE_OPTIONS[compression] if mode == "w" else {}
+    return _OPENERS[compression](path, mode + "t", encoding="utf-8", **options)
+
+
+def compressed_name(
+    filename: str, compression: Optional[str] = JSON_COMPRESSION
+) -> Tuple[str, Optional[str]]:
+    """Nombre con la extensión del formato (si no trae una propia) y el formato
+    que se usará"""
+    _, explicit = split_compression(filename)
+    if explicit or not compression:
+        return filename, explicit
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(
+            f"Compresión desconocida: {compression} (gzip, lzma, bz2 o vacío)"
+        )
+    return filename + COMPRESSION_SUFFIXES[compression], compression
+
+
+def json_stem(path: Union[str, Path]) -> str:
+    """Nombre de un archivo sin las extensiones .json y de compresión"""
+    name, _ = split_compression(Path(path).name)
+    return name[: -len(".json")] if name.endswith(".json") else Path(name).stem
+
+
+# ========== JSON ==========
+
+
+def save_json(
+    data: Any,
+    filename: str,
+    folder: str = "raw_json",
+    compression: Optional[str] = JSON_COMPRESSION,
+) -> Path:
+    """Guarda datos como JSON en la carpeta especificada.
+
+    Se comprime si el nombre termina en .gz, .xz o .bz2, o con el formato
+    ``compression`` (gzip, lzma o bz2) si el nombre no trae extensión propia.
+    """
     output_dir = Path("data") / folder
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    name, explicit = split_compression(filename)
     # Añadir timestamp si no tiene extensión
-    if not filename.endswith(".json"):
+    if not name.endswith(".json"):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{filename}_{timestamp}.json"
-    elif not filename.endswith(".json"):
-        filename += ".json"
+        name = f"{name}_{timestamp}.json"
+    filename, compression = compressed_name(name, explicit or compression)
 
     filepath = output_dir / filename
 
-    with open(filepath, "w", encoding="utf-8") as f:
+    with open_text(filepath, "w", compression) as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
     print(f"💾 Datos guardados en: {filepath}")
@@ -27,12 +125,22 @@ def save_json(data: Any, filename: str, folder: str = "raw_json") -> Path:
 
 
 def load_json(filename: str, folder: str = "raw_json") -> Dict:
-    """Carga datos desde un archivo JSON"""
+    """Carga datos desde un archivo JSON (comprimido o no).
+
+    Si el archivo no existe pero sí una versión comprimida (.gz, .xz,
+    .bz2), se carga esa.
+    """
     filepath = Path("data") / folder / filename
+    if not filepath.exists():
+        candidates = [
+            filepath.with_name(filepath.name + suffix)
+            for suffix in COMPRESSION_SUFFIXES.values()
+        ]
+        filepath = next((path for path in candidates if path.exists()), filepath)
     if not filepath.exists():
         raise FileNotFoundError(f"Archivo no encontrado: {filepath}")
 
-    with open(filepath, "r", encoding="utf-8") as f:
+    with span("load_json", cat="io", file=filepath.name), open_text(filepath) as f:
         return json.load(f)
 
 
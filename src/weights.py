@@ -0,0 +1,244 @@
+# src/weights.py
+"""
+Pesos de los componentes de cada rasgo Big Five expresados como matriz.
+
+Cada rasgo es una combinación lineal de componentes normalizados (amigos,
+reacciones, frecuencia de léxico, etc.). Con los componentes de uno o
+varios datasets en una matriz, cualquier número de configuraciones de
+pesos se evalúa con una sola multiplicación de matrices.
+"""
+
+import copy
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+TRAITS = (
+    "extraversion",
+    "neuroticism",
+    "openness",
+    "agreeableness",
+    "conscientiousness",
+)
+
+# Componentes de cada rasgo, en el orden en que se suman
+TRAIT_COMPONENTS = {
+    "extraversion": (
+        "friends_normalized",
+        "reactions_normalized",
+        "word_frequency",
+        "social_signals",
+    ),
+    "neuroticism": ("negative_ratio", "sentiment_imbalance", "word_frequency"),
+    "openness": ("groups_normalized", "word_frequency", "lexical_diversity"),
+    "agreeableness": ("positive_ratio", "word_frequency", "comments_normalized"),
+    "conscientiousness": ("word_frequency", "post_consistency", "bio_completeness"),
+}
+
+# Columnas de la matriz de componentes: pares (rasgo, componente)
+COMPONENT_KEYS: Tuple[Tuple[str, str], ...] = tuple(
+    (trait, component) for trait in TRAITS for component in TRAIT_COMPONENTS[trait]
+)
+
+DEFAULT_TRAIT_WEIGHTS = {
+    "extraversion": {
+        "friends_normalized": 0.3,
+        "reactions_normalized": 0.4,
+        "word_frequency": 0.3,
+    },
+    "neuroticism": {
+        "negative_ratio": 0.4,
+        "sentiment_imbalance": 0.3,
+        "word_frequency": 0.3,
+    },
+    "openness": {
+        "groups_normalized": 0.3,
+        "word_frequency": 0.4,
+        "lexical_diversity": 0.3,
+    },
+    "agreeableness": {
+        "positive_ratio": 0.4,
+        "word_frequency": 0.4,
+        "comments_normalized": 0.2,
+    },
+    "conscientiousness": {
+        "word_frequency": 0.6,
+        "post_consistency": 0.2,
+        "bio_completeness": 0.2,
+    },
+}
+
+
+# Extraversión con señales sociales (emoji, hashtags, menciones); sin ellas
+# el componente social_signals tiene peso 0
+SOCIAL_EXTRAVERSION_WEIGHTS = {
+    "friends_normalized": 0.3,
+    "reactions_normalized": 0.3,
+    "word_frequency": 0.25,
+    "social_signals": 0.15,
+}
+
+
+def default_weights(social_signals: bool = False) -> Dict[str, Dict[str, float]]:
+    """Copia modificable de los pesos por defecto (con o sin señales sociales)"""
+    weights = copy.deepcopy(DEFAULT_TRAIT_WEIGHTS)
+    if social_signals:
+        weights["extraversion"] = dict(SOCIAL_EXTRAVERSION_WEIGHTS)
+    return weights
+
+
+def trait_components(
+    posts,
+    reactions,
+    comments,
+    positive,
+    negative,
+    analyzed,
+    word_frequencies: Mapping[str, float],
+    lexical_diversity,
+    social_signals=0.0,
+    friends_count: float = 0,
+    groups: int = 0,
+    bio_complete: bool = False,
+) -> Dict[str, Dict]:
+    """Componentes normalizados de cada rasgo a partir de los conteos de un corpus.
+
+    Los conteos (posts con texto, reacciones, comentarios, textos positivos,
+    negativos y analizados, frecuencias, diversidad y señales sociales)
+    pueden ser escalares o arreglos de NumPy con una fila por ventana; los
+    campos del perfil (amigos, grupos, biografía) son escalares.
+    """
+    per_post = np.maximum(posts, 1)
+    analyzed = np.maximum(analyzed, 1)
+    return {
+        "extraversion": {
+            "friends_normalized": min(friends_count / 1000, 1.0),
+            "reactions_normalized": np.minimum(reactions / per_post / 50, 1.0),
+            "word_frequency": word_frequencies["extraversion"],
+            # Emoji, hashtags y menciones por post (0 sin señales sociales)
+            "social_signals": social_signals,
+        },
+        "neuroticism": {
+            "negative_ratio": negative / analyzed,
+            "sentiment_imbalance": 1 - positive / analyzed,
+            "word_frequency": word_frequencies["neuroticism"],
+        },
+        "openness": {
+            "groups_normalized": min(groups / 10, 1.0),
+            "word_frequency": word_frequencies["openness"],
+            "lexical_diversity": lexical_diversity,
+        },
+        "agreeableness": {
+            "positive_ratio": positive / analyzed,
+            "word_frequency": word_frequencies["agreeableness"],
+            "comments_normalized": np.minimum(comments / per_post / 10, 1.0),
+        },
+        "conscientiousness": {
+            "word_frequency": word_frequencies["conscientiousness"],
+            # Consistencia (mínimo 5 posts)
+            "post_consistency": np.where(np.asarray(posts) >= 5, 1.0, 0.3),
+            "bio_completeness": 1.0 if bio_complete else 0.3,
+        },
+    }
+
+
+def weight_matrix(weights: Mapping[str, Mapping[str, float]] = None) -> np.ndarray:
+    """Convierte un diccionario de pesos en una matriz (rasgos x componentes)"""
+    if weights is None:
+        weights = DEFAULT_TRAIT_WEIGHTS
+
+    matrix = np.zeros((len(TRAITS), len(COMPONENT_KEYS)), dtype=np.float64)
+    for t, trait in enumerate(TRAITS):
+        for component, weight in weights.get(trait, {}).items():
+            key = (trait, component)
+            if key not in COMPONENT_KEYS:
+                raise ValueError(f"Componente desconocido para {trait}: {component}")
+            matrix[t, COMPONENT_KEYS.index(key)] = weight
+    return matrix
+
+
+def stack_weight_configs(
+    configs: Sequence[Mapping[str, Mapping[str, float]]],
+) -> np.ndarray:
+    """Apila varias configuraciones de pesos en un arreglo (configs x rasgos x componentes)"""
+    if not configs:
+        return np.zeros((0, len(TRAITS), len(COMPONENT_KEYS)), dtype=np.float64)
+    return np.stack([weight_matrix(config) for config in configs])
+
+
+def component_vector(components: Mapping[str, Mapping[str, float]]) -> np.ndarray:
+    """Aplana los componentes calculados de un dataset en un vector"""
+    return np.array(
+        [components[trait][component] for trait, component in COMPONENT_KEYS],
+        dtype=np.float64,
+    )
+
+
+def component_matrix(
+    components_list: Sequence[Mapping[str, Mapping[str, float]]],
+) -> np.ndarray:
+    """Apila los componentes de varios datasets en una matriz (datasets x componentes)"""
+    if not components_list:
+        return np.zeros((0, len(COMPONENT_KEYS)), dtype=np.float64)
+    return np.stack([component_vector(c) for c in components_list])
+
+
+def weighted_scores(
+    components: Mapping[str, Mapping[str, float]],
+    weights: Mapping[str, Mapping[str, float]] = None,
+    traits: Sequence[str] = TRAITS,
+) -> Dict[str, float]:
+    """Calcula los rasgos de un dataset (por defecto los cinco), normalizados a 0-1"""
+    if weights is None:
+        weights = DEFAULT_TRAIT_WEIGHTS
+
+    scores = {}
+    for trait in traits:
+        trait_weights = weights.get(trait, {})
+        score = sum(
+            trait_weights.get(component, 0.0) * components[trait][component]
+            for component in TRAIT_COMPONENTS[trait]
+        )
+        scores[trait] = min(max(score, 0.0), 1.0)
+    return scores
+
+
+def evaluate_weight_grid(features: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """Evalúa muchas configuraciones de pesos con una sola multiplicación.
+
+    ``features`` tiene forma (datasets, componentes) o (componentes,) y
+    ``grid`` tiene forma (configs, rasgos, componentes) o (rasgos,
+    componentes). El resultado tiene forma (configs, datasets, rasgos),
+    con las dimensiones individuales eliminadas si la entrada era 1D/2D.
+    """
+    features = np.asarray(features, dtype=np.float64)
+    grid = np.asarray(grid, dtype=np.float64)
+    single_dataset = features.ndim == 1
+    single_config = grid.ndim == 2
+    features = np.atleast_2d(features)
+    if single_config:
+        grid = grid[None]
+
+    n_components = len(COMPONENT_KEYS)
+    if features.shape[1] != n_components or grid.shape[1:] != (
+        len(TRAITS),
+        n_components,
+    ):
+        raise ValueError("Dimensiones incompatibles entre componentes y pesos")
+
+    n_configs = grid.shape[0]
+    raw = grid.reshape(n_configs * len(TRAITS), n_components) @ features.T
+    scores = np.clip(raw, 0.0, 1.0).reshape(n_configs, len(TRAITS), -1)
+    scores = scores.transpose(0, 2, 1)
+
+    if single_dataset:
+        scores = scores[:, 0, :]
+    if single_config:
+        scores = scores[0]
+    return scores
+
+
+def scores_to_dicts(scores: np.ndarray) -> List[Dict[str, float]]:
+    """Convierte filas de puntuaciones (…, rasgos) en diccionarios por rasgo"""
+    rows = np.asarray(scores).reshape(-1, len(TRAITS))
+    return [{trait: float(row[t]) for t, trait in enumerate(TRAITS)} for row in rows]
@@ -0,0 +1,83 @@
+# tests/test_async_batch.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import time
+
+import pytest
+
+from src.async_batch import AsyncBatchOrchestrator, discover_inputs
+from src.metrics import REGISTRY
+from src.personality import BigFiveAnalyzer
+from src.utils import save_json
+
+
+def _dataset(i):
+    return {
+        "posts": [
+            {"text": f"Hoy fui a una fiesta con mis amigos {i}", "reactions": i},
+            {"text": "Leí un libro de filosofía muy interesante", "comments": 2},
+        ],
+        "friends_count": 100 * i,
+    }
+
+
+def test_orchestrator_processes_folder(tmp_path):
+    """Descubre, analiza y guarda todos los archivos en orden"""
+    raw = tmp_path / "raw"
+    for i in range(5):
+        save_json(_dataset(i), f"dataset_{i}.json", folder=str(raw))
+
+    progress = []
+    analyses_before = REGISTRY.get("bigfive_analyses_total")
+    orchestrator = AsyncBatchOrchestrator(
+        max_in_flight=2,
+        max_workers=2,
+        results_folder=tmp_path / "results",
+        on_progress=progress.append,
+    )
+    rows = asyncio.run(orchestrator.run_folder(raw))
+
+    assert [row["dataset"] for row in rows] == [f"dataset_{i}" for i in range(5)]
+    for i, row in enumerate(rows):
+        expected = BigFiveAnalyzer().calculate_big_five_scores(_dataset(i))
+        assert row["scores"] == expected
+        assert (tmp_path / "results" / f"dataset_{i}_results.json").exists()
+
+    assert progress[-1]["completed"] == 5
+    assert progress[-1]["posts"] == 10
+    # Los deltas de métricas de los workers se combinan en el proceso principal
+    # (más los 5 análisis de referencia de este test)
+    assert REGISTRY.get("bigfive_analyses_total") == analyses_before + 10
+    assert len(discover_inputs(raw, "dataset_1*")) == 1
+
+
+def test_orchestrator_cancellation(tmp_path):
+    """Cancelar el lote detiene las tareas pendientes sin dejar el pool colgado"""
+    paths = [tmp_path / f"dataset_{i}.json" for i in range(20)]
+
+    orchestrator = AsyncBatchOrchestrator(
+        max_in_flight=2, max_workers=1, on_progress=None
+    )
+
+    def slow_load(path):
+        time.sleep(0.1)
+        return _dataset(0)
+
+    orchestrator.load_file = slow_load
+
+    async def cancel_soon():
+        task = asyncio.create_task(orchestrator.run(paths))
+        await asyncio.sleep(0.25)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_soon())
+    assert orchestrator.completed < len(paths)
+
+    with pytest.raises(ValueError):
+        AsyncBatchOrchestrator(max_in_flight=0)
@@ -0,0 +1,130 @@
+# tests/test_batch.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+
+import pytest
+
+from src.batch import BatchRunner
+from src.utils import save_json
+
+
+def _dataset(i):
+    return {
+        "posts": [
+            {"text": f"Hoy fui a una fiesta con mis amigos {i}", "reactions": i},
+            {"text": "Estoy preocupado y nervioso por el trabajo", "reactions": 2},
+        ],
+        "friends_count": 100 + i,
+        "groups": ["Música"],
+        "basic_info": {"bio": "Estudiante"},
+    }
+
+
+def test_batch_runner_collects_sketches(tmp_path):
+    """El runner procesa archivos y mantiene cuantiles por característica"""
+    paths = [
+        save_json(_dataset(i), f"dataset_{i}.json", folder=str(tmp_path))
+        for i in range(5)
+    ]
+
+    runner = BatchRunner()
+    rows = runner.run(paths)
+
+    assert len(rows) == 5
+    assert runner.datasets_processed == 5
+    assert runner.sketches["score.extraversion"].count == 5
+    assert runner.sketches["post.reactions"].count == 10
+    assert runner.quantile("post.reactions", 1.0) == 4
+
+    summary = runner.summary()
+    assert "component.extraversion.word_frequency" in summary
+    assert set(summary["score.openness"]["quantiles"]) >= {"p50", "p95"}
+
+
+def test_batch_runner_merge_and_persist(tmp_path):
+    """Los sketches de distintos workers se serializan y combinan"""
+    first = BatchRunner()
+    second = BatchRunner()
+    for i in range(3):
+        first.process(_dataset(i))
+    for i in range(3, 6):
+        second.process(_dataset(i))
+
+    path = second.save_sketches(tmp_path / "sketches.json")
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+
+    first.load_sketches(state)
+    assert first.datasets_processed == 6
+    assert first.sketches["score.neuroticism"].count == 6
+    assert first.quantile("post.reactions", 1.0) == 5
+
+
+def test_batch_runner_pipelined_save(tmp_path):
+    """El runner guarda los resultados en segundo plano y reporta utilización"""
+    raw = tmp_path / "raw"
+    paths = [
+        save_json(_dataset(i), f"dataset_{i}.json", folder=str(raw)) for i in range(4)
+    ]
+
+    runner = BatchRunner()
+    rows = runner.run(paths, results_folder=tmp_path / "results", prefetch=2)
+
+    assert [row["dataset"] for row in rows] == [f"dataset_{i}" for i in range(4)]
+    for i, row in enumerate(rows):
+        with open(
+            tmp_path / "results" / f"dataset_{i}_results.json", encoding="utf-8"
+        ) as f:
+            saved = json.load(f)
+        assert saved["big_five_scores"] == row["scores"]
+        assert (tmp_path / "results" / f"dataset_{i}_results.txt").exists()
+
+    report = runner.pipeline_report
+    assert report["load"]["items"] == 4
+    assert report["save"]["items"] == 4
+
+
+def test_batch_runner_merge_rejects_different_k():
+    """No se combinan sketches con distinto k (ni se modifica el runner)"""
+    first = BatchRunner(sketch_k=64)
+    second = BatchRunner(sketch_k=128)
+    first.process(_dataset(0))
+    second.process(_dataset(1))
+
+    with pytest.raises(ValueError):
+        first.merge(second)
+    assert first.datasets_processed == 1
+    assert first.sketches["score.openness"].count == 1
+
+    with pytest.raises(ValueError):
+        BatchRunner(sketch_k=64).load_sketches(second.sketches_to_dict())
+
+
+def test_batch_runner_records_failed_datasets(tmp_path):
+    """Un archivo corrupto solo afecta a su fila; el resto del lote continúa"""
+    paths = [
+        save_json(_dataset(i), f"dataset_{i}.json", folder=str(tmp_path))
+        for i in range(3)
+    ]
+    broken = tmp_path / "broken.json"
+    broken.write_text("{no es json", encoding="utf-8")
+    paths.insert(1, broken)
+
+    runner = BatchRunner()
+    rows = runner.run(paths, results_folder=tmp_path / "results")
+
+    assert [row["dataset"] for row in rows] == [
+        "dataset_0",
+        "broken",
+        "dataset_1",
+        "dataset_2",
+    ]
+    assert "error" in rows[1] and "scores" not in rows[1]
+    assert all("scores" in row for i, row in enumerate(rows) if i != 1)
+    assert runner.failed == 1
+    assert runner.datasets_processed == 3
+    assert not (tmp_path / "results" / "broken_results.json").exists()
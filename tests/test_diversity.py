@@ -0,0 +1,87 @@
+# tests/test_diversity.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import random
+
+import pytest
+
+from src.diversity import MATTRAccumulator, mattr
+from src.personality import BigFiveAnalyzer
+
+
+def _brute_force_mattr(tokens, window):
+    windows = len(tokens) - window + 1
+    if windows <= 0:
+        return None
+    return sum(len(set(tokens[s : s + window])) for s in range(windows)) / (
+        windows * window
+    )
+
+
+def test_mattr_matches_brute_force():
+    """La pasada O(n) coincide con recalcular el conjunto de cada ventana"""
+    rng = random.Random(3)
+    for _ in range(300):
+        window = rng.randint(1, 10)
+        tokens = [rng.choice("abcdefghij") for _ in range(rng.randint(0, 80))]
+        expected = _brute_force_mattr(tokens, window)
+        if expected is None:
+            assert mattr(tokens, window) is None
+        else:
+            assert mattr(tokens, window) == pytest.approx(expected, abs=1e-12)
+
+
+def test_mattr_merge_of_consecutive_chunks():
+    """Combinar los bloques en orden da el mismo valor que una sola pasada"""
+    rng = random.Random(5)
+    for _ in range(300):
+        window = rng.randint(1, 8)
+        tokens = [rng.choice("abcdefg") for _ in range(rng.randint(0, 60))]
+        cuts = sorted(rng.randint(0, len(tokens)) for _ in range(rng.randint(0, 4)))
+
+        merged = MATTRAccumulator(window)
+        start = 0
+        for end in cuts + [len(tokens)]:
+            chunk = MATTRAccumulator(window)
+            chunk.update(tokens[start:end])
+            merged |= chunk
+            start = end
+
+        single = MATTRAccumulator(window)
+        single.update(tokens)
+        assert merged.tokens == single.tokens == len(tokens)
+        assert merged.value() == single.value()
+
+    with pytest.raises(ValueError):
+        MATTRAccumulator(5).merge(MATTRAccumulator(6))
+    with pytest.raises(ValueError):
+        MATTRAccumulator(0)
+
+
+def test_mattr_is_stable_across_corpus_sizes():
+    """El TTR global cae con el tamaño del corpus; MATTR se mantiene"""
+    rng = random.Random(11)
+    vocabulary = [f"palabra{i}" for i in range(400)]
+
+    def dataset(n_posts):
+        return {
+            "posts": [
+                {"text": " ".join(rng.choice(vocabulary) for _ in range(12))}
+                for _ in range(n_posts)
+            ]
+        }
+
+    small, large = BigFiveAnalyzer(), BigFiveAnalyzer()
+    small.calculate_big_five_scores(dataset(20))
+    large.calculate_big_five_scores(dataset(400))
+    small_metadata = small.results["metadata"]
+    large_metadata = large.results["metadata"]
+
+    assert small_metadata["mattr_window"] == 50
+    assert large_metadata["lexical_diversity"] < small_metadata["lexical_diversity"] / 2
+    assert large_metadata["lexical_diversity_mattr"] == pytest.approx(
+        small_metadata["lexical_diversity_mattr"], abs=0.03
+    )
@@ -0,0 +1,63 @@
+# tests/test_equivalence.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from src.equivalence import (
+    ENGINES,
+    compare_engines,
+    format_report,
+    generate_corpus,
+    main,
+)
+from src.metrics import MetricsRegistry
+from src.personality import BigFiveAnalyzer
+
+# Los motores con pool de procesos crean uno por dataset: corpus más chico
+CORPUS_SIZES = {"parallel": 40, "shared_memory": 40}
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_current_engine_matches_reference(engine):
+    """Puntajes, metadata y sentimiento idénticos a la referencia congelada"""
+    size = CORPUS_SIZES.get(engine, 150)
+    datasets = generate_corpus(size, size, seed=1)
+    report = compare_engines(datasets, engine)
+
+    assert report["mismatch_count"] == 0, format_report(report)
+    assert report["sentiment_mismatch_count"] == 0, format_report(report)
+    assert report["compared"] > size * 1.6
+    assert report["texts"] > size * 3
+
+
+def test_large_posts_match_reference():
+    datasets = generate_corpus(10, 0, seed=2, max_posts=200, max_words=80)
+    report = compare_engines(datasets, "micro_batch")
+    assert report["mismatch_count"] == 0, format_report(report)
+
+
+def test_harness_detects_differences_and_reports_speedup():
+    analyzer = BigFiveAnalyzer(lexicon_path="", metrics=MetricsRegistry(False))
+    analyzer.trait_weights["extraversion"]["reactions_normalized"] = 0.5
+    report = compare_engines(generate_corpus(30, 0, seed=3), analyzer=analyzer)
+
+    assert report["mismatch_count"] > 0
+    assert any(
+        ".scores.extraversion" in difference
+        for mismatch in report["mismatches"]
+        for difference in mismatch["differences"]
+    )
+    timing = report["timing"]["calculate_big_five_scores"]
+    assert timing["reference_seconds"] > 0 and timing["speedup"] > 0
+    # Con datasets pequeños los tiempos solo se muestran si se piden
+    assert not report["timing_representative"]
+    assert "aceleración" not in format_report(report)
+    assert "aceleración" in format_report(report, show_timing=True)
+
+
+def test_cli_exit_code(capsys):
+    assert main(["--datasets", "20", "--fuzz", "20"]) == 0
+    assert "Discrepancias: 0 datasets" in capsys.readouterr().out
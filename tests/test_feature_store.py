@@ -0,0 +1,96 @@
+# tests/test_feature_store.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+
+from src.feature_store import FeatureStore
+from src.personality import BigFiveAnalyzer
+
+POSTS = [
+    {"text": "Estoy muy feliz con mis amigos", "reactions": 5, "comments": 2},
+    {"reactions": 1},
+    {"text": "Me preocupa el examen, estoy muy cansado", "comments": 3},
+    {"text": "hola"},
+]
+
+
+def test_append_and_slice_rows(tmp_path):
+    """Los lotes se agregan al final y se leen por filas con memmap"""
+    store = FeatureStore(tmp_path / "features.npy")
+    columns = ["a", "b", "c"]
+    first = np.arange(12, dtype=np.float64).reshape(4, 3)
+    second = -np.arange(6, dtype=np.float64).reshape(2, 3)
+
+    assert store.append(first, columns, {"todo": [0, 3]}, dataset="uno") == 4
+    assert store.append(second, columns, dataset="dos") == 6
+
+    matrix = store.open()
+    assert isinstance(matrix, np.memmap)
+    assert matrix.shape == (6, 3)
+    np.testing.assert_array_equal(store.rows(3, 5), np.vstack([first[3:], second[:1]]))
+    np.testing.assert_array_equal(store.column("b"), np.r_[first[:, 1], second[:, 1]])
+    # El archivo es un .npy estándar
+    np.testing.assert_array_equal(np.load(store.path), np.vstack([first, second]))
+
+    schema = store.schema()
+    assert schema["dtype"] == "<f4"
+    assert schema["groups"] == {"todo": [0, 3]}
+    assert [b["dataset"] for b in schema["batches"]] == ["uno", "dos"]
+    assert [b["start"] for b in schema["batches"]] == [0, 4]
+
+
+def test_append_rejects_different_columns(tmp_path):
+    store = FeatureStore(tmp_path / "features.npy")
+    store.append(np.zeros((1, 2)), ["a", "b"])
+    with pytest.raises(ValueError):
+        store.append(np.zeros((1, 2)), ["a", "c"])
+    with pytest.raises(ValueError):
+        store.append(np.zeros((1, 3)), ["a", "b"])
+    assert len(store) == 1
+
+
+def test_analyzer_post_features_match_per_post_methods(tmp_path):
+    analyzer = BigFiveAnalyzer(ngram_features=32)
+    features, columns, groups = analyzer.calculate_post_features({"posts": POSTS})
+
+    assert features.shape == (4, len(columns))
+    assert groups["ngrams"] == [len(columns) - 32, len(columns)]
+    np.testing.assert_array_equal(features[:, columns.index("reactions")], [5, 1, 0, 0])
+    np.testing.assert_array_equal(features[:, columns.index("words")], [6, 0, 7, 1])
+    # El post sin texto queda en ceros salvo la interacción
+    assert not features[1, : groups["engagement"][0]].any()
+
+    texts = [POSTS[0]["text"], POSTS[2]["text"], POSTS[3]["text"]]
+    frequencies = analyzer.calculate_post_trait_frequencies(texts)
+    for trait, values in frequencies.items():
+        hits = features[[0, 2, 3], columns.index(f"lexicon_{trait}")]
+        np.testing.assert_allclose(hits / np.array([6, 7, 1]), values)
+
+    for row, text in zip([0, 2, 3], texts):
+        sentiment = analyzer.sentiment_analyzer.analyze_sentiment(text)
+        start, stop = groups["sentiment"]
+        assert features[row, start:stop].tolist() == [
+            sentiment[column] for column in columns[start:stop]
+        ]
+
+    # Un post fragmentado usa el sentimiento de su texto completo
+    chunked = BigFiveAnalyzer(
+        ngram_features=32, max_post_chars=12, post_overflow="chunk"
+    )
+    chunked_features, _, _ = chunked.calculate_post_features({"posts": POSTS})
+    sentiment = analyzer.sentiment_analyzer.analyze_sentiment(texts[1])
+    assert chunked_features[2, columns.index("polarity")] == sentiment["polarity"]
+
+    ngrams = analyzer.calculate_post_ngram_features(texts, dense=True)
+    start, stop = groups["ngrams"]
+    np.testing.assert_array_equal(features[[0, 2, 3], start:stop], ngrams)
+
+    store = analyzer.export_post_features({"posts": POSTS}, tmp_path / "f.npy")
+    analyzer.export_post_features({"posts": POSTS[:2]}, tmp_path / "f.npy")
+    assert len(store) == 6
+    np.testing.assert_allclose(store.rows(4, 6), features[:2], rtol=1e-6)
+    assert store.schema()["batches"][0]["lexicon_version"] == analyzer.lexicon.version
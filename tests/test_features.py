@@ -0,0 +1,151 @@
+# tests/test_features.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+
+from src.features import (
+    WORD_PATTERN,
+    CSRMatrix,
+    HashedNgramVectorizer,
+    Vocabulary,
+    build_document_term_matrix,
+    lexicon_matrix,
+    lexicon_vector,
+    tokenize,
+    tokenize_cased,
+)
+from src.personality import BigFiveAnalyzer
+
+TEXTS = [
+    "Estoy feliz con mis amigos en la fiesta, FIESTA total",
+    "",
+    "Me siento triste y preocupado por el trabajo",
+]
+
+
+def test_document_term_matrix_counts():
+    """La matriz CSR guarda los conteos de cada término por documento"""
+    matrix, vocabulary = build_document_term_matrix(TEXTS)
+
+    assert matrix.shape == (3, len(vocabulary))
+    assert list(matrix.indptr[:3]) == [0, matrix.indptr[1], matrix.indptr[1]]
+    dense = matrix.to_dense()
+    assert dense[0, vocabulary.get("fiesta")] == 2
+    assert dense[1].sum() == 0
+    assert list(matrix.row_sums()) == [len(tokenize(t)) for t in TEXTS]
+    assert matrix.column_sums().sum() == matrix.data.sum()
+
+
+def test_tokenize_cased_matches_both_tokenizations():
+    texts = TEXTS + ["İstanbul", "ΟΔΟΣ ΑΣ'Β", "straße STRASSE", "a_b Ǆ ﬁn"]
+    for text in texts:
+        assert tokenize_cased(text) == (WORD_PATTERN.findall(text), tokenize(text))
+
+
+def test_lowercase_keeps_length_except_dotted_i():
+    # tokenize_cased pasa cada token a minúsculas por separado: solo vale
+    # si ningún carácter cambia de longitud ni de categoría \w
+    changed = []
+    for code in range(0x110000):
+        if 0xD800 <= code <= 0xDFFF:
+            continue
+        char = chr(code)
+        lower = char.lower()
+        is_word = WORD_PATTERN.fullmatch(char) is not None
+        if len(lower) != 1 or is_word != (WORD_PATTERN.fullmatch(lower) is not None):
+            changed.append(code)
+    assert changed == [0x130]
+
+
+def test_matrix_products_match_dense():
+    """Los productos dispersos coinciden con el cálculo denso"""
+    matrix, vocabulary = build_document_term_matrix(TEXTS)
+    lexicons = {"social": ["fiesta", "amigos"], "negativo": ["Triste", "preocupado"]}
+    names, weights = lexicon_matrix(lexicons, vocabulary)
+
+    assert names == ["social", "negativo"]
+    np.testing.assert_array_equal(matrix.dot(weights), matrix.to_dense() @ weights)
+    np.testing.assert_array_equal(
+        matrix.dot(lexicon_vector(["triste"], vocabulary)), [0, 0, 1]
+    )
+
+    with pytest.raises(ValueError):
+        matrix.dot(np.ones(len(vocabulary) + 1))
+    with pytest.raises(ValueError):
+        CSRMatrix([0], [1], [], (1, 2))
+
+
+def test_vocabulary_and_empty_corpus():
+    """Vocabulario estable y corpus vacío"""
+    vocabulary = Vocabulary(["hola", "mundo", "hola"])
+    assert len(vocabulary) == 2
+    assert vocabulary.get("mundo") == 1
+    assert vocabulary.get("adiós") == -1
+    assert vocabulary.words() == ["hola", "mundo"]
+
+    matrix, _ = build_document_term_matrix(["", "..."])
+    assert matrix.nnz == 0
+    assert list(matrix.row_sums()) == [0, 0]
+
+
+def test_trait_frequencies_match_word_frequency():
+    """Las frecuencias matriciales coinciden con calculate_word_frequency"""
+    analyzer = BigFiveAnalyzer()
+    aggregate = analyzer.calculate_trait_frequencies(TEXTS)
+    per_post = analyzer.calculate_post_trait_frequencies(TEXTS)
+
+    for trait, words in analyzer.get_trait_lexicons().items():
+        assert aggregate[trait] == analyzer.calculate_word_frequency(TEXTS, words)
+        assert len(per_post[trait]) == len(TEXTS)
+
+    assert per_post["extraversion"][0] == pytest.approx(3 / 10)
+    assert per_post["neuroticism"][1] == 0.0
+
+
+def test_hashed_ngrams_per_post():
+    """Cada post tiene sus bigramas y trigramas, sin cruzar el límite entre posts"""
+    vectorizer = HashedNgramVectorizer(n_features=2**18, alternate_sign=False)
+    matrix = vectorizer.transform(["Estoy muy cansado", "", "hola", "muy cansado hoy"])
+
+    assert matrix.shape == (4, 2**18)
+    dense = matrix.to_dense()
+    # 2 bigramas + 1 trigrama; los posts vacío y de una palabra no tienen n-gramas
+    np.testing.assert_array_equal(dense.sum(axis=1), [3, 0, 0, 3])
+    # "muy cansado" cae en la misma columna en ambos posts
+    shared = (dense[0] > 0) & (dense[3] > 0)
+    assert shared.sum() == 1
+    # Determinista entre instancias (no depende del hash aleatorio de Python)
+    other = HashedNgramVectorizer(n_features=2**18, alternate_sign=False)
+    np.testing.assert_array_equal(
+        other.transform(["muy cansado"]).to_dense()[0] > 0, shared
+    )
+
+
+def test_hashed_ngrams_fixed_width_and_signs():
+    texts = [f"palabra{i} otra{i} mas{i % 7}" for i in range(500)]
+    matrix = HashedNgramVectorizer(n_features=16).transform(texts)
+
+    assert matrix.shape == (500, 16)
+    assert matrix.indices.max() < 16
+    assert set(np.unique(np.sign(matrix.data))) <= {-1.0, 1.0}
+    assert (matrix.data != 0).all()
+
+    with pytest.raises(ValueError):
+        HashedNgramVectorizer(n_features=0)
+    with pytest.raises(ValueError):
+        HashedNgramVectorizer(ngram_range=(3, 2))
+
+
+def test_analyzer_post_ngram_features():
+    analyzer = BigFiveAnalyzer(ngram_features=64)
+    texts = ["me preocupa el examen", "muy cansado"]
+
+    sparse = analyzer.calculate_post_ngram_features(texts)
+    dense = analyzer.calculate_post_ngram_features(texts, dense=True)
+    assert isinstance(sparse, CSRMatrix)
+    assert dense.shape == (2, 64)
+    np.testing.assert_array_equal(sparse.to_dense(), dense)
@@ -0,0 +1,219 @@
+# tests/test_guards.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import time
+
+import pytest
+
+from src.async_batch import AsyncBatchOrchestrator
+from src.guards import AnalysisBudgetExceeded, check_deadline, limit_text
+from src.personality import BigFiveAnalyzer
+from src.posts import PostBatch
+from src.timeseries import TraitTimeIndex
+from src.utils import save_json
+
+
+def _best_time(function, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_limit_text_truncate_and_chunk():
+    """Trunca o fragmenta sin partir palabras; sin límite devuelve el texto"""
+    text = " ".join(f"palabra{i}" for i in range(200))
+
+    assert limit_text(text, 0) == [text]
+    truncated = limit_text(text, 100, "truncate")
+    assert len(truncated) == 1 and len(truncated[0]) <= 100
+    assert text.startswith(truncated[0]) and not truncated[0].endswith(" ")
+
+    chunks = limit_text(text, 100, "chunk")
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert " ".join(chunks) == text
+
+    # Sin espacios se corta en el límite
+    assert limit_text("a" * 250, 100, "chunk") == ["a" * 100, "a" * 100, "a" * 50]
+
+
+def test_post_batch_limits_oversized_posts():
+    """Los fragmentos de un post comparten su índice y se reagrupan al tomarlo"""
+    posts = [
+        {"text": "corto", "reactions": 1},
+        {"text": "uno dos tres cuatro cinco seis", "reactions": 2},
+        {"text": "final", "reactions": 3},
+    ]
+    batch = PostBatch.from_posts(posts, max_chars=10, overflow="chunk")
+    assert batch.oversized == 1
+    assert batch.text_index.tolist() == [0, 1, 1, 1, 1, 1, 2]
+    assert batch.n_texts == 7 and batch.n_text_posts == 3
+    assert batch.post_texts()[1] == "uno dos tres cuatro cinco seis"
+
+    taken = batch.take([2, 1])
+    assert taken.texts == ["final", "uno dos", "tres", "cuatro", "cinco", "seis"]
+    assert taken.reactions.tolist() == [3, 2]
+    assert taken.oversized == 1 and taken.n_text_posts == 2
+
+    truncated = PostBatch.from_posts(posts, max_chars=10)
+    assert truncated.texts == ["corto", "uno dos", "final"]
+    # Truncado queda un solo fragmento, pero el post sigue contando como largo
+    assert truncated.take([1, 2]).oversized == 1
+    assert truncated.take([0, 2]).oversized == 0
+
+
+def test_chunked_posts_count_once():
+    """Los promedios por post usan los posts, no los fragmentos"""
+    data = {
+        "posts": [
+            {"text": "fiesta con amigos " * 2000, "reactions": 40, "comments": 6},
+            {"text": "hola amigos", "reactions": 20, "comments": 2},
+        ]
+    }
+    analyzer = BigFiveAnalyzer(max_post_chars=1000, post_overflow="chunk")
+    analyzer.calculate_big_five_scores(data)
+
+    assert analyzer.results["metadata"]["posts_analyzed"] == 2
+    components = analyzer.results["component_features"]
+    assert components["extraversion"]["reactions_normalized"] == 30 / 50
+    assert components["agreeableness"]["comments_normalized"] == 4 / 10
+    assert components["conscientiousness"]["post_consistency"] == 0.3
+
+
+def test_huge_post_is_bounded():
+    """Un post de varios megabytes se analiza hasta el límite y queda reportado"""
+    data = {"posts": [{"text": "fiesta " * 500_000}, {"text": "hola amigos"}]}
+    analyzer = BigFiveAnalyzer(max_post_chars=10_000)
+
+    texts = PostBatch.from_posts(data["posts"], max_chars=10_000).texts
+    assert len(texts[0]) <= 10_000 and texts[1] == "hola amigos"
+
+    analyzer.calculate_big_five_scores(data)
+    metadata = analyzer.results["metadata"]
+    assert metadata["oversized_posts"] == 1
+    # Solo se analizan las palabras que caben en el límite
+    assert metadata["words_analyzed"] == len(texts[0].split()) + 2
+
+    chunked = BigFiveAnalyzer(max_post_chars=10_000, post_overflow="chunk")
+    chunked.calculate_big_five_scores(data)
+    assert chunked.results["metadata"]["words_analyzed"] == 500_002
+
+    with pytest.raises(ValueError):
+        BigFiveAnalyzer(post_overflow="ignore")
+
+
+@pytest.mark.parametrize(
+    "pattern", ["no ", "@a", "#", "😀", "a", "muy feliz ", "!!! ", "\n"]
+)
+@pytest.mark.parametrize("social_signals", [False, True])
+def test_adversarial_inputs_scale_linearly(pattern, social_signals):
+    """Cuadruplicar una entrada repetitiva no multiplica el tiempo más que
+    linealmente (con margen amplio para el ruido del reloj)"""
+    analyzer = BigFiveAnalyzer(social_signals=social_signals, max_post_chars=0)
+
+    def run(repeats):
+        data = {"posts": [{"text": pattern * repeats}] * 4}
+        return _best_time(lambda: analyzer.calculate_big_five_scores(data))
+
+    small, large = run(5_000), run(20_000)
+    assert large < 12 * max(small, 1e-3)
+
+
+def test_time_budget_stops_the_analysis():
+    """Con el presupuesto agotado se lanza AnalysisBudgetExceeded"""
+    check_deadline(None)
+    with pytest.raises(AnalysisBudgetExceeded):
+        check_deadline(time.time() - 1, "test")
+
+    data = {"posts": [{"text": f"texto número {i} del corpus"} for i in range(5000)]}
+    analyzer = BigFiveAnalyzer(time_budget=1e-6)
+    with pytest.raises(AnalysisBudgetExceeded):
+        analyzer.calculate_big_five_scores(data)
+    with pytest.raises(AnalysisBudgetExceeded):
+        analyzer.calculate_big_five_scores_batch([data, data])
+
+    # Un presupuesto holgado no cambia los puntajes
+    assert BigFiveAnalyzer(time_budget=60).calculate_big_five_scores(
+        data
+    ) == BigFiveAnalyzer().calculate_big_five_scores(data)
+
+
+def test_non_string_bio_does_not_crash():
+    data = {"posts": [{"text": "Hoy fue un buen día"}], "basic_info": {"bio": 12345}}
+    scores = BigFiveAnalyzer().calculate_big_five_scores(data)
+    assert 0 <= scores["conscientiousness"] <= 1
+
+
+def test_batch_continues_after_a_bad_dataset(tmp_path):
+    """Un archivo ilegible queda registrado con su error y el lote sigue"""
+    save_json(
+        {"posts": [{"text": "fiesta con amigos"}]}, "a.json", folder=str(tmp_path)
+    )
+    (tmp_path / "b.json").write_text("{no es json", encoding="utf-8")
+    save_json({"posts": [{"text": "un libro nuevo"}]}, "c.json", folder=str(tmp_path))
+
+    orchestrator = AsyncBatchOrchestrator(max_workers=1, on_progress=None)
+    rows = asyncio.run(orchestrator.run_folder(tmp_path))
+
+    assert [row["dataset"] for row in rows] == ["a", "b", "c"]
+    assert "JSONDecodeError" in rows[1]["error"]
+    assert "scores" in rows[0] and "scores" in rows[2]
+    assert orchestrator.progress()["failed"] == 1
+
+
+@pytest.mark.parametrize("social_signals", [False, True])
+def test_chunked_posts_have_one_sentiment_per_post(social_signals):
+    """Un post fragmentado aporta una sola polaridad, la de su texto unido:
+    coincide con el análisis sin límite, el truncado y el índice temporal"""
+    long_text = " ".join(
+        ["Estoy feliz 😀 con mis amigos", "no estoy nervioso", "muy triste hoy"] * 40
+    )
+    data = {
+        "posts": [
+            {"text": long_text if i % 2 else "hola amigos, qué tal", "timestamp": i}
+            for i in range(6)
+        ]
+    }
+
+    def analyzer(**kwargs):
+        return BigFiveAnalyzer(social_signals=social_signals, **kwargs)
+
+    chunked = analyzer(max_post_chars=200, post_overflow="chunk")
+    scores = chunked.calculate_big_five_scores(data)
+    sentiment = chunked.results["metadata"]["sentiment_analysis"]
+    assert sentiment["total_texts_analyzed"] == 6
+
+    unlimited = analyzer(max_post_chars=0)
+    assert unlimited.calculate_big_five_scores(data) == scores
+    assert unlimited.results["metadata"]["sentiment_analysis"] == sentiment
+
+    truncated = analyzer(max_post_chars=200)
+    truncated.calculate_big_five_scores(data)
+    analyzed = truncated.results["metadata"]["sentiment_analysis"]
+    assert analyzed["total_texts_analyzed"] == 6
+
+    index = TraitTimeIndex(data, analyzer=chunked)
+    assert index.score_range() == pytest.approx(scores, abs=1e-12)
+
+    # Los bloques de los pools no separan los fragmentos de un post
+    for use_shared_memory in (False, True):
+        parallel = analyzer(
+            max_post_chars=200,
+            post_overflow="chunk",
+            parallel_threshold=2,
+            chunk_size=3,
+            max_workers=2,
+            use_shared_memory=use_shared_memory,
+        )
+        assert parallel.calculate_big_five_scores(data) == scores
+    streaming = analyzer(
+        max_post_chars=200, post_overflow="chunk", memory_budget_mb=1e-3
+    )
+    assert streaming.calculate_big_five_scores(data) == scores
+    assert streaming.results["metadata"]["processing"]["mode"] == "streaming"
@@ -0,0 +1,128 @@
+# tests/test_lexicons.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+
+import pytest
+
+from src.lexicons import Lexicon, LexiconStore
+from src.personality import BigFiveAnalyzer
+
+DATA = {
+    "posts": [
+        {"text": "Hoy estoy radiante con mis amigos"},
+        {"text": "Qué día tan radiante y divertido"},
+    ]
+}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    # Garantizar una firma distinta aunque la escritura caiga en el mismo tick
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_lexicon_version_and_partial_override():
+    """Las secciones ausentes se toman del léxico base y la versión es un hash"""
+    base = BigFiveAnalyzer().default_lexicon
+    lexicon = Lexicon.from_dict({"sentiment": {"positive": ["radiante"]}}, base=base)
+
+    assert lexicon.traits == base.traits
+    assert lexicon.sentiment["positive"] == frozenset({"radiante"})
+    assert lexicon.version.startswith("sha256:") and lexicon.version != base.version
+    assert Lexicon.from_dict(lexicon.to_dict()) == lexicon
+
+    with pytest.raises(ValueError):
+        Lexicon.from_dict({"sentiment": {"positive": "radiante"}}, base=base)
+
+
+def test_store_reload_swaps_analyzer_lexicon(tmp_path):
+    """Una recarga explícita cambia el léxico y la versión registrada"""
+    analyzer = BigFiveAnalyzer()
+    before = analyzer.calculate_big_five_scores(DATA)
+    default_version = analyzer.results["metadata"]["lexicon_version"]
+
+    path = tmp_path / "lexicon.json"
+    _write(path, {"version": "v1"})
+    store = analyzer.watch_lexicon(str(path), interval=0)
+    assert analyzer.lexicon.version == "v1"
+    assert analyzer.lexicon == analyzer.default_lexicon
+
+    _write(path, {"version": "v2", "sentiment": {"positive": ["radiante"]}})
+    assert store.check_for_updates()
+    assert not store.check_for_updates()
+
+    after = analyzer.calculate_big_five_scores(DATA)
+    metadata = analyzer.results["metadata"]
+    assert metadata["lexicon_version"] == "v2" != default_version
+    assert metadata["sentiment_analysis"]["positive"] == 2
+    assert after != before
+
+
+def test_assigning_trait_words_publishes_a_lexicon():
+    """Asignar las palabras de un rasgo cambia el léxico con el que se puntúa"""
+    analyzer = BigFiveAnalyzer()
+    before = analyzer.calculate_big_five_scores(DATA)
+    version = analyzer.lexicon.version
+
+    analyzer.extraversion_words = analyzer.extraversion_words + ["radiante"]
+    assert "radiante" in analyzer.lexicon.traits["extraversion"]
+    assert analyzer.lexicon.version != version
+    after = analyzer.calculate_big_five_scores(DATA)
+    assert after["extraversion"] > before["extraversion"]
+    assert analyzer.results["metadata"]["lexicon_version"] == analyzer.lexicon.version
+
+    with pytest.raises(ValueError):
+        analyzer.openness_words = "arte"
+
+
+def test_invalid_file_keeps_current_version(tmp_path):
+    """Un archivo inválido (p. ej. a medio escribir) no reemplaza la versión vigente"""
+    path = tmp_path / "lexicon.json"
+    _write(path, {"version": "v1"})
+    store = LexiconStore(path, base=BigFiveAnalyzer().default_lexicon)
+
+    path.write_text('{"version": "v2", "traits": ', encoding="utf-8")
+    assert not store.check_for_updates()
+    assert store.current.version == "v1"
+    assert store.last_error
+
+    # Tipos incorrectos en el esquema también se reportan sin lanzar
+    for invalid in (
+        {"version": "v3", "traits": {"extraversion": 5}},
+        {"version": "v3", "traits": ["fiesta"]},
+        {"version": "v3", "sentiment": {"negations": None}},
+    ):
+        _write(path, invalid)
+        store.last_error = None
+        assert not store.check_for_updates()
+        assert store.current.version == "v1"
+        assert "lista de palabras" in store.last_error or "objeto" in store.last_error
+
+
+def test_watch_thread_and_in_flight_snapshot(tmp_path):
+    """El hilo de vigilancia publica versiones nuevas; una instantánea previa no cambia"""
+    analyzer = BigFiveAnalyzer()
+    path = tmp_path / "lexicon.json"
+    _write(path, {"version": "v1"})
+
+    with analyzer.watch_lexicon(str(path), interval=0.01):
+        lexicon, sentiment = analyzer.lexicon_snapshot()
+        _write(path, {"version": "v2", "sentiment": {"positive": ["radiante"]}})
+
+        deadline = time.monotonic() + 5
+        while analyzer.lexicon.version != "v2" and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert analyzer.lexicon.version == "v2"
+    assert lexicon.version == "v1"
+    assert sentiment.analyze_sentiment("Estoy radiante hoy")["polarity"] == 0.0
+    assert (
+        analyzer.sentiment_analyzer.analyze_sentiment("Estoy radiante hoy")["polarity"]
+        == 1.0
+    )
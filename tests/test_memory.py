@@ -0,0 +1,48 @@
+# tests/test_memory.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import tracemalloc
+
+from src.memory import (
+    BYTES_PER_CHAR,
+    MemoryProfiler,
+    estimate_working_set,
+    streaming_chunk_size,
+)
+
+
+def test_profiler_records_phases():
+    """El perfilador mide cada fase y detiene tracemalloc al terminar"""
+    assert not tracemalloc.is_tracing()
+    with MemoryProfiler() as profiler:
+        with profiler.phase("allocate"):
+            kept = [bytes(1000) for _ in range(100)]
+        with profiler.phase("temporary"):
+            sum(len(bytes(1000)) for _ in range(100))
+
+    assert not tracemalloc.is_tracing()
+    report = profiler.report()
+    assert report["phases"]["allocate"]["retained_bytes"] >= 100_000
+    assert report["phases"]["temporary"]["retained_bytes"] < 10_000
+    assert report["peak_bytes"] >= 100_000
+    assert len(kept) == 100
+
+
+def test_disabled_profiler_is_noop():
+    """Desactivado no inicia tracemalloc ni reporta nada"""
+    profiler = MemoryProfiler(enabled=False)
+    with profiler:
+        with profiler.phase("x"):
+            assert not tracemalloc.is_tracing()
+    assert profiler.report() is None
+
+
+def test_streaming_chunk_size():
+    """El tamaño de bloque respeta el presupuesto y nunca es cero"""
+    texts = ["a" * 100] * 50
+    assert estimate_working_set(texts) == 5000 * BYTES_PER_CHAR
+    assert streaming_chunk_size(texts, 10 * 100 * BYTES_PER_CHAR) == 10
+    assert streaming_chunk_size(texts, 1) == 1
@@ -0,0 +1,88 @@
+# tests/test_metrics.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from src.metrics import MetricsRegistry, register_analysis_metrics
+from src.personality import BigFiveAnalyzer
+
+
+def test_counters_histograms_and_prometheus_format():
+    """Contadores con etiquetas e histogramas acumulativos en texto Prometheus"""
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Trabajos")
+    registry.inc("jobs_total")
+    registry.inc("jobs_total", 2, kind="a")
+    registry.histogram("latency_seconds", "Latencia", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        registry.observe("latency_seconds", value)
+
+    text = registry.to_prometheus()
+    assert "# TYPE jobs_total counter" in text
+    assert "jobs_total 1" in text
+    assert 'jobs_total{kind="a"} 2' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+    assert "latency_seconds_sum 5.55" in text
+
+
+def test_disabled_registry_is_noop():
+    """Desactivado no registra nada y el timer es un objeto compartido"""
+    registry = MetricsRegistry(enabled=False)
+    registry.inc("jobs_total")
+    with registry.timer("latency_seconds"):
+        pass
+    assert registry.timer("a") is registry.timer("b")
+    assert registry.get("jobs_total") == 0
+    assert registry.to_prometheus() == "\n"
+
+
+def test_drain_merge_and_textfile(tmp_path):
+    """Los deltas de un worker se suman al registro principal y se exportan"""
+    worker = MetricsRegistry()
+    worker.inc("posts_total", 3, trait="openness")
+    worker.observe("phase_seconds", 0.2, phase="scoring")
+    delta = worker.drain()
+    assert worker.get("posts_total", trait="openness") == 0
+
+    main = MetricsRegistry()
+    main.merge(delta).merge(delta)
+    assert main.get("posts_total", trait="openness") == 6
+    assert main.get("phase_seconds", phase="scoring") == 2
+
+    path = main.write_textfile(tmp_path / "metrics" / "bigfive.prom")
+    assert 'posts_total{trait="openness"} 6' in path.read_text(encoding="utf-8")
+
+
+def test_analyzer_records_analysis_metrics(monkeypatch):
+    """El analizador cuenta posts, tokens, aciertos y mide cada fase"""
+    registry = register_analysis_metrics(MetricsRegistry())
+    analyzer = BigFiveAnalyzer(metrics=registry)
+    analyzer.calculate_big_five_scores(
+        {"posts": [{"text": "Fiesta con amigos"}, {"text": "Estoy nervioso"}]}
+    )
+    analyzer.calculate_big_five_scores({"posts": []})
+
+    def fail(*args):
+        raise RuntimeError("fallo simulado")
+
+    monkeypatch.setattr(analyzer, "_collect_text_statistics", fail)
+    with pytest.raises(RuntimeError):
+        analyzer.calculate_big_five_scores({"posts": [{"text": "hola"}]})
+
+    assert registry.get("bigfive_analyses_total") == 2
+    assert registry.get("bigfive_analysis_failures_total") == 1
+    assert registry.get("bigfive_default_scores_total") == 1
+    assert registry.get("bigfive_posts_total") == 2
+    assert registry.get("bigfive_tokens_total") == 5
+    assert registry.get("bigfive_lexicon_hits_total", trait="extraversion") == 2
+    assert registry.get("bigfive_lexicon_hits_total", trait="neuroticism") == 1
+    assert registry.get("bigfive_phase_seconds", phase="extract_posts") == 3
+    assert registry.get("bigfive_phase_seconds", phase="text_statistics") == 2
+    assert registry.get("bigfive_phase_seconds", phase="scoring") == 1
+    assert registry.get("bigfive_analysis_seconds") == 3
@@ -1,6 +1,7 @@
 import json
 import os
 import sys
+from collections import Counter
 from pathlib import Path
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -9,7 +10,13 @@ import tempfile
 
 import pytest
 
-from src.personality import BigFiveAnalyzer, SpanishSentimentAnalyzer
+from src.features import tokenize
+from src.lexicons import Lexicon
+from src.personality import (
+    BigFiveAnalyzer,
+    SpanishSentimentAnalyzer,
+    _TopWordsBatches,
+)
 
 
 def test_spanish_sentiment_analyzer():
@@ -335,3 +342,216 @@ def test_save_results_es():
 
         finally:
             analyzer.save_results = original_save
+
+
+@pytest.mark.parametrize(
+    "use_shared_memory, mode", [(False, "parallel"), (True, "shared_memory")]
+)
+def test_parallel_chunks_match_serial(use_shared_memory, mode):
+    """El procesamiento por bloques en paralelo reproduce el resultado en serie"""
+    texts = [
+        "Hoy fui a una fiesta con mis amigos, fue muy divertido",
+        "Estoy preocupado por el examen de mañana, me siento ansioso",
+        "Leí un libro sobre filosofía muy interesante",
+        "No estoy feliz, estoy cansado y triste",
+        "Ayudé a mi amigo con su proyecto, me gusta cooperar",
+        "ok",
+    ]
+    data = {
+        "posts": [
+            {"text": f"{texts[i % len(texts)]} {i}", "reactions": i, "comments": i % 4}
+            for i in range(40)
+        ],
+        "friends_count": 350,
+        "groups": ["Club de Lectura"],
+        "basic_info": {"bio": "Desarrollador apasionado por la tecnología"},
+    }
+
+    serial = BigFiveAnalyzer()
+    serial_scores = serial.calculate_big_five_scores(data)
+    assert serial.results["metadata"]["processing"]["mode"] == "serial"
+
+    parallel = BigFiveAnalyzer(
+        parallel_threshold=10,
+        chunk_size=7,
+        max_workers=2,
+        use_shared_memory=use_shared_memory,
+    )
+    parallel_scores = parallel.calculate_big_five_scores(data)
+    processing = parallel.results["metadata"]["processing"]
+    assert processing == {"mode": mode, "chunks": 6, "workers": 2}
+
+    assert parallel_scores == serial_scores
+    for key in (
+        "words_analyzed",
+        "unique_words",
+        "lexical_diversity",
+        "lexical_diversity_mattr",
+    ):
+        assert parallel.results["metadata"][key] == serial.results["metadata"][key]
+    assert (
+        parallel.results["metadata"]["sentiment_analysis"]
+        == serial.results["metadata"]["sentiment_analysis"]
+    )
+
+
+def test_memory_budget_switches_to_streaming():
+    """Con un presupuesto pequeño se procesa por bloques con el mismo resultado"""
+    data = {
+        "posts": [
+            {
+                "text": f"Fiesta con amigos, estoy feliz pero preocupado {i}",
+                "reactions": i,
+            }
+            for i in range(30)
+        ],
+        "friends_count": 120,
+        "groups": ["Música"],
+    }
+
+    serial = BigFiveAnalyzer()
+    serial_scores = serial.calculate_big_five_scores(data)
+    assert "memory" not in serial.results["metadata"]
+
+    # ~1.6 KB por post estimado: el presupuesto admite unos 6 posts por bloque
+    budgeted = BigFiveAnalyzer(memory_budget_mb=0.01, profile_memory=True)
+    scores = budgeted.calculate_big_five_scores(data)
+    metadata = budgeted.results["metadata"]
+
+    assert metadata["processing"]["mode"] == "streaming"
+    assert metadata["processing"]["chunks"] > 1
+    assert scores == serial_scores
+    for key in (
+        "words_analyzed",
+        "unique_words",
+        "lexical_diversity_mattr",
+        "sentiment_analysis",
+    ):
+        assert metadata[key] == serial.results["metadata"][key]
+
+    memory = metadata["memory"]
+    assert set(memory["phases"]) == {"extract_posts", "text_statistics", "scoring"}
+    assert memory["peak_bytes"] >= memory["phases"]["text_statistics"]["peak_bytes"] > 0
+
+
+@pytest.mark.parametrize("use_shared_memory", [False, True])
+def test_hyperloglog_unique_words(use_shared_memory):
+    """El modo HyperLogLog aproxima las palabras únicas y lo indica en metadata"""
+    data = {
+        "posts": [
+            {"text": f"Hoy leí sobre filosofía y ciencia número{i} tema{i % 7}"}
+            for i in range(60)
+        ]
+    }
+
+    exact = BigFiveAnalyzer()
+    exact.calculate_big_five_scores(data)
+    exact_metadata = exact.results["metadata"]
+    assert exact_metadata["unique_words_counting"]["mode"] == "exact"
+
+    approximate = BigFiveAnalyzer(
+        unique_words_mode="hll",
+        hll_precision=12,
+        parallel_threshold=10,
+        chunk_size=7,
+        max_workers=2,
+        use_shared_memory=use_shared_memory,
+    )
+    approximate.calculate_big_five_scores(data)
+    metadata = approximate.results["metadata"]
+    counting = metadata["unique_words_counting"]
+
+    assert counting["mode"] == "hyperloglog"
+    assert counting["precision"] == 12
+    assert counting["relative_error"] == round(1.04 / 64, 5)
+    assert metadata["words_analyzed"] == exact_metadata["words_analyzed"]
+    assert abs(metadata["unique_words"] - exact_metadata["unique_words"]) <= 2
+
+
+def test_unique_words_auto_mode():
+    """El modo auto solo usa HyperLogLog a partir de hll_min_posts posts"""
+    data = {"posts": [{"text": f"Fiesta con amigos {i}"} for i in range(20)]}
+
+    small = BigFiveAnalyzer(unique_words_mode="auto", hll_min_posts=50)
+    small.calculate_big_five_scores(data)
+    assert small.results["metadata"]["unique_words_counting"]["mode"] == "exact"
+
+    large = BigFiveAnalyzer(unique_words_mode="auto", hll_min_posts=10)
+    large.calculate_big_five_scores(data)
+    assert large.results["metadata"]["unique_words_counting"]["mode"] == "hyperloglog"
+
+    with pytest.raises(ValueError):
+        BigFiveAnalyzer(unique_words_mode="aproximado")
+
+
+@pytest.mark.parametrize("use_shared_memory", [None, False, True])
+def test_top_words_and_lexicon_hits(use_shared_memory):
+    """Palabras de contenido más frecuentes y aciertos por palabra de cada léxico"""
+    posts = [{"text": "La fiesta con mis amigos fue en la casa de Ana"}] * 12 + [
+        {"text": "Leí un libro de ciencia y un libro de arte"}
+    ] * 4
+    options = {}
+    if use_shared_memory is not None:
+        options = dict(
+            parallel_threshold=5,
+            chunk_size=3,
+            max_workers=2,
+            use_shared_memory=use_shared_memory,
+        )
+    analyzer = BigFiveAnalyzer(top_words_k=3, top_words_capacity=4, **options)
+    analyzer.calculate_big_five_scores({"posts": posts})
+    metadata = analyzer.results["metadata"]
+
+    top_words = metadata["top_words"]
+    words = [entry["word"] for entry in top_words["words"]]
+    assert len(words) == 3
+    # Las palabras funcionales ("la", "de", "con", "en", "mis") no se reportan
+    assert set(words) <= {"fiesta", "amigos", "casa", "ana"}
+    for entry in top_words["words"]:
+        assert entry["count"] - entry["error"] <= 12 <= entry["count"]
+
+    lexicon_words = metadata["top_lexicon_words"]
+    assert lexicon_words["extraversion"] == [
+        {"word": "amigos", "count": 12},
+        {"word": "fiesta", "count": 12},
+    ]
+    assert lexicon_words["openness"][0] == {"word": "libro", "count": 8}
+
+
+def test_top_words_sketch_is_fed_in_token_batches():
+    """El sketch se actualiza por sub-lotes acotados durante la tokenización"""
+    texts = ["fiesta amigos casa"] * 50 + [f"palabra{i} libro" for i in range(300)]
+    top_words = _TopWordsBatches(capacity=4, batch=12)
+    pending = []
+    for text in texts:
+        top_words.update(tokenize(text))
+        pending.append(len(top_words.counts))
+    # Nunca hay más conteos pendientes que tokens de un sub-lote
+    assert max(pending) < 12
+    sketch = top_words.flush()
+
+    exact = Counter(word for text in texts for word in tokenize(text))
+    assert sketch.total == sum(exact.values())
+    assert len(sketch.counts) <= 4
+    assert sketch.top(1)[0][0] == "libro"
+    for word, count, error in sketch.top(4):
+        assert count - error <= exact[word] <= count
+
+
+def test_analyze_sentiment_on_the_class():
+    """analyze_sentiment se puede llamar sobre la clase (diccionarios por defecto)"""
+    text = "Estoy muy feliz y contento con la vida"
+    result = SpanishSentimentAnalyzer.analyze_sentiment(text)
+    assert result == SpanishSentimentAnalyzer().analyze_sentiment(text)
+    assert result["polarity"] == 1.0
+    assert SpanishSentimentAnalyzer.analyze_sentiment("hola")["label"] == "NEUTRO"
+
+    # Una instancia con otro léxico usa sus propios diccionarios
+    lexicon = Lexicon.from_dict(
+        {"sentiment": {"positive": ["radiante"]}}, base=BigFiveAnalyzer().lexicon
+    )
+    custom = SpanishSentimentAnalyzer(lexicon)
+    assert custom.analyze_sentiment("Estoy radiante hoy")["polarity"] == 1.0
+    assert SpanishSentimentAnalyzer.analyze_sentiment("Estoy radiante hoy") == (
+        SpanishSentimentAnalyzer().analyze_sentiment("Estoy radiante hoy")
+    )
@@ -0,0 +1,83 @@
+# tests/test_pipeline.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import threading
+import time
+
+import pytest
+
+from src.pipeline import PrefetchPipeline
+
+
+def test_pipeline_preserves_order_and_overlaps_io():
+    """Los resultados salen en orden y la carga se solapa con el procesamiento"""
+    saved = []
+
+    def load(item):
+        time.sleep(0.03)
+        return item * 10
+
+    def process(item, data):
+        time.sleep(0.03)
+        return data + 1
+
+    pipeline = PrefetchPipeline(
+        load, process, save=lambda item, result: saved.append(item), prefetch=3
+    )
+    start = time.perf_counter()
+    results = pipeline.run(range(8))
+    elapsed = time.perf_counter() - start
+
+    assert results == [i * 10 + 1 for i in range(8)]
+    assert sorted(saved) == list(range(8))
+    # En serie serían 8 * (0.03 + 0.03) = 0.48 s
+    assert elapsed < 0.4
+
+    report = pipeline.report()
+    assert report["load"]["items"] == 8
+    assert report["process"]["items"] == 8
+    assert report["save"]["items"] == 8
+    assert 0.0 < report["process"]["utilization"] <= 1.0
+
+
+def test_pipeline_bounded_prefetch():
+    """Nunca hay más de prefetch elementos cargados además del actual"""
+    lock = threading.Lock()
+    loaded = []
+    max_outstanding = []
+
+    def load(item):
+        with lock:
+            loaded.append(item)
+        return item
+
+    processed = []
+
+    def process(item, data):
+        with lock:
+            max_outstanding.append(len(loaded) - len(processed))
+        time.sleep(0.01)
+        processed.append(item)
+        return data
+
+    PrefetchPipeline(load, process, prefetch=2, io_workers=4).run(range(10))
+    assert max(max_outstanding) <= 2 + 1
+
+
+def test_pipeline_propagates_errors():
+    """Un error de carga se propaga y detiene el pipeline"""
+
+    def load(item):
+        if item == 2:
+            raise ValueError("archivo corrupto")
+        return item
+
+    pipeline = PrefetchPipeline(load, lambda item, data: data)
+    with pytest.raises(ValueError):
+        pipeline.run(range(5))
+
+    with pytest.raises(ValueError):
+        PrefetchPipeline(load, lambda item, data: data, prefetch=0)
@@ -0,0 +1,140 @@
+# tests/test_post_store.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from src.metrics import MetricsRegistry
+from src.personality import BigFiveAnalyzer
+from src.post_store import PostStore
+
+TEXT = (
+    "Hoy fuimos a una fiesta increíble, bailamos toda la noche y conocimos "
+    "gente nueva; estoy feliz y agradecido por estos momentos compartidos."
+)
+
+
+def _snapshot(n_posts, day):
+    return {
+        "basic_info": {"bio": "Me gusta aprender cosas nuevas"},
+        "friends_count": 120,
+        "scraped_at": f"2024-05-{day:02d}",
+        "posts": [
+            {
+                "text": f"Post número {i} con mis amigos. " + TEXT,
+                "url": f"https://facebook.com/p/{i}",
+                "reactions": i * day,
+                "comments": day,
+                "timestamp": 1_700_000_000 + i,
+            }
+            for i in range(n_posts)
+        ]
+        + ["no es un dict"],
+    }
+
+
+def test_snapshots_share_unchanged_bodies(tmp_path):
+    """Los posts sin cambios (salvo reacciones) se guardan una sola vez"""
+    store = PostStore(tmp_path / "posts")
+    first = store.save("dia_1", _snapshot(100, 1))
+    assert first["new_bodies"] == 101
+    pack_size = store.pack_path.stat().st_size
+
+    second = store.save("dia_2", _snapshot(105, 2))
+    assert second["new_bodies"] == 5
+    assert second["bytes_written"] < first["bytes_written"] / 4
+    assert store.bodies == 106
+    assert store.pack_path.stat().st_size < pack_size * 1.1
+
+    # Mismo texto con otro cuerpo: no se reutiliza el hash del snapshot anterior
+    edited = _snapshot(105, 2)
+    edited["posts"][0]["url"] = "https://facebook.com/p/editado"
+    assert store.save("dia_2_editado", edited)["new_bodies"] == 1
+
+    # Reabrir el almacén reconstruye el índice y reensambla cada snapshot igual
+    store.close()
+    reopened = PostStore(tmp_path / "posts")
+    assert reopened.snapshots() == ["dia_1", "dia_2", "dia_2_editado"]
+    assert reopened.load("dia_2_editado").to_dict() == edited
+    for name, day, n_posts in (("dia_1", 1, 100), ("dia_2", 2, 105)):
+        assert reopened.load(name).to_dict() == _snapshot(n_posts, day)
+
+
+def test_snapshot_posts_are_lazy(tmp_path):
+    """Cargar solo lee el manifiesto; cada post se lee al accederlo (con caché)"""
+    metrics = MetricsRegistry()
+    store = PostStore(tmp_path / "posts", cache_size=10, metrics=metrics)
+    store.save("dia_1", _snapshot(50, 1))
+
+    snapshot = store.load("dia_1")
+    assert len(snapshot) == 51
+    assert metrics.get("bigfive_post_store_cache_total", result="miss") == 0
+
+    post = snapshot.posts[3]
+    assert post["text"].startswith("Post número 3 ") and post["reactions"] == 3
+    assert snapshot.posts[-1] == "no es un dict"
+    # Cada acceso devuelve una copia: modificarla no altera la caché
+    post["text"] = "otro"
+    assert snapshot.posts[3]["text"].startswith("Post número 3 ")
+    assert metrics.get("bigfive_post_store_cache_total", result="miss") == 2
+    assert metrics.get("bigfive_post_store_cache_total", result="hit") == 1
+
+    assert [p["reactions"] for p in snapshot.posts[:3]] == [0, 1, 2]
+
+
+def test_failed_save_does_not_reuse_hashes(tmp_path, monkeypatch):
+    """Si un guardado falla, el siguiente vuelve a escribir los cuerpos"""
+    store = PostStore(tmp_path / "posts")
+
+    def fail(bodies):
+        raise OSError("disco lleno")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(store, "_append_bodies", fail)
+        with pytest.raises(OSError):
+            store.save("a", _snapshot(3, 1))
+
+    assert store.save("b", _snapshot(3, 1))["new_bodies"] == 4
+    assert store.load("b").to_dict() == _snapshot(3, 1)
+
+
+def test_failed_pack_write_leaves_index_unchanged(tmp_path, monkeypatch):
+    """Un fallo al escribir el pack no deja entradas en el índice en memoria"""
+    store = PostStore(tmp_path / "posts")
+
+    def fail(fd):
+        raise OSError("disco lleno")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "fsync", fail)
+        with pytest.raises(OSError):
+            store.save("a", _snapshot(3, 1))
+
+    assert store.bodies == 0
+    assert store.save("b", _snapshot(3, 1))["new_bodies"] == 4
+    assert PostStore(tmp_path / "posts").load("b").to_dict() == _snapshot(3, 1)
+
+
+def test_interrupted_write_and_invalid_names(tmp_path):
+    """Un índice que apunta más allá del pack se ignora; los nombres no son rutas"""
+    store = PostStore(tmp_path / "posts")
+    store.save("dia_1", _snapshot(3, 1))
+    with open(store.index_path, "a", encoding="ascii") as f:
+        f.write("0" * 32 + " 999999 10\nincompleta")
+    assert PostStore(tmp_path / "posts").bodies == 4
+
+    with pytest.raises(ValueError):
+        store.save("../fuera", _snapshot(1, 1))
+    with pytest.raises(FileNotFoundError):
+        store.load("no_existe")
+
+
+def test_analysis_of_a_snapshot(tmp_path):
+    store = PostStore(tmp_path / "posts")
+    data = _snapshot(20, 3)
+    store.save("dia_3", data)
+
+    scores = BigFiveAnalyzer().calculate_big_five_scores(store.load("dia_3").to_dict())
+    assert scores == BigFiveAnalyzer().calculate_big_five_scores(data)
@@ -0,0 +1,74 @@
+# tests/test_posts.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+from src.posts import PostBatch, parse_timestamp, post_slices, sequential_sum
+
+
+def test_post_batch_extracts_all_fields():
+    """Una pasada valida textos, reacciones, comentarios y timestamps"""
+    posts = [
+        {"text": "  Hola amigos  ", "reactions": 3, "comments": 1, "timestamp": 20},
+        "no es un post",
+        {"text": "   ", "reactions": "muchas", "comments": 2.5},
+        {"reactions": True, "timestamp": "2024-01-01T00:00:00+00:00"},
+        {"text": 123, "comments": None, "timestamp": 10},
+        {"text": "Otro día"},
+    ]
+    batch = PostBatch.from_posts(posts, timestamps=True)
+
+    assert len(batch) == 5
+    assert batch.texts == ["Hola amigos", "Otro día"]
+    assert batch.text_index.tolist() == [0, 4]
+    assert batch.reactions.tolist() == [3.0, 0.0, 1.0, 0.0, 0.0]
+    assert batch.total_comments == 3.5
+    assert batch.timestamps[1] != batch.timestamps[1]  # NaN
+    assert batch.timestamps[2] == 1704067200.0
+    assert batch.post_texts() == ["Hola amigos", None, None, None, "Otro día"]
+
+    subset = batch.take([4, 2, 0])
+    assert subset.texts == ["Otro día", "Hola amigos"]
+    assert subset.text_index.tolist() == [0, 2]
+    assert subset.reactions.tolist() == [0.0, 1.0, 3.0]
+    assert subset.timestamps[2] == 20
+
+
+def test_post_batch_invalid_input():
+    """Una lista inválida produce un lote vacío"""
+    batch = PostBatch.from_posts("posts")
+    assert len(batch) == 0 and batch.n_texts == 0
+    assert batch.total_reactions == 0.0
+    assert batch.timestamps is None
+
+
+def test_sequential_sum_matches_python():
+    """La suma conserva el redondeo de un bucle de izquierda a derecha"""
+    values = [0.1, 1e16, -1e16, 0.3, 2.5e-3] * 7
+    total = 0
+    for value in values:
+        total += value
+    assert sequential_sum(np.array(values)) == total
+
+
+def test_parse_timestamp():
+    """Acepta epoch numérico, texto numérico e ISO 8601"""
+    assert parse_timestamp(10) == 10.0
+    assert parse_timestamp("12.5") == 12.5
+    assert parse_timestamp("2024-01-01T00:00:00+00:00") == 1704067200.0
+    assert parse_timestamp("ayer") is None
+    assert parse_timestamp(None) is None
+    assert parse_timestamp(True) is None
+
+
+def test_post_slices_keep_fragments_together():
+    """Los cortes por bloques avanzan hasta el inicio del post siguiente"""
+    text_index = np.array([0, 1, 1, 1, 2, 3, 3, 4])
+    assert post_slices(None, 8, 3) == [(0, 3), (3, 6), (6, 8)]
+    assert post_slices(text_index, 8, 3) == [(0, 4), (4, 7), (7, 8)]
+    assert post_slices(text_index, 8, 1) == [(0, 1), (1, 4), (4, 5), (5, 7), (7, 8)]
+    assert post_slices(np.array([0, 0, 0]), 3, 2) == [(0, 3)]
+    assert post_slices(np.array([], dtype=np.int64), 0, 2) == []
@@ -0,0 +1,144 @@
+# tests/test_results_store.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import sqlite3
+import threading
+
+from src.async_batch import AsyncBatchOrchestrator
+from src.batch import BatchRunner
+from src.personality import BigFiveAnalyzer
+from src.results_store import ResultsStore, main
+from src.utils import save_json
+
+
+def _results(text, friends=0):
+    analyzer = BigFiveAnalyzer()
+    analyzer.calculate_big_five_scores(
+        {"posts": [{"text": text}], "friends_count": friends}
+    )
+    return analyzer.results
+
+
+def test_store_batches_and_queries(tmp_path):
+    """Los resultados se escriben por lotes y se consultan por dataset, fecha y versión"""
+    db = tmp_path / "results.db"
+    store = ResultsStore(db, batch_size=3)
+    first = _results("Hoy fui a una fiesta con mis amigos", 100)
+    for i in range(2):
+        store.add("perfil_a", first, created_at=1000.0 + i)
+    assert len(store) == 0  # Aún en el lote pendiente
+
+    store.add("perfil_b", _results("Leí un libro de filosofía"), created_at=1500.0)
+    assert len(store) == 3
+
+    store.add("perfil_a", first, created_at=2000.0)
+    store.close()
+
+    with ResultsStore(db) as store:
+        mode = store.connection.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+        runs = store.runs(dataset="perfil_a")
+        assert [run["created_at"] for run in runs] == [2000.0, 1001.0, 1000.0]
+        assert runs[0]["scores"] == first["big_five_scores"]
+        assert runs[0]["lexicon_version"] == first["metadata"]["lexicon_version"]
+
+        assert [run["dataset"] for run in store.runs(since=1001.0, until=2000.0)] == [
+            "perfil_b",
+            "perfil_a",
+        ]
+        assert len(store.runs(lexicon_version="otra")) == 0
+        assert len(store.runs(limit=2)) == 2
+
+        latest = store.latest("perfil_a")
+        assert store.results(latest["id"]) == first
+        assert store.results(999) is None
+        assert store.history("perfil_a", "extraversion") == [
+            (created_at, first["big_five_scores"]["extraversion"])
+            for created_at in (1000.0, 1001.0, 2000.0)
+        ]
+        assert store.datasets() == [
+            {"dataset": "perfil_a", "runs": 3, "last_run": 2000.0},
+            {"dataset": "perfil_b", "runs": 1, "last_run": 1500.0},
+        ]
+
+
+def test_concurrent_writers_and_readers(tmp_path):
+    """Varios hilos agregan a un mismo almacén mientras otra conexión lee"""
+    db = tmp_path / "results.db"
+    results = _results("Un día tranquilo en casa")
+    store = ResultsStore(db, batch_size=7)
+    assert len(store) == 0  # Crea el esquema
+
+    def write(worker):
+        for i in range(25):
+            store.add(f"dataset_{worker}", results)
+
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    # Con WAL una conexión de lectura no espera a las transacciones de escritura
+    reader = sqlite3.connect(db)
+    reader.execute("SELECT COUNT(*) FROM runs").fetchone()
+    for thread in threads:
+        thread.join()
+    store.close()
+
+    assert reader.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 100
+    assert reader.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 500
+    reader.close()
+
+
+def test_batch_runners_write_to_store(tmp_path):
+    """BatchRunner y el orquestador asíncrono registran cada dataset"""
+    raw = tmp_path / "raw"
+    for i in range(3):
+        save_json(
+            {"posts": [{"text": f"Fiesta con amigos número {i}"}]},
+            f"dataset_{i}.json",
+            folder=str(raw),
+        )
+
+    store = ResultsStore(tmp_path / "batch.db", batch_size=100)
+    rows = BatchRunner().run(sorted(raw.glob("*.json")), store=store)
+    assert [run["dataset"] for run in reversed(store.runs())] == [
+        row["dataset"] for row in rows
+    ]
+
+    orchestrator = AsyncBatchOrchestrator(
+        max_workers=1, on_progress=None, results_db=tmp_path / "async.db"
+    )
+    rows = asyncio.run(orchestrator.run_folder(raw))
+    with ResultsStore(tmp_path / "async.db") as async_store:
+        assert {row["dataset"] for row in async_store.datasets()} == {
+            "dataset_0",
+            "dataset_1",
+            "dataset_2",
+        }
+        run = async_store.latest("dataset_1")
+        assert run["scores"] == rows[1]["scores"]
+
+
+def test_cli_import_and_queries(tmp_path, capsys):
+    """La CLI importa resultados JSON y los lista"""
+    results_folder = tmp_path / "results"
+    BigFiveAnalyzer().save_results(
+        "perfil_results.json",
+        _results("Organizado y responsable con mi trabajo"),
+        str(results_folder),
+    )
+    db = str(tmp_path / "cli.db")
+
+    assert main(["--db", db, "import", str(results_folder)]) == 0
+    assert "1 resultados importados" in capsys.readouterr().out
+
+    assert main(["--db", db, "runs", "--dataset", "perfil"]) == 0
+    assert "perfil" in capsys.readouterr().out
+    assert main(["--db", db, "history", "perfil", "conscientiousness"]) == 0
+    assert main(["--db", db, "show", "1"]) == 0
+    assert '"big_five_scores"' in capsys.readouterr().out
+    assert main(["--db", db, "show", "42"]) == 1
@@ -0,0 +1,136 @@
+# tests/test_service.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.personality import BigFiveAnalyzer
+from src.service import MicroBatchService, create_server
+
+
+def _dataset(i):
+    return {
+        "posts": [
+            {"text": f"Hoy fui a una fiesta con mis amigos {i}", "reactions": i},
+            {"text": "Estoy preocupado y nervioso por el trabajo", "comments": 2},
+        ],
+        "friends_count": 50 * i,
+    }
+
+
+@pytest.fixture
+def server():
+    service = MicroBatchService(max_batch_size=4, max_wait_ms=200)
+    server = create_server("127.0.0.1", 0, service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.stop()
+
+
+def _request(server, path, data=None):
+    host, port = server.server_address[:2]
+    body = None if data is None else data.encode("utf-8")
+    request = urllib.request.Request(f"http://{host}:{port}{path}", data=body)
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_concurrent_requests_are_micro_batched(server):
+    """Las solicitudes concurrentes se agrupan y puntúan igual que por separado"""
+    with ThreadPoolExecutor(8) as pool:
+        responses = list(
+            pool.map(
+                lambda i: _request(server, "/analyze", json.dumps(_dataset(i))),
+                range(8),
+            )
+        )
+
+    analyzer = BigFiveAnalyzer()
+    for i, (status, payload) in enumerate(responses):
+        assert status == 200
+        assert payload["big_five_scores"] == analyzer.calculate_big_five_scores(
+            _dataset(i)
+        )
+        assert payload["metadata"]["processing"]["mode"] == "micro_batch"
+
+    status, stats = _request(server, "/stats")
+    assert status == 200
+    assert stats["requests"] == 8
+    assert stats["batches"] < 8
+    assert set(stats["latency_ms"]) == {"p50", "p90", "p95", "p99", "max"}
+
+
+def test_health_and_errors(server):
+    """Salud, JSON inválido y rutas desconocidas"""
+    status, health = _request(server, "/health")
+    assert status == 200 and health["lexicon_version"]
+
+    assert _request(server, "/analyze", "{no es json")[0] == 400
+    assert _request(server, "/analyze", "[1, 2]")[0] == 400
+    assert _request(server, "/otra")[0] == 404
+
+    status, payload = _request(server, "/analyze", json.dumps({"posts": []}))
+    assert status == 200
+    assert all(score == 0.5 for score in payload["big_five_scores"].values())
+
+
+def test_service_without_http():
+    """El servicio también se usa directamente y vacía lo pendiente al detenerse"""
+    with MicroBatchService(max_batch_size=2, max_wait_ms=0) as service:
+        futures = [service.submit(_dataset(i)) for i in range(5)]
+    assert [f.result(1)["metadata"]["posts_analyzed"] for f in futures] == [2] * 5
+    assert service.stats()["requests"] == 5
+
+
+class _FragileAnalyzer(BigFiveAnalyzer):
+    """Falla con cualquier lote que contenga un dataset marcado"""
+
+    def calculate_big_five_scores_batch(self, datasets):
+        if any(data.get("roto") for data in datasets):
+            raise ValueError("dataset malformado")
+        return super().calculate_big_five_scores_batch(datasets)
+
+
+def test_failing_dataset_only_fails_its_request():
+    """Si el micro-lote falla, cada dataset se puntúa por separado"""
+    service = MicroBatchService(_FragileAnalyzer(), max_batch_size=3, max_wait_ms=0)
+    datasets = [_dataset(1), {**_dataset(2), "roto": True}, _dataset(3)]
+    # Encolados antes de iniciar: forman un solo micro-lote
+    futures = [service.submit(data) for data in datasets]
+    with service:
+        pass
+
+    assert futures[0].result(1)["metadata"]["posts_analyzed"] == 2
+    assert futures[2].result(1)["metadata"]["posts_analyzed"] == 2
+    with pytest.raises(ValueError):
+        futures[1].result(1)
+    stats = service.stats()
+    assert (stats["batches"], stats["requests"], stats["failures"]) == (1, 3, 1)
+
+
+def test_metrics_endpoint(server):
+    """/metrics expone las métricas del análisis en formato Prometheus"""
+    _request(server, "/analyze", json.dumps(_dataset(1)))
+    host, port = server.server_address[:2]
+    with urllib.request.urlopen(
+        f"http://{host}:{port}/metrics", timeout=10
+    ) as response:
+        assert response.headers["Content-Type"].startswith("text/plain")
+        text = response.read().decode("utf-8")
+    assert "# TYPE bigfive_posts_total counter" in text
+    assert "bigfive_service_request_seconds_count" in text
+    assert 'bigfive_phase_seconds_count{phase="micro_batch"}' in text
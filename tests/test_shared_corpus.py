@@ -0,0 +1,66 @@
+# tests/test_shared_corpus.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from multiprocessing import shared_memory
+
+import pytest
+
+from src.personality import BigFiveAnalyzer
+from src.shared_corpus import SharedTextCorpus, shared_texts
+
+TEXTS = [
+    "Estoy muy feliz con mis amigos en la fiesta 🎉",
+    "No estoy triste, pero sí cansado del trabajo",
+    "",
+    "ok",
+    "Leí un libro de arte y filosofía",
+]
+
+
+def _block_exists(name):
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    block.close()
+    return True
+
+
+def test_shared_slices_return_the_texts():
+    """Cada rango de posts se decodifica igual al texto original"""
+    with SharedTextCorpus(TEXTS) as corpus:
+        assert corpus.n_posts == 5
+        slices = corpus.slices(2)
+        assert slices == [(0, 2), (2, 4), (4, 5)]
+        assert [t for a, b in slices for t in shared_texts(corpus.spec, a, b)] == TEXTS
+
+    with SharedTextCorpus([]) as corpus:
+        assert corpus.slices(2) == []
+
+
+def test_workers_analyze_the_shared_texts():
+    """El modo de memoria compartida coincide con el análisis en serie"""
+    posts = [{"text": TEXTS[i % len(TEXTS)] + f" {i}"} for i in range(30)]
+    expected = BigFiveAnalyzer().calculate_big_five_scores({"posts": posts})
+
+    analyzer = BigFiveAnalyzer(
+        parallel_threshold=10, chunk_size=7, max_workers=2, use_shared_memory=True
+    )
+    assert analyzer.calculate_big_five_scores({"posts": posts}) == expected
+    processing = analyzer.results["metadata"]["processing"]
+    assert processing == {"mode": "shared_memory", "chunks": 5, "workers": 2}
+
+
+def test_blocks_released_on_close_and_error():
+    """Los bloques se liberan al salir del context manager, incluso con errores"""
+    with pytest.raises(RuntimeError):
+        with SharedTextCorpus(TEXTS) as corpus:
+            names = [block_name for block_name, _, _ in corpus.spec.values()]
+            assert all(_block_exists(name) for name in names)
+            raise RuntimeError("fallo simulado")
+
+    assert not any(_block_exists(name) for name in names)
+    corpus.close()  # Idempotente
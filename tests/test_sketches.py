@@ -0,0 +1,174 @@
+# tests/test_sketches.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from src.sketches import HyperLogLog, KLLSketch, SpaceSaving
+
+
+def _exact_quantile(sorted_values, q):
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def test_kll_quantiles_within_error():
+    """Los cuantiles aproximados respetan la cota de error de rango"""
+    rng = random.Random(42)
+    values = [rng.gauss(0, 1) for _ in range(50000)]
+    sketch = KLLSketch(k=200, seed=1)
+    sketch.update_many(values)
+
+    ordered = sorted(values)
+    for q in (0.05, 0.25, 0.5, 0.75, 0.95):
+        estimate = sketch.quantile(q)
+        rank = sum(1 for v in ordered if v <= estimate) / len(ordered)
+        assert abs(rank - q) <= 3 * sketch.normalized_rank_error
+
+    # Memoria acotada
+    assert sketch.retained < 4 * sketch.k
+    assert sketch.count == len(values)
+    assert sketch.quantile(0.0) == ordered[0]
+    assert sketch.quantile(1.0) == ordered[-1]
+
+
+def test_kll_merge_and_serialization():
+    """Los sketches se combinan y sobreviven a un viaje por JSON"""
+    rng = random.Random(7)
+    values = [rng.random() for _ in range(20000)]
+
+    left = KLLSketch(seed=1)
+    right = KLLSketch(seed=2)
+    left.update_many(values[:12000])
+    right.update_many(values[12000:])
+
+    restored = KLLSketch.from_dict(json.loads(json.dumps(right.to_dict())))
+    assert restored.count == right.count
+    assert restored.quantile(0.5) == right.quantile(0.5)
+
+    merged = left.merge(restored)
+    assert merged.count == len(values)
+    assert merged.min_value == min(values)
+    assert merged.max_value == max(values)
+    assert abs(merged.quantile(0.5) - _exact_quantile(sorted(values), 0.5)) < 0.03
+
+
+def test_kll_edge_cases():
+    """Sketch vacío y parámetros inválidos"""
+    sketch = KLLSketch()
+    assert sketch.quantile(0.5) != sketch.quantile(0.5)  # NaN
+    assert sketch.rank(1.0) == 0.0
+
+    sketch.update(3.0)
+    assert sketch.quantile(0.5) == 3.0
+    assert sketch.percentile(90) == 3.0
+
+    with pytest.raises(ValueError):
+        sketch.quantile(1.5)
+    with pytest.raises(ValueError):
+        KLLSketch(k=2)
+    with pytest.raises(ValueError):
+        KLLSketch.from_dict({"type": "otro"})
+    with pytest.raises(ValueError):
+        sketch.merge(KLLSketch(k=sketch.k * 2))
+
+
+def test_hyperloglog_estimate_within_error():
+    """La estimación de distintos respeta el error relativo en todo el rango"""
+    for n in (1, 50, 5000, 40000, 200000):
+        sketch = HyperLogLog(precision=14)
+        sketch.update(f"palabra{i}" for i in range(n))
+        sketch.update(f"palabra{i}" for i in range(n // 2))  # repetidos
+        assert abs(sketch.estimate() - n) <= max(4 * sketch.relative_error * n, 1)
+
+    assert len(HyperLogLog()) == 0
+
+
+def test_hyperloglog_merge_and_serialization():
+    """Combinar sketches equivale a contar la unión; sobreviven a JSON"""
+    left = HyperLogLog(precision=10)
+    right = HyperLogLog(precision=10)
+    union = HyperLogLog(precision=10)
+    left.update(str(i) for i in range(6000))
+    right.update(str(i) for i in range(4000, 9000))
+    union.update(str(i) for i in range(9000))
+
+    restored = HyperLogLog.from_dict(json.loads(json.dumps(right.to_dict())))
+    left |= restored
+    assert left.estimate() == union.estimate()
+
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(precision=12))
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=3)
+    with pytest.raises(ValueError):
+        HyperLogLog.from_dict({"type": "kll"})
+
+
+def _check_space_saving_bounds(sketch, exact):
+    for item, count, error in sketch.top(len(sketch)):
+        assert count - error <= exact[item] <= count
+    for item, true_count in exact.items():
+        if item not in sketch.counts:
+            assert true_count <= sketch.floor
+
+
+def test_space_saving_error_bounds():
+    """Cada conteo acota la frecuencia real y el piso acota a los no listados"""
+    rng = random.Random(9)
+    stream = [f"w{int(rng.paretovariate(1.2))}" for _ in range(20000)]
+    exact = Counter(stream)
+
+    sketch = SpaceSaving(capacity=50)
+    for item in stream:
+        sketch.update(item)
+
+    assert len(sketch) == 50
+    assert sketch.total == len(stream)
+    assert sketch.floor <= len(stream) / 50
+    _check_space_saving_bounds(sketch, exact)
+    assert [item for item, _, _ in sketch.top(3)] == [
+        item for item, _ in exact.most_common(3)
+    ]
+
+
+def test_space_saving_update_counts_keeps_only_capacity():
+    """Los conteos exactos de un bloque se recorren sin guardarlos todos"""
+    exact = {f"w{i}": (i * 7919) % 1000 + 1 for i in range(5000)}
+    ranked = sorted(exact.values(), reverse=True)
+
+    sketch = SpaceSaving(capacity=5)
+    sketch.update_counts((item, count) for item, count in exact.items())
+    assert len(sketch) == 5
+    assert sketch.total == sum(ranked)
+    assert [count for _, count, _ in sketch.top(5)] == ranked[:5]
+    assert sketch.floor == ranked[5]
+    _check_space_saving_bounds(sketch, exact)
+
+
+def test_space_saving_merge_and_serialization():
+    """Los sketches de bloques se combinan conservando las cotas"""
+    rng = random.Random(4)
+    stream = [f"w{int(rng.paretovariate(1.1))}" for _ in range(30000)]
+    exact = Counter(stream)
+
+    merged = SpaceSaving(capacity=40)
+    for start in range(0, len(stream), 7000):
+        chunk = SpaceSaving(capacity=40)
+        chunk.update_counts(Counter(stream[start : start + 7000]))
+        merged |= SpaceSaving.from_dict(json.loads(json.dumps(chunk.to_dict())))
+
+    assert merged.total == len(stream)
+    assert len(merged) == 40
+    _check_space_saving_bounds(merged, exact)
+    assert merged.top(1)[0][0] == exact.most_common(1)[0][0]
+
+    with pytest.raises(ValueError):
+        SpaceSaving(capacity=0)
+    with pytest.raises(ValueError):
+        SpaceSaving.from_dict({"type": "kll"})
@@ -0,0 +1,106 @@
+# tests/test_social.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import re
+
+import pytest
+
+from src.personality import BigFiveAnalyzer
+from src.social import EMOJI_POLARITY_RANGES, emoji_polarity, scan_text
+
+POSTS = [
+    {"text": "Qué feliz 😍 con @ana en la fiesta #amigos https://t.co/a1b2?x=1"},
+    {"text": "😭"},
+    {"text": "escríbeme a ana@correo.com o mira www.ejemplo.com/ruta"},
+    {"text": "Hoy estoy muy triste y cansado 😞", "reactions": 3},
+    {"text": "#FelizDomingo con la familia 🎉🎉 @pedro @luisa"},
+]
+
+
+def test_scan_classifies_signals_and_drops_url_tokens():
+    tokens, signals = scan_text(POSTS[0]["text"])
+    assert tokens == ["Qué", "feliz", "con", "en", "la", "fiesta", "amigos"]
+    assert signals == {
+        "emoji": 1,
+        "emoji_positive": 1,
+        "emoji_negative": 0,
+        "hashtags": 1,
+        "mentions": 1,
+        "urls": 1,
+    }
+
+    # Un correo no es una mención; el dominio de www. no genera palabras
+    tokens, signals = scan_text(POSTS[2]["text"])
+    assert tokens == ["escríbeme", "a", "ana", "correo", "com", "o", "mira"]
+    assert signals["mentions"] == 0 and signals["urls"] == 1
+
+
+def test_scan_matches_word_pattern_without_signals():
+    text = "Hola, ¿qué tal? Año 2024: ñandú_feliz y ÁRBOL... x1"
+    assert scan_text(text)[0] == re.findall(r"\b\w+\b", text)
+
+
+def test_emoji_polarity_table():
+    starts = [start for start, _, _ in EMOJI_POLARITY_RANGES]
+    assert starts == sorted(starts)
+    assert all(start <= end for start, end, _ in EMOJI_POLARITY_RANGES)
+    assert emoji_polarity("😀") == 1
+    assert emoji_polarity("💔") == -1
+    assert emoji_polarity("🌳") == 0
+
+
+def test_social_signals_feed_words_sentiment_and_extraversion():
+    data = {"posts": POSTS}
+    plain = BigFiveAnalyzer()
+    plain_scores = plain.calculate_big_five_scores(data)
+    social = BigFiveAnalyzer(social_signals=True)
+    social_scores = social.calculate_big_five_scores(data)
+
+    metadata = social.results["metadata"]
+    assert metadata["words_analyzed"] < plain.results["metadata"]["words_analyzed"]
+    assert metadata["social_signals"]["urls"] == 2
+    assert metadata["social_signals"]["mentions"] == 3
+    # El post de un solo emoji también se analiza
+    assert metadata["sentiment_analysis"]["total_texts_analyzed"] == 5
+    assert "social_signals" not in plain.results["metadata"]
+
+    components = social.results["component_features"]["extraversion"]
+    assert components["social_signals"] > 0
+    assert social_scores["extraversion"] != plain_scores["extraversion"]
+
+
+@pytest.mark.parametrize("mode", ["parallel", "streaming", "micro_batch"])
+def test_social_signals_equal_across_processing_modes(mode):
+    posts = [dict(POSTS[i % len(POSTS)]) for i in range(40)]
+    data = {"posts": posts, "friends_count": 120}
+    serial = BigFiveAnalyzer(social_signals=True)
+    expected = serial.calculate_big_five_scores(data)
+
+    if mode == "parallel":
+        analyzer = BigFiveAnalyzer(
+            social_signals=True,
+            parallel_threshold=10,
+            chunk_size=7,
+            max_workers=2,
+            use_shared_memory=True,
+        )
+        scores = analyzer.calculate_big_five_scores(data)
+        assert analyzer.results["metadata"]["processing"]["mode"] == "shared_memory"
+    elif mode == "streaming":
+        analyzer = BigFiveAnalyzer(social_signals=True, memory_budget_mb=0.001)
+        scores = analyzer.calculate_big_five_scores(data)
+        assert analyzer.results["metadata"]["processing"]["mode"] == "streaming"
+    else:
+        analyzer = BigFiveAnalyzer(social_signals=True)
+        scores = analyzer.calculate_big_five_scores_batch([{}, data])[1][
+            "big_five_scores"
+        ]
+
+    assert scores == pytest.approx(expected, abs=1e-12)
+    assert (
+        analyzer.results["metadata"]["social_signals"]
+        == serial.results["metadata"]["social_signals"]
+    )
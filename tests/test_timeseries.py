@@ -0,0 +1,106 @@
+# tests/test_timeseries.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from src.personality import BigFiveAnalyzer
+from src.timeseries import DAY_SECONDS, TRAITS, TraitTimeIndex
+
+TEXTS = [
+    "Hoy fui a una fiesta con mis amigos, fue muy divertido",
+    "Estoy preocupado por el examen de mañana, me siento ansioso",
+    "Leí un libro sobre filosofía muy interesante",
+    "Ayudé a mi amigo con su proyecto, me gusta cooperar",
+    "Organicé mi semana con un plan detallado",
+    "No estoy feliz, estoy cansado y triste",
+]
+
+
+def _data():
+    posts = [
+        {
+            "text": text,
+            "reactions": 3 * i,
+            "comments": i,
+            "timestamp": 1_700_000_000 + i * 10 * DAY_SECONDS,
+        }
+        for i, text in enumerate(TEXTS)
+    ]
+    # Post sin texto: solo aporta reacciones
+    posts.append({"reactions": 40, "timestamp": 1_700_000_000 + 5 * DAY_SECONDS})
+    return {
+        "posts": posts,
+        "friends_count": 350,
+        "groups": ["Club de Lectura"],
+        "basic_info": {"bio": "Desarrollador apasionado por la tecnología"},
+    }
+
+
+def test_full_range_matches_analyzer():
+    """El rango completo reproduce calculate_big_five_scores"""
+    data = _data()
+    expected = BigFiveAnalyzer().calculate_big_five_scores(data)
+
+    index = TraitTimeIndex(data)
+    assert len(index) == 7
+    scores = index.score_range()
+    for trait in TRAITS:
+        assert scores[trait] == pytest.approx(expected[trait], abs=1e-12)
+
+
+def test_full_range_matches_analyzer_with_social_signals():
+    """Con señales sociales se indexan los mismos tokens, emoji y menciones"""
+    data = _data()
+    extra = [
+        "Fiesta con @ana y @luis 🎉🎉 #verano https://fb.com/fotos/123",
+        "😭",
+        "Mira www.ejemplo.com/amigos/fiesta #amigos #feliz 😀",
+    ]
+    for i, text in enumerate(extra):
+        timestamp = 1_700_000_000 + (60 + i) * DAY_SECONDS
+        data["posts"].append({"text": text, "reactions": 7, "timestamp": timestamp})
+
+    analyzer = BigFiveAnalyzer(social_signals=True)
+    expected = analyzer.calculate_big_five_scores(data)
+    assert analyzer.results["metadata"]["social_signals"]["mentions"] == 2
+
+    scores = TraitTimeIndex(data, analyzer).score_range()
+    for trait in TRAITS:
+        assert scores[trait] == pytest.approx(expected[trait], abs=1e-12)
+
+
+def test_windows_match_analyzer_on_subsets():
+    """Cada ventana equivale a analizar solo sus posts"""
+    data = _data()
+    index = TraitTimeIndex(data)
+    start = 1_700_000_000 + 10 * DAY_SECONDS
+    end = start + 25 * DAY_SECONDS
+
+    subset = dict(data)
+    subset["posts"] = [p for p in data["posts"] if start <= p["timestamp"] < end]
+    expected = BigFiveAnalyzer().calculate_big_five_scores(subset)
+
+    windows = index.score_windows([start], [end])
+    assert windows["posts"][0] == 3
+    for trait in TRAITS:
+        assert windows[trait][0] == pytest.approx(expected[trait], abs=1e-12)
+
+
+def test_rolling_series_and_empty_windows():
+    """La serie móvil devuelve una puntuación por ventana"""
+    index = TraitTimeIndex(_data())
+    series = index.rolling(window=30 * DAY_SECONDS, step=10 * DAY_SECONDS)
+
+    assert len(series["start"]) == 6
+    assert all(len(series[trait]) == 6 for trait in TRAITS)
+    assert all(0.0 <= v <= 1.0 for trait in TRAITS for v in series[trait])
+
+    # Ventana sin posts: scores por defecto
+    empty = index.score_range(0, 1)
+    assert all(score == 0.5 for score in empty.values())
+
+    with pytest.raises(ValueError):
+        index.rolling(window=0)
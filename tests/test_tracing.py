@@ -0,0 +1,119 @@
+# tests/test_tracing.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+
+import pytest
+
+from src.personality import BigFiveAnalyzer
+from src.post_store import PostStore
+from src.tracing import TRACER, Tracer
+from src.utils import load_json, save_json
+
+
+@pytest.fixture
+def global_tracer():
+    """Activa el tracer global durante el test y lo deja como estaba"""
+    enabled = TRACER.enabled
+    TRACER.enabled = True
+    TRACER.reset()
+    yield TRACER
+    TRACER.reset()
+    TRACER.enabled = enabled
+
+
+def _spans(events):
+    return [event for event in events if event["ph"] == "X"]
+
+
+def test_nested_spans_and_decorator():
+    """Los spans anidados quedan contenidos en el padre, con proceso e hilo"""
+    tracer = Tracer(enabled=True)
+
+    @tracer.traced()
+    def work():
+        with tracer.span("inner", cat="test", size=3):
+            pass
+
+    with tracer.span("outer"):
+        work()
+
+    events = tracer.events()
+    spans = {event["name"]: event for event in _spans(events)}
+    outer, inner = spans["outer"], spans["inner"]
+    assert "test_nested_spans_and_decorator.<locals>.work" in spans
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"] + 1
+    assert inner["args"] == {"size": 3}
+    assert inner["pid"] == os.getpid()
+    assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in events)
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    with tracer.span("nada"):
+        pass
+    assert tracer.events() == []
+
+
+def test_span_records_errors():
+    tracer = Tracer(enabled=True)
+    with pytest.raises(ValueError):
+        with tracer.span("falla"):
+            raise ValueError("x")
+    assert _spans(tracer.events())[0]["args"]["error"] == "ValueError"
+
+
+def test_write_chrome_trace(tmp_path):
+    tracer = Tracer(enabled=True)
+    with tracer.span("fase"):
+        pass
+    path = tracer.write(tmp_path / "trace.json")
+
+    with open(path, encoding="utf-8") as f:
+        trace = json.load(f)
+    assert trace["traceEvents"][0]["ph"] == "M"
+    assert _spans(trace["traceEvents"])[0]["name"] == "fase"
+
+
+@pytest.mark.parametrize("use_shared_memory", [False, True])
+def test_parallel_worker_spans_are_merged(global_tracer, use_shared_memory):
+    """Los spans de los workers del pool se agregan a la traza del proceso principal"""
+    posts = [{"text": f"Hoy fui a una fiesta con amigos {i}"} for i in range(30)]
+    analyzer = BigFiveAnalyzer(
+        parallel_threshold=10,
+        chunk_size=7,
+        max_workers=2,
+        use_shared_memory=use_shared_memory,
+    )
+    analyzer.calculate_big_five_scores({"posts": posts})
+
+    spans = _spans(global_tracer.events())
+    names = {event["name"] for event in spans}
+    assert {"calculate_big_five_scores", "text_statistics", "scoring"} <= names
+    # El sentimiento tiene su propio span dentro de la pasada de cada worker
+    assert {"tokenize", "sentiment"} <= names
+
+    workers = [event for event in spans if event["cat"] == "worker"]
+    assert len(workers) == 5
+    assert all(event["pid"] != os.getpid() for event in workers)
+
+
+def test_loading_is_traced(global_tracer, tmp_path):
+    """La carga de JSON y de snapshots del almacén de posts quedan en la traza"""
+    data = {"posts": [{"text": "Hoy fui a una fiesta", "reactions": 3}]}
+    path = save_json(data, "dataset.json", folder=str(tmp_path))
+    assert load_json(path.name, folder=str(path.parent)) == data
+
+    with PostStore(tmp_path / "posts") as store:
+        store.save("s1", data)
+        store.load("s1")
+
+    spans = {event["name"]: event for event in _spans(global_tracer.events())}
+    assert spans["load_json"]["cat"] == "io"
+    assert spans["load_json"]["args"] == {"file": "dataset.json"}
+    assert spans["post_store_save"]["args"] == {"snapshot": "s1"}
+    assert spans["post_store_load"]["args"] == {"snapshot": "s1"}
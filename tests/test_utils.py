@@ -9,7 +9,15 @@ from pathlib import Path
 
 import pytest
 
-from src.utils import format_duration, load_json, save_json
+from src.personality import BigFiveAnalyzer
+from src.utils import (
+    COMPRESSION_SUFFIXES,
+    detect_compression,
+    format_duration,
+    json_stem,
+    load_json,
+    save_json,
+)
 
 
 def test_save_and_load_json(tmp_path):
@@ -46,3 +54,49 @@ def test_save_json_with_timestamp(tmp_path):
     # Con extensión .json
     saved_path2 = save_json(test_data, "test2.json", folder=str(tmp_path))
     assert saved_path2.suffix == ".json"
+
+
+@pytest.mark.parametrize("compression", ["gzip", "lzma", "bz2"])
+def test_compressed_json_roundtrip(tmp_path, compression):
+    """El formato sale de la extensión o del parámetro y la lectura lo detecta"""
+    data = {
+        "posts": [
+            {"text": "Hoy fui a una fiesta 🎉", "reactions": i} for i in range(50)
+        ]
+    }
+    suffix = COMPRESSION_SUFFIXES[compression]
+
+    by_extension = save_json(data, f"dataset.json{suffix}", folder=str(tmp_path))
+    assert by_extension.name == f"dataset.json{suffix}"
+    assert detect_compression(by_extension) == compression
+    assert load_json(by_extension.name, folder=str(tmp_path)) == data
+
+    by_setting = save_json(
+        data, "otro.json", folder=str(tmp_path), compression=compression
+    )
+    assert by_setting.name == f"otro.json{suffix}"
+    # Sin la extensión también se encuentra y se detecta por los primeros bytes
+    assert load_json("otro.json", folder=str(tmp_path)) == data
+    renamed = by_setting.rename(tmp_path / "sin_extension.json")
+    assert load_json(renamed.name, folder=str(tmp_path)) == data
+
+    plain = save_json(data, "plano.json", folder=str(tmp_path))
+    assert detect_compression(plain) is None
+    assert by_extension.stat().st_size < plain.stat().st_size
+    assert json_stem(by_extension) == "dataset"
+
+    with pytest.raises(ValueError):
+        save_json(data, "x.json", folder=str(tmp_path), compression="zip")
+
+
+def test_save_results_compressed(tmp_path):
+    """save_results comprime el JSON y el reporte con el mismo formato"""
+    analyzer = BigFiveAnalyzer()
+    analyzer.calculate_big_five_scores({"posts": [{"text": "Un día feliz con amigos"}]})
+    path = analyzer.save_results(
+        "perfil_results.json", folder=str(tmp_path), compression="gzip"
+    )
+
+    assert path.name == "perfil_results.json.gz"
+    assert (tmp_path / "perfil_results.txt.gz").exists()
+    assert load_json(path.name, folder=str(tmp_path)) == analyzer.results
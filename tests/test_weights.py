@@ -0,0 +1,134 @@
+# tests/test_weights.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+
+from src.personality import BigFiveAnalyzer
+from src.weights import (
+    COMPONENT_KEYS,
+    TRAITS,
+    component_vector,
+    default_weights,
+    evaluate_weight_grid,
+    scores_to_dicts,
+    stack_weight_configs,
+    trait_components,
+    weight_matrix,
+    weighted_scores,
+)
+
+DATA = {
+    "posts": [
+        {"text": "Hoy fui a una fiesta con mis amigos", "reactions": 15},
+        {"text": "Estoy preocupado y ansioso por el trabajo", "comments": 3},
+        {"text": "Leí un libro de filosofía y arte", "reactions": 8},
+    ],
+    "friends_count": 350,
+    "groups": ["Club de Lectura", "Música"],
+    "basic_info": {"bio": "Desarrollador apasionado por la tecnología"},
+}
+
+
+def test_weight_matrix_layout():
+    """La matriz por defecto reproduce los pesos 0.3/0.4/0.3, etc."""
+    matrix = weight_matrix()
+    assert matrix.shape == (len(TRAITS), len(COMPONENT_KEYS))
+    assert np.allclose(matrix.sum(axis=1), 1.0)
+    assert (
+        matrix[0, COMPONENT_KEYS.index(("extraversion", "reactions_normalized"))] == 0.4
+    )
+
+    with pytest.raises(ValueError):
+        weight_matrix({"openness": {"friends_normalized": 1.0}})
+
+
+def test_grid_matches_single_scoring():
+    """Cada configuración de la rejilla equivale a reanalizar con esos pesos"""
+    analyzer = BigFiveAnalyzer()
+    base_scores = analyzer.calculate_big_five_scores(DATA)
+    components = analyzer.results["component_features"]
+
+    alternative = default_weights()
+    alternative["extraversion"] = {
+        "friends_normalized": 0.6,
+        "reactions_normalized": 0.2,
+        "word_frequency": 0.2,
+    }
+    grid = stack_weight_configs([default_weights(), alternative])
+    scores = analyzer.evaluate_weight_configurations(grid)
+    assert scores.shape == (2, 1, len(TRAITS))
+
+    for config, row in zip([default_weights(), alternative], scores[:, 0, :]):
+        expected = weighted_scores(components, config)
+        assert scores_to_dicts(row)[0] == pytest.approx(expected, abs=1e-12)
+
+    assert scores_to_dicts(scores[0, 0])[0] == pytest.approx(base_scores, abs=1e-12)
+
+    # Reanalizar con los pesos alternativos da el mismo resultado
+    other = BigFiveAnalyzer()
+    other.trait_weights = alternative
+    reanalyzed = other.calculate_big_five_scores(DATA)
+    assert scores_to_dicts(scores[1, 0])[0] == pytest.approx(reanalyzed, abs=1e-12)
+
+
+def test_large_random_grid():
+    """Miles de configuraciones se evalúan en una sola llamada"""
+    rng = np.random.default_rng(0)
+    features = rng.random((4, len(COMPONENT_KEYS)))
+    grid = rng.random((5000, len(TRAITS), len(COMPONENT_KEYS))) * (weight_matrix() > 0)
+
+    scores = evaluate_weight_grid(features, grid)
+    assert scores.shape == (5000, 4, len(TRAITS))
+    assert scores.min() >= 0.0 and scores.max() <= 1.0
+
+    expected = np.clip(features[2] @ grid[123].T, 0.0, 1.0)
+    np.testing.assert_allclose(scores[123, 2], expected)
+
+    # Entradas 1D/2D eliminan las dimensiones individuales
+    assert evaluate_weight_grid(features[0], weight_matrix()).shape == (len(TRAITS),)
+    with pytest.raises(ValueError):
+        evaluate_weight_grid(features[:, :3], grid)
+
+
+def test_component_vector_order():
+    """El vector de componentes sigue el orden de COMPONENT_KEYS"""
+    analyzer = BigFiveAnalyzer()
+    analyzer.calculate_big_five_scores(DATA)
+    components = analyzer.results["component_features"]
+    vector = component_vector(components)
+    for i, (trait, component) in enumerate(COMPONENT_KEYS):
+        assert vector[i] == components[trait][component]
+
+    with pytest.raises(ValueError):
+        BigFiveAnalyzer().evaluate_weight_configurations(weight_matrix())
+
+
+def test_trait_components_scalar_and_vectorized():
+    """Los mismos conteos dan los mismos componentes como escalares o por fila"""
+    rows = [(0, 0, 0, 0, 0, 0), (3, 90, 4, 1, 2, 3), (8, 900, 200, 5, 1, 7)]
+    columns = np.array(rows, dtype=np.float64).T
+    profile = {"friends_count": 350, "groups": 2, "bio_complete": True}
+
+    def components(posts, reactions, comments, positive, negative, analyzed):
+        return trait_components(
+            posts,
+            reactions,
+            comments,
+            positive,
+            negative,
+            analyzed,
+            word_frequencies={trait: posts / 100 for trait in TRAITS},
+            lexical_diversity=posts / 10,
+            **profile,
+        )
+
+    vectorized = components(*columns)
+    for r, row in enumerate(rows):
+        scalar = components(*row)
+        for trait, component in COMPONENT_KEYS:
+            expected = np.broadcast_to(vectorized[trait][component], (len(rows),))
+            assert float(scalar[trait][component]) == pytest.approx(expected[r])